@@ -0,0 +1,156 @@
+"""
+Бенчмарк методов AviasalesApi на локальной заглушке API.
+
+Для каждого метода печатает пропускную способность, задержки
+p50/p95/p99 и объём памяти, выделяемой за вызов. Результаты
+сравниваются с сохранённым базовым замером: при регрессии больше
+допустимой скрипт завершается с кодом 1, без базового замера — с кодом 2.
+
+Запуск (из каталога, содержащего project/):
+    python -m project.benchmarks.bench_client --save-baseline
+    python -m project.benchmarks.bench_client --tolerance 0.3
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from project.pages.api_page import AviasalesApi
+from project.utils.stub_server import StubServer
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# метрики, для которых рост — это регрессия
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "alloc_kib")
+
+
+def client_methods(api: AviasalesApi) -> Dict[str, Callable[[], object]]:
+    return {
+        "search_by_price_range":
+            lambda: api.search_by_price_range("MOW", "LED", 1000, 20000),
+        "prices_for_dates":
+            lambda: api.prices_for_dates("MOW", "LON", "2025-07", "2025-08"),
+        "get_currency_rates": api.get_currency_rates,
+        "get_latest_prices":
+            lambda: api.get_latest_prices("MOW", "LED", token="bench"),
+    }
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+def measure_latency(call: Callable[[], object],
+                    calls: int) -> Dict[str, float]:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(calls):
+        call_started = time.perf_counter()
+        call().json()
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": calls / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def measure(call: Callable[[], object], calls: int, alloc_calls: int,
+            rounds: int) -> Dict[str, float]:
+    """
+    Замеряет один метод: время — лучший из rounds прогонов (меньше
+    влияние шума), затем отдельно память, так как tracemalloc заметно
+    замедляет выполнение
+    """
+    call()  # прогрев соединения
+    samples = [measure_latency(call, calls) for _ in range(rounds)]
+    result = {"rps": max(s["rps"] for s in samples)}
+    for name in ("p50_ms", "p95_ms", "p99_ms"):
+        result[name] = min(s[name] for s in samples)
+
+    tracemalloc.start()
+    peaks = []
+    for _ in range(alloc_calls):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        call().json()
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    result["alloc_kib"] = statistics.mean(peaks) / 1024
+    return result
+
+
+def find_regressions(results: Dict[str, Dict[str, float]],
+                     baseline: Dict[str, Dict[str, float]],
+                     tolerance: float) -> List[str]:
+    regressions = []
+    for method, metrics in results.items():
+        base = baseline.get(method)
+        if not base:
+            continue
+        if metrics["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{method}: rps {metrics['rps']:.1f} < {base['rps']:.1f}")
+        for name in LOWER_IS_BETTER:
+            if metrics[name] > base[name] * (1 + tolerance):
+                regressions.append(f"{method}: {name} {metrics[name]:.2f}"
+                                   f" > {base[name]:.2f}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--alloc-calls", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--tickets", type=int, default=30,
+                        help="размер страницы ответа заглушки")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="искусственная задержка заглушки, с")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="допустимое ухудшение относительно базы")
+    args = parser.parse_args()
+
+    with StubServer(tickets=args.tickets, latency=args.latency) as server, \
+            AviasalesApi(server.url, token="bench",
+                         currency_url=server.currency_url) as api:
+        results = {name: measure(call, args.calls, args.alloc_calls,
+                                 args.rounds)
+                   for name, call in client_methods(api).items()}
+
+    print(f"{'метод':<24}{'req/s':>10}{'p50 мс':>10}{'p95 мс':>10}"
+          f"{'p99 мс':>10}{'КиБ/вызов':>12}")
+    for name, m in results.items():
+        print(f"{name:<24}{m['rps']:>10.1f}{m['p50_ms']:>10.2f}"
+              f"{m['p95_ms']:>10.2f}{m['p99_ms']:>10.2f}"
+              f"{m['alloc_kib']:>12.1f}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Базовый замер сохранён в {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Базовый замер {args.baseline} не найден: сохраните его "
+              f"с --save-baseline")
+        return 2
+    with open(args.baseline) as file:
+        regressions = find_regressions(results, json.load(file),
+                                       args.tolerance)
+    for line in regressions:
+        print(f"РЕГРЕССИЯ {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
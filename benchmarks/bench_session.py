@@ -0,0 +1,50 @@
+"""
+Сравнение пропускной способности AviasalesApi до и после перехода
+на пул keep-alive соединений.
+
+Запуск (из каталога, содержащего project/):
+    python -m project.benchmarks.bench_session --requests 2000
+"""
+import argparse
+import time
+import requests
+from project.pages.api_page import AviasalesApi, AviasalesRequests
+from project.utils.stub_server import StubServer
+
+
+def bench_plain_get(base_url: str, count: int) -> float:
+    """Старое поведение: новый requests.get (и соединение) на каждый вызов"""
+    # те же URL и параметры (включая токен), что у пуловой сессии
+    url, params = AviasalesRequests(base_url, token="bench")\
+        ._price_range_request("MOW", "LED", 1000, 2000)
+    started = time.perf_counter()
+    for _ in range(count):
+        requests.get(url, params=params).raise_for_status()
+    return count / (time.perf_counter() - started)
+
+
+def bench_pooled_session(base_url: str, count: int) -> float:
+    """Новое поведение: все вызовы идут через одну пуловую сессию"""
+    with AviasalesApi(base_url=base_url, token="bench") as api:
+        started = time.perf_counter()
+        for _ in range(count):
+            api.search_by_price_range("MOW", "LED").raise_for_status()
+        return count / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    with StubServer() as server:
+        before = bench_plain_get(server.url, args.requests)
+        after = bench_pooled_session(server.url, args.requests)
+
+    print(f"requests.get:  {before:8.1f} req/s")
+    print(f"pooled session: {after:8.1f} req/s")
+    print(f"ускорение:      {after / before:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
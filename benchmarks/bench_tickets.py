@@ -0,0 +1,67 @@
+"""
+Время и память на разбор 10 000 билетов: response.json() против
+потокового разбора в компактные записи Ticket. Тело ответа загружается
+заранее и в пик памяти не входит.
+
+Запуск (из каталога, содержащего project/):
+    python -m project.benchmarks.bench_tickets --tickets 10000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable, Tuple
+from project.pages.api_page import AviasalesApi
+from project.utils.stub_server import StubServer
+from project.utils.tickets import CHUNK_SIZE, iter_tickets
+
+PER = 10_000
+
+
+def profile(action: Callable[[], object]) -> Tuple[float, float]:
+    """Возвращает (секунды, пик памяти в МиБ) выполнения action"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = action()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return elapsed, peak / 2 ** 20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=PER)
+    args = parser.parse_args()
+
+    # тело ответа получаем один раз: заглушка работает в том же
+    # процессе, и её аллокации не должны попадать в замер
+    with StubServer(tickets=args.tickets) as server, \
+            AviasalesApi(server.url, token="bench") as api:
+        body = api.prices_for_dates("MOW", "LON", "2025-07", "2025-08",
+                                    limit=args.tickets).content
+
+    def chunks():
+        for start in range(0, len(body), CHUNK_SIZE):
+            yield body[start:start + CHUNK_SIZE]
+
+    cases = {
+        ".json() — список dict":
+            lambda: json.loads(body)["data"],
+        "Ticket — список записей":
+            lambda: list(iter_tickets(chunks())),
+        "Ticket — поток, без хранения":
+            lambda: sum(ticket.price for ticket in iter_tickets(chunks())),
+    }
+    scale = PER / args.tickets
+    print(f"Ответ: {len(body) / 2 ** 20:.2f} МиБ, {args.tickets} билетов")
+    print(f"{'способ':<32}{'мс / 10k':>10}{'МиБ / 10k':>12}")
+    for name, action in cases.items():
+        elapsed, peak = profile(action)
+        print(f"{name:<32}{elapsed * 1000 * scale:>10.1f}"
+              f"{peak * scale:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,39 @@
+import time
 import requests
 import allure
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from project.utils.cassette import Cassette
+from project.utils.fare_store import FareStore
+from project.utils.http_cache import ResponseCache
+from project.utils.rate_limiter import RateLimiter
+from project.utils.tickets import Ticket, decode_tickets
 
+# Эндпоинты, билеты из ответов которых сохраняются в FareStore
+FARE_ENDPOINTS = ("/aviasales/v3/search_by_price_range",
+                  "/aviasales/v3/prices_for_dates", "/v2/prices/latest")
 
-class AviasalesApi:
-    def __init__(self, base_url, token=None):
+# (connect, read) — не даём зависшему сокету остановить прогон
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 30)
+DEFAULT_POOL_SIZE = 10
+CURRENCY_URL = "http://yasen.aviasales.ru/adaptors/currency.json"
+
+
+class AviasalesRequests:
+    """
+    Построение URL и параметров запросов к API Aviasales.
+    Общая часть синхронного и асинхронного клиентов.
+    """
+
+    def __init__(self, base_url, token=None, currency_url=CURRENCY_URL):
         self.base_url = base_url
         self.token = token
+        self.currency_url = currency_url
 
-    @allure.step("API. Поиск билетов из {origin} в {destination}\
-                  в пределах цены {value_min}-{value_max}")
-    def search_by_price_range(self, origin, destination,
-                              value_min=1000, value_max=2000):
+    def _price_range_request(self, origin, destination, value_min,
+                             value_max, limit=30, page=1) -> Tuple[str, dict]:
         url = f"{self.base_url}/aviasales/v3/search_by_price_range"
         params = {
             "origin": origin,
@@ -22,14 +45,14 @@ class AviasalesApi:
             "locale": "ru",
             "currency": "rub",
             "market": "ru",
-            "limit": 30,
-            "page": 1,
+            "limit": limit,
+            "page": page,
             "token": self.token
         }
-        return requests.get(url, params=params)
+        return url, params
 
-    @allure.step("API. Авиабилеты на даты {departure_at} - {return_at}")
-    def prices_for_dates(self, origin, destination, departure_at, return_at):
+    def _dates_request(self, origin, destination, departure_at,
+                       return_at=None, limit=30, page=1) -> Tuple[str, dict]:
         url = f"{self.base_url}/aviasales/v3/prices_for_dates"
         params = {
             "origin": origin,
@@ -39,21 +62,222 @@ class AviasalesApi:
             "sorting": "price",
             "direct": "false",
             "cy": "usd",
-            "limit": 30,
-            "page": 1,
+            "limit": limit,
+            "page": page,
             "one_way": "true",
             "token": self.token
         }
-        return requests.get(url, params=params)
+        return url, params
+
+    def _latest_prices_request(self, origin, destination,
+                               token) -> Tuple[str, dict]:
+        url = f"{self.base_url}/v2/prices/latest"
+        params = {"origin": origin, "destination": destination,
+                  "currency": "rub", "token": token}
+        return url, params
+
+
+class AviasalesApi(AviasalesRequests):
+    def __init__(self, base_url, token=None, currency_url=CURRENCY_URL,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 pool_sizes: Optional[Dict[str, int]] = None,
+                 cache: Optional[ResponseCache] = None,
+                 cassette: Optional[Cassette] = None,
+                 limiter: Optional[RateLimiter] = None,
+                 fare_store: Optional[FareStore] = None):
+        """
+        :param base_url: базовый URL API
+        :param token: токен доступа
+        :param currency_url: адрес таблицы курсов валют
+        :param timeout: таймауты (connect, read) по умолчанию, в секундах
+        :param pool_size: размер пула keep-alive соединений на хост
+        :param pool_sizes: размеры пулов для отдельных хостов,
+            например {"http://yasen.aviasales.ru": 2}
+        :param cache: кэш ответов; по умолчанию не используется
+        :param cassette: кассета для записи/воспроизведения ответов
+        :param limiter: ограничитель скорости запросов к сети
+            (ответы из кэша и кассеты его не расходуют)
+        :param fare_store: хранилище, в которое сохраняются билеты
+            из успешных ответов поиска, полученных из сети (ответы
+            из кэша и кассеты повторно не сохраняются)
+        """
+        super().__init__(base_url, token, currency_url)
+        self.timeout = timeout
+        self.session = self._create_session(pool_size, pool_sizes or {})
+        self.cache = cache
+        self.cassette = cassette
+        self.limiter = limiter
+        self.fare_store = fare_store
+
+    def _create_session(self, pool_size: int,
+                        pool_sizes: Dict[str, int]) -> requests.Session:
+        """Создаёт сессию с пулом соединений, переиспользуемых между
+        запросами (одно TCP/TLS-рукопожатие на соединение)"""
+        session = requests.Session()
+        session.headers["Connection"] = "keep-alive"
+        default_adapter = HTTPAdapter(pool_connections=pool_size,
+                                      pool_maxsize=pool_size)
+        session.mount("http://", default_adapter)
+        session.mount("https://", default_adapter)
+        # requests выбирает адаптер по самому длинному префиксу URL
+        for prefix, size in pool_sizes.items():
+            session.mount(prefix, HTTPAdapter(pool_connections=1,
+                                              pool_maxsize=size))
+        return session
+
+    def _get(self, url, params=None, stream=False) -> requests.Response:
+        # кэш хранит тело целиком, потоковый ответ идёт мимо него
+        if self.cache is None or stream:
+            return self._send(url, params, stream=stream)
+        return self.cache.fetch(url, params, lambda headers: self._send(
+            url, params, headers, stream))
+
+    def _send(self, url, params=None, headers=None,
+              stream=False) -> requests.Response:
+        if self.cassette is None:
+            return self._request(url, params, headers, stream)
+        return self.cassette.fetch(url, params, lambda: self._request(
+            url, params, headers, stream))
+
+    def _request(self, url, params=None, headers=None,
+                 stream=False) -> requests.Response:
+        def send() -> requests.Response:
+            return self.session.get(url, params=params, headers=headers,
+                                    timeout=self.timeout, stream=stream)
+
+        if self.limiter is None:
+            response = send()
+        else:
+            response = self.limiter.call(url, send)
+        # потоковое тело читает вызывающий код, его не трогаем
+        if not stream:
+            self._store_fares(url, params or {}, response)
+        return response
+
+    def _store_fares(self, url: str, params: dict,
+                     response: requests.Response) -> None:
+        if self.fare_store is None or response.status_code != 200 or \
+                not urlparse(url).path.endswith(FARE_ENDPOINTS):
+            return
+        payload = response.json()
+        currency = payload.get("currency") or params.get("currency") or \
+            params.get("cy")
+        self.fare_store.add(payload.get("data") or [], currency, time.time())
+
+    def close(self) -> None:
+        """Закрывает все соединения пула"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @allure.step("API. Поиск билетов из {origin} в {destination}\
+                  в пределах цены {value_min}-{value_max}")
+    def search_by_price_range(self, origin, destination,
+                              value_min=1000, value_max=2000,
+                              limit=30, page=1):
+        url, params = self._price_range_request(
+            origin, destination, value_min, value_max, limit, page)
+        return self._get(url, params=params)
+
+    @allure.step("API. Авиабилеты на даты {departure_at} - {return_at}")
+    def prices_for_dates(self, origin, destination, departure_at,
+                         return_at=None, limit=30, page=1):
+        url, params = self._dates_request(
+            origin, destination, departure_at, return_at, limit, page)
+        return self._get(url, params=params)
+
+    # ================= КОМПАКТНЫЕ ЗАПИСИ =================
+    @allure.step("API. Билеты из {origin} в {destination}\
+                  в пределах цены {value_min}-{value_max} (потоково)")
+    def search_by_price_range_tickets(self, origin, destination,
+                                      value_min=1000, value_max=2000,
+                                      limit=30, page=1) -> Iterator[Ticket]:
+        """
+        То же, что search_by_price_range, но билеты разбираются
+        из потока ответа по одному в компактные записи Ticket
+        """
+        url, params = self._price_range_request(
+            origin, destination, value_min, value_max, limit, page)
+        return self._stream_tickets(url, params)
+
+    @allure.step("API. Авиабилеты на даты {departure_at} - {return_at}\
+                  (потоково)")
+    def prices_for_dates_tickets(self, origin, destination, departure_at,
+                                 return_at, limit=30,
+                                 page=1) -> Iterator[Ticket]:
+        """
+        То же, что prices_for_dates, но билеты разбираются
+        из потока ответа по одному в компактные записи Ticket
+        """
+        url, params = self._dates_request(
+            origin, destination, departure_at, return_at, limit, page)
+        return self._stream_tickets(url, params)
+
+    def _stream_tickets(self, url, params) -> Iterator[Ticket]:
+        response = self._get(url, params=params, stream=True)
+        response.raise_for_status()
+        return decode_tickets(response)
+
+    # ================= ПОСТРАНИЧНЫЙ ОБХОД =================
+    def iter_search_by_price_range(self, origin, destination,
+                                   value_min=1000, value_max=2000,
+                                   limit=30) -> Iterator[dict]:
+        """
+        Лениво обходит все страницы search_by_price_range
+        и отдаёт билеты по одному
+
+        Args:
+            limit (int): размер страницы
+        """
+        return self._iter_pages(lambda page: self._price_range_request(
+            origin, destination, value_min, value_max, limit, page))
+
+    def iter_prices_for_dates(self, origin, destination, departure_at,
+                              return_at, limit=30) -> Iterator[dict]:
+        """
+        Лениво обходит все страницы prices_for_dates
+        и отдаёт билеты по одному
+
+        Args:
+            limit (int): размер страницы
+        """
+        return self._iter_pages(lambda page: self._dates_request(
+            origin, destination, departure_at, return_at, limit, page))
+
+    def _iter_pages(self, build_request: Callable[[int], Tuple[str, dict]]
+                    ) -> Iterator[dict]:
+        """
+        Запрашивает страницы 1, 2, ... до первой пустой. Следующая
+        страница загружается в фоне, пока вызывающий код обрабатывает
+        текущую, поэтому в памяти не больше двух страниц.
+        """
+        def fetch(page: int) -> List[dict]:
+            url, params = build_request(page)
+            response = self._get(url, params=params)
+            response.raise_for_status()
+            return response.json().get("data") or []
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = 1
+            next_page = executor.submit(fetch, page)
+            while True:
+                tickets = next_page.result()
+                if not tickets:
+                    return
+                page += 1
+                next_page = executor.submit(fetch, page)
+                yield from tickets
 
     @allure.step("API. Получить курсы валют")
     def get_currency_rates(self):
-        url = "http://yasen.aviasales.ru/adaptors/currency.json"
-        return requests.get(url)
+        return self._get(self.currency_url)
 
     @allure.step("API. Запрос последних цен с токеном {token}")
     def get_latest_prices(self, origin, destination, token):
-        url = f"{self.base_url}/v2/prices/latest"
-        params = {"origin": origin, "destination": destination,
-                  "currency": "rub", "token": token}
-        return requests.get(url, params=params)
+        url, params = self._latest_prices_request(origin, destination, token)
+        return self._get(url, params=params)
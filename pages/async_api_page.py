@@ -0,0 +1,115 @@
+import asyncio
+import json
+import aiohttp
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+from project.pages.api_page import (AviasalesRequests, CURRENCY_URL,
+                                    DEFAULT_TIMEOUT)
+
+DEFAULT_CONCURRENCY = 20
+
+
+class AsyncApiResponse:
+    """Полностью прочитанный ответ, повторяющий нужную тестам часть
+    интерфейса requests.Response"""
+
+    def __init__(self, status_code: int, url: str,
+                 headers: Dict[str, str], content: bytes):
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class AsyncAviasalesApi(AviasalesRequests):
+    """
+    Асинхронный клиент с тем же набором методов, что и AviasalesApi.
+    Количество одновременных запросов ограничено concurrency.
+
+    Пример:
+        async with AsyncAviasalesApi(BASE_URL_API, TOKEN) as api:
+            responses = await api.gather(
+                *(api.search_by_price_range(o, d) for o, d in routes))
+    """
+
+    def __init__(self, base_url, token=None, currency_url=CURRENCY_URL,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT):
+        """
+        :param base_url: базовый URL API
+        :param token: токен доступа
+        :param currency_url: адрес таблицы курсов валют
+        :param concurrency: максимум запросов «в полёте» одновременно
+        :param timeout: таймауты (connect, read) в секундах
+        """
+        super().__init__(base_url, token, currency_url)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # сессия привязана к event loop, поэтому создаётся лениво
+        if self._session is None or self._session.closed:
+            connect, read = self.timeout
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect,
+                                              sock_read=read))
+        return self._session
+
+    async def _get(self, url, params=None) -> AsyncApiResponse:
+        # aiohttp не принимает None в параметрах запроса
+        if params is not None:
+            params = {key: value for key, value in params.items()
+                      if value is not None}
+        async with self._semaphore:
+            async with self._get_session().get(url, params=params) as resp:
+                content = await resp.read()
+                return AsyncApiResponse(resp.status, str(resp.url),
+                                        dict(resp.headers), content)
+
+    async def gather(self, *calls: Awaitable) -> List:
+        """
+        Выполняет вызовы конкурентно (не более concurrency одновременно)
+        и возвращает результаты в порядке передачи
+        """
+        return list(await asyncio.gather(*calls))
+
+    async def close(self) -> None:
+        """Закрывает сессию и все соединения пула"""
+        if self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def search_by_price_range(self, origin, destination,
+                                    value_min=1000, value_max=2000,
+                                    limit=30, page=1):
+        url, params = self._price_range_request(
+            origin, destination, value_min, value_max, limit, page)
+        return await self._get(url, params=params)
+
+    async def prices_for_dates(self, origin, destination,
+                               departure_at, return_at=None, limit=30,
+                               page=1):
+        url, params = self._dates_request(
+            origin, destination, departure_at, return_at, limit, page)
+        return await self._get(url, params=params)
+
+    async def get_currency_rates(self):
+        return await self._get(self.currency_url)
+
+    async def get_latest_prices(self, origin, destination, token):
+        url, params = self._latest_prices_request(origin, destination, token)
+        return await self._get(url, params=params)
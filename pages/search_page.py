@@ -1,31 +1,150 @@
-from time import sleep
 import allure
 import re
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from typing import List, Tuple, Dict, Optional
+from typing import Iterator, List, Tuple, Dict, Optional
 from datetime import datetime, timedelta, date
+from project.utils.dom_snapshot import DomSnapshot
+from project.utils.network_capture import NetworkCapture
+from project.utils.stream_verify import DepartureOrderVerifier, Verdict
+from project.utils.waits import WaitEngine
+
+# Сегменты вылета и прилёта внутри карточки рейса
+DEPARTURE_SEGMENT = "div.s__znjsAig6OswOqOsl.s__ArEb299EZ30wXeEL"
+ARRIVAL_SEGMENT = "div.s__znjsAig6OswOqOsl.s__Vz8S7bOiF1EDe0z9"
+
+# Кнопка догрузки результатов под списком рейсов
+SHOW_MORE_BUTTON = "//button[contains(., 'Показать ещё')]"
+
+# Поля карточки рейса, которые возвращают extract_cards и iter_cards
+CARD_FIELDS = ("price", "departure_time", "arrival_time", "origin",
+               "destination", "airline")
+
+# Разбирает карточки рейсов за один вызов execute_script: все или
+# limit штук начиная с offset.
+# Для сегмента: texts[1] — город, первый текст вида ЧЧ:ММ — время.
+
+_EXTRACT_CARDS_JS = """
+const [departureSel, arrivalSel, offset, limit] = arguments;
+const texts = (root) => root ? Array.from(
+    root.querySelectorAll("div[data-test-id='text']"),
+    (el) => el.innerText.trim()) : [];
+const segment = (card, selector) => {
+    const values = texts(card.querySelector(selector));
+    return {
+        city: values.length > 1 ? values[1] : null,
+        time: values.find((t) => /^\\d{2}:\\d{2}$/.test(t)) || null,
+    };
+};
+const all = document.querySelectorAll(
+    'div[data-test-id="ticket-preview"]');
+const end = limit == null ? all.length
+    : Math.min(all.length, (offset || 0) + limit);
+const batch = [];
+for (let i = offset || 0; i < end; i++) batch.push(all[i]);
+return batch.map(
+    (card) => {
+        const departure = segment(card, departureSel);
+        const arrival = segment(card, arrivalSel);
+        const price = card.querySelector('div[data-test-id="price"]');
+        const digits = price ? price.innerText.replace(/\\D/g, "") : "";
+        const logo = card.querySelector("img[alt]");
+        return {
+            price: digits ? parseInt(digits, 10) : null,
+            departure_time: departure.time,
+            arrival_time: arrival.time,
+            origin: departure.city,
+            destination: arrival.city,
+            airline: logo ? logo.alt : null,
+        };
+    });
+"""
 
 
 class SearchPage:
-    def __init__(self, driver, base_url: str):
+    def __init__(self, driver, base_url: str, capture: bool = False):
         """
-        :param driver: экземпляр Selenium WebDriver
+        :param driver: экземпляр Selenium WebDriver или DomSnapshot —
+            тогда getters читают сохранённый снимок страницы
         :param base_url: базовый URL сайта
+        :param capture: брать данные рейсов из перехваченных ответов
+            API страницы, а не из DOM (браузер должен быть запущен
+            с chrome_options(network_log=True))
         """
         self.driver = driver
-        self.wait = WebDriverWait(driver, 30)
+        # в снимке ждать нечего: элемент либо есть, либо нет
+        self.wait = WebDriverWait(
+            driver, 0 if isinstance(driver, DomSnapshot) else 30)
+        self.waits = WaitEngine(driver)
         self.base_url = base_url.rstrip("/")
+        self.network: Optional[NetworkCapture] = None
+        # порядок в DOM после сортировки на странице не совпадает
+        # с порядком в ответе API — тогда читаем DOM
+        self._dom_sorted = False
+        if capture:
+            self.network = NetworkCapture(driver)
+            self.network.reset()
+
+    def _new_search(self) -> None:
+        """Сбрасывает данные предыдущего поиска перед новым"""
+        self._dom_sorted = False
+        if self.network is not None:
+            self.network.reset()
 
     # ================= ОТКРЫТИЕ СТРАНИЦЫ =================
     @allure.step("Открыть страницу поиска авиабилетов")
     def open(self) -> None:
         """Открывает базовую страницу поиска авиабилетов"""
+        self._new_search()
         self.driver.get(f"{self.base_url}")
 
+    def build_search_url(self, origin: str, destination: str,
+                         departure: Optional[date] = None,
+                         adults: int = 1) -> str:
+        """
+        Строит URL страницы результатов вида /search/MOW1810PEE1:
+        откуда, день и месяц вылета, куда, число взрослых пассажиров
+
+        Args:
+            origin (str): IATA-код города отправления
+            destination (str): IATA-код города назначения
+            departure (date): дата вылета не раньше сегодня,
+                по умолчанию сегодня
+            adults (int): количество взрослых пассажиров (1-9)
+        """
+        for code in (origin, destination):
+            if not isinstance(code, str) or \
+                    not re.fullmatch(r"[A-Z]{3}", code):
+                raise ValueError(f"Некорректный IATA-код: {code}")
+        if isinstance(adults, bool) or not isinstance(adults, int) or \
+                not 1 <= adults <= 9:
+            raise ValueError(f"Некорректное число пассажиров: {adults!r}")
+        departure = departure or date.today()
+        if isinstance(departure, datetime):
+            departure = departure.date()
+        if not isinstance(departure, date):
+            raise ValueError(f"Некорректная дата вылета: {departure!r}")
+        if departure < date.today():
+            raise ValueError(f"Дата вылета в прошлом: {departure}")
+        return (f"{self.base_url}/search/"
+                f"{origin}{departure:%d%m}{destination}{adults}")
+
+    @allure.step("Открыть результаты поиска {origin} → {destination} по URL")
+    def open_results(self, origin: str, destination: str,
+                     departure: Optional[date] = None,
+                     adults: int = 1) -> None:
+        """
+        Быстрый путь: сразу открывает страницу результатов,
+        минуя заполнение формы поиска
+        """
+        self._new_search()
+        self.driver.get(self.build_search_url(
+            origin, destination, departure, adults))
+
     # ================= ПОЛЯ ГОРОДОВ =================
     @allure.step("Ввести город отправления: {from_city}")
     def set_from_city(self, from_city: str) -> None:
@@ -52,7 +171,7 @@ class SearchPage:
             lambda d: d.find_element
             (By.ID, "avia_form_origin-input").get_attribute("value")
             == from_city)
-        sleep(2)
+        self.waits.dom_stable("подсказки города отправления")
 
     @allure.step("Ввести город назначения: {to_city}")
     def set_to_city(self, to_city: str, retries: int = 2) -> None:
@@ -74,20 +193,18 @@ class SearchPage:
             self.wait.until(lambda d: d.find_element(
                 By.XPATH, '//*[@id="avia_form_destination-input"]'
                 ).get_attribute("value") == to_city)
-            try:
-                WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located(
-                        (By.XPATH,
-                         '//h2[@data-test-id="text" \
-                            and text()="График цен"]')))
+            # вместо фиксированной пробы в 5 с: ждём, пока страница
+            # затихнет, и сразу проверяем, появился ли график цен
+            self.waits.dom_stable("обновление после города назначения")
+            if self.driver.find_elements(
+                    By.XPATH,
+                    '//h2[@data-test-id="text" and text()="График цен"]'):
                 return
-            except Exception:
-                if attempt < retries - 1:
-                    print(f"Попытка {attempt+1} неудачна, пробуем ещё раз...")
-                    sleep(2)
-                else:
-                    raise RuntimeError("Страница не обновилась\
-                                        после ввода города назначения")
+            if attempt < retries - 1:
+                print(f"Попытка {attempt+1} неудачна, пробуем ещё раз...")
+            else:
+                raise RuntimeError("Страница не обновилась\
+                                    после ввода города назначения")
 
 # ================= ДАТА =================
     @allure.step("Выбрать дату вылета")
@@ -98,11 +215,10 @@ class SearchPage:
         field.click()
         self.wait.until(EC.presence_of_element_located(
             (By.XPATH, '//*[@data-test-id="dropdown"]')))
-        sleep(1)
-        btn = self.driver.find_element(
-            By.CSS_SELECTOR, "[aria-label^='Today']")
+        btn = self.waits.until(EC.element_to_be_clickable(
+            (By.CSS_SELECTOR, "[aria-label^='Today']")), "календарь")
         btn.click()
-        sleep(1)
+        self.waits.dom_stable("выбор даты")
         self.driver.find_element(
             By.CSS_SELECTOR, '[data-test-id="form-submit"]').click()
         if len(self.driver.window_handles) > 1:
@@ -118,35 +234,92 @@ class SearchPage:
             By.CSS_SELECTOR, '[data-test-id^="ticket"]')
         return results
 
-    @allure.step("Получить маршрут первого результата")
-    def get_first_result_route(self) -> Tuple[str, str]:
+    def extract_cards(self) -> List[Dict[str, Optional[object]]]:
+        """
+        Возвращает данные всех карточек рейсов за один запрос к браузеру:
+        price, departure_time, arrival_time, origin, destination, airline.
+        В режиме capture данные берутся из перехваченных ответов API.
+        """
+        cards = self._captured_cards()
+        if cards:
+            return cards
+        if isinstance(self.driver, DomSnapshot):
+            return self._extract_snapshot_cards()
         WebDriverWait(self.driver, 10).until(
             EC.presence_of_element_located(
                 (By.CSS_SELECTOR, 'div[data-test-id="ticket-preview"]')))
+        return self._read_cards()
+
+    def _read_cards(self, offset: int = 0, limit: Optional[int] = None
+                    ) -> List[Dict[str, Optional[object]]]:
+        """Карточки из DOM браузера одним вызовом _EXTRACT_CARDS_JS"""
+        cards = self.driver.execute_script(
+            _EXTRACT_CARDS_JS, DEPARTURE_SEGMENT, ARRIVAL_SEGMENT,
+            offset, limit) or []
+        # у карточки всегда одинаковый набор полей, даже если драйвер
+        # опустил пустые значения
+        return [{field: card.get(field) for field in CARD_FIELDS}
+                for card in cards]
+
+    def _extract_snapshot_cards(self) -> List[Dict[str, Optional[object]]]:
+        """То же, что _EXTRACT_CARDS_JS, но по снимку DOM в Python"""
+        def segment(card, selector: str) -> Tuple[Optional[str],
+                                                  Optional[str]]:
+            values = [el.text.strip() for section in card.find_elements(
+                          By.CSS_SELECTOR, selector)[:1]
+                      for el in section.find_elements(
+                          By.CSS_SELECTOR, "div[data-test-id='text']")]
+            city = values[1] if len(values) > 1 else None
+            time = next((t for t in values
+                         if re.fullmatch(r"\d{2}:\d{2}", t)), None)
+            return city, time
+
+        cards = []
+        for card in self.driver.find_elements(
+                By.CSS_SELECTOR, 'div[data-test-id="ticket-preview"]'):
+            origin, departure_time = segment(card, DEPARTURE_SEGMENT)
+            destination, arrival_time = segment(card, ARRIVAL_SEGMENT)
+            prices = card.find_elements(
+                By.CSS_SELECTOR, 'div[data-test-id="price"]')
+            digits = re.sub(r"\D", "", prices[0].text) if prices else ""
+            logos = card.find_elements(By.CSS_SELECTOR, "img[alt]")
+            cards.append({
+                "price": int(digits) if digits else None,
+                "departure_time": departure_time,
+                "arrival_time": arrival_time,
+                "origin": origin,
+                "destination": destination,
+                "airline": logos[0].get_attribute("alt") if logos else None,
+            })
+        return cards
+
+    @allure.step("Сохранить снимок DOM страницы")
+    def capture_snapshot(self) -> DomSnapshot:
+        """
+        Снимает page_source один раз; SearchPage(snapshot, base_url)
+        затем читает данные рейсов без браузера
+        """
+        return DomSnapshot.capture(self.driver)
 
-        # получаем все карточки рейсов
-        flights = self.driver.find_elements(
-            By.CSS_SELECTOR, 'div[data-test-id="ticket-preview"]')
-        if not flights:
-            raise Exception("Рейсы не найдены на странице")
-
-        first_flight = flights[0]  # первый результат
-
-        # Первый сегмент — вылет
-        departure_segment = first_flight.find_element(
-            By.CSS_SELECTOR, "div.s__znjsAig6OswOqOsl.s__ArEb299EZ30wXeEL")
-        departure_texts = departure_segment.find_elements(
-            By.CSS_SELECTOR, "div[data-test-id='text']")
-        origin = departure_texts[1].text.strip()  # город вылета
-
-        # Второй сегмент — прилёт
-        arrival_segment = first_flight.find_element(
-            By.CSS_SELECTOR, "div.s__znjsAig6OswOqOsl.s__Vz8S7bOiF1EDe0z9")
-        arrival_texts = arrival_segment.find_elements(
-            By.CSS_SELECTOR, "div[data-test-id='text']")
-        destination = arrival_texts[1].text.strip()  # город прилёта
+    def _captured_cards(self, timeout: float = 15
+                        ) -> List[Dict[str, Optional[object]]]:
+        """Билеты из ответов API; пустой список — читать DOM"""
+        if self.network is None or self._dom_sorted:
+            return []
+        try:
+            self.waits.until(lambda d: self.network.settled(),
+                             "ответы с результатами поиска", timeout)
+        except TimeoutException:
+            return []
+        return self.network.cards()
 
-        return origin, destination
+    @allure.step("Получить маршрут первого результата")
+    def get_first_result_route(self) -> Tuple[str, str]:
+        cards = self.extract_cards()
+        if not cards:
+            raise Exception("Рейсы не найдены на странице")
+        # город вылета и город прилёта первого результата
+        return cards[0]["origin"] or "", cards[0]["destination"] or ""
 
     # ================= ПОИСК С ПУСТЫМИ ПОЛЯМИ =================
     @allure.step("Выполнить поиск с пустыми полями")
@@ -177,7 +350,9 @@ class SearchPage:
                     By.CSS_SELECTOR,
                     '[data-test-id="accept-cookies-button"]')))
             cookie_btn.click()
-            sleep(0.5)  # небольшая пауза, чтобы баннер исчез
+            self.waits.until(EC.invisibility_of_element_located((
+                By.CSS_SELECTOR, '[data-test-id="accept-cookies-button"]')),
+                "скрытие баннера cookie", timeout=5)
         except Exception:
             pass  # баннера нет, пропускаем
 
@@ -189,9 +364,10 @@ class SearchPage:
             EC.visibility_of_element_located(
                 (By.XPATH, './/div[@data-test-id="text"\
                   and contains(.,"Сортировка")]')))
+        # мгновенная прокрутка — не нужно ждать окончания анимации
         self.driver.execute_script(
-            "arguments[0].scrollIntoView({block: 'center'});", sort_button)
-        sleep(0.5)
+            "arguments[0].scrollIntoView("
+            "{block: 'center', behavior: 'instant'});", sort_button)
         actions = ActionChains(self.driver)
         actions.move_to_element(sort_button).click().perform()
 
@@ -206,10 +382,11 @@ class SearchPage:
         self.driver.execute_script(
             "arguments[0].scrollIntoView({block: 'center'});", departure_sort)
         departure_sort.click()
+        self._dom_sorted = True
         WebDriverWait(self.driver, 10).until(
             EC.presence_of_all_elements_located(
                 (By.CSS_SELECTOR, 'div[data-test-id="ticket-preview"]')))
-        sleep(2)
+        self.waits.dom_stable("пересортировка результатов")
 
     def sort_times_with_midnight_crossing(
             self, times: List[datetime.time]) -> List[datetime.time]:
@@ -233,20 +410,61 @@ class SearchPage:
 
     def get_departure_times(self) -> List[datetime.time]:
         """Возвращает список времени отправления всех рейсов"""
-        flights = WebDriverWait(self.driver, 10).until(
-            EC.presence_of_all_elements_located(
+        return [datetime.strptime(card["departure_time"], '%H:%M').time()
+                for card in self.extract_cards() if card["departure_time"]]
+
+    def iter_cards(self, batch_size: int = 20, max_cards: int = 500
+                   ) -> Iterator[Dict[str, Optional[object]]]:
+        """
+        Лениво отдаёт карточки в порядке DOM пачками по batch_size;
+        когда отрисованные закончились, нажимает «Показать ещё»
+        """
+        if isinstance(self.driver, DomSnapshot):
+            yield from self.extract_cards()[:max_cards]
+            return
+        WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located(
                 (By.CSS_SELECTOR, 'div[data-test-id="ticket-preview"]')))
-        times = []
-        for flight in flights:
-            departure_segment = flight.find_element(
-                By.CSS_SELECTOR, 'div.s__znjsAig6OswOqOsl.s__ArEb299EZ30wXeEL')
-            time_elements = departure_segment.find_elements(
-                By.CSS_SELECTOR, 'div[data-test-id="text"]')
-            for el in time_elements:
-                text = el.text.strip()
-                if re.match(r'^\d{2}:\d{2}$', text):
-                    times.append(datetime.strptime(text, '%H:%M').time())
-        return times
+        offset = 0
+        while offset < max_cards:
+            batch = self._read_cards(offset,
+                                     min(batch_size, max_cards - offset))
+            if not batch:
+                if not self._show_more(offset):
+                    return
+                continue
+            yield from batch
+            offset += len(batch)
+
+    def _show_more(self, rendered: int) -> bool:
+        """Догружает результаты; False — догружать больше нечего"""
+        buttons = self.driver.find_elements(By.XPATH, SHOW_MORE_BUTTON)
+        if not buttons:
+            return False
+        self.driver.execute_script("arguments[0].click();", buttons[0])
+        try:
+            self.waits.until(
+                lambda d: d.execute_script(
+                    "return document.querySelectorAll("
+                    "'div[data-test-id=\"ticket-preview\"]').length;")
+                > rendered,
+                "догрузка результатов", timeout=15)
+        except TimeoutException:
+            return False
+        return True
+
+    @allure.step("Потоково проверить порядок вылета и цены")
+    def verify_departure_order(self, price_min: Optional[float] = None,
+                               price_max: Optional[float] = None,
+                               max_cards: int = 500) -> Verdict:
+        """
+        Проверяет до max_cards карточек по мере догрузки, не храня их:
+        время вылета не убывает (с одним переходом через полночь),
+        цены положительны и в пределах диапазона. Останавливается
+        на первом нарушении.
+        """
+        return DepartureOrderVerifier(price_min, price_max).verify(
+            self.iter_cards(max_cards=max_cards))
 
 # ================= ЦЕНЫ =================
     @allure.step("Выбрать количество взрослых пассажиров: {adults}")
@@ -257,9 +475,9 @@ class SearchPage:
         passenger_field = self.driver.find_element(
             By.CSS_SELECTOR, '[data-test-id="passengers-field"]')
         passenger_field.click()
-        sleep(1)
-        adult_container = self.driver.find_element(
-            By.CSS_SELECTOR, '[data-test-id="number-of-adults"]')
+        adult_container = self.waits.until(EC.visibility_of_element_located(
+            (By.CSS_SELECTOR, '[data-test-id="number-of-adults"]')),
+            "выбор пассажиров")
         count_el = adult_container.find_element(
             By.CSS_SELECTOR, '[data-test-id="passenger-number"]')
         current_count = int(count_el.text.strip())
@@ -267,16 +485,18 @@ class SearchPage:
             By.CSS_SELECTOR, 'button[data-test-id="increase-button"]')
         decrease_btn = adult_container.find_element(
             By.CSS_SELECTOR, 'button[data-test-id="decrease-button"]')
-        while current_count < adults:
-            increase_btn.click()
-            current_count += 1
-            sleep(0.3)
-        while current_count > adults:
-            decrease_btn.click()
-            current_count -= 1
-            sleep(0.3)
+        while current_count != adults:
+            step = 1 if current_count < adults else -1
+            (increase_btn if step > 0 else decrease_btn).click()
+            current_count += step
+            # ждём, пока счётчик отрисует новое значение
+            self.waits.until(
+                lambda d, expected=str(current_count):
+                    count_el.text.strip() == expected,
+                f"пассажиров: {current_count}")
         find_tickets_btn = self.driver.find_element(
             By.CSS_SELECTOR, 'button[data-test-id="form-submit"]')
+        self._new_search()
         find_tickets_btn.click()
 
         WebDriverWait(self.driver, 20).until(
@@ -290,24 +510,8 @@ class SearchPage:
     @allure.step("Получить все цены билетов")
     def get_ticket_prices(self) -> List[int]:
         """Возвращает список цен всех найденных билетов"""
-        flights = WebDriverWait(self.driver, 10).until(
-            EC.presence_of_all_elements_located(
-                (By.CSS_SELECTOR, 'div[data-test-id^="ticket"]')))
-        self.wait.until(EC.presence_of_element_located(
-            (By.CSS_SELECTOR, '[data-test-id^="ticket"]')))
-
-        prices = []
-        for flight in flights:
-            try:
-
-                price_el = flight.find_element(
-                    By.CSS_SELECTOR, 'div[data-test-id="price"]')
-                text = price_el.text.strip()
-                price_value = int(re.sub(r"[^\d]", "", text))
-                prices.append(price_value)
-            except Exception:
-                continue
-        return prices
+        return [card["price"] for card in self.extract_cards()
+                if card["price"] is not None]
 
     # ================= ПОДРОБНОСТИ РЕЙСА =================
     @allure.step("Открыть карточку рейса")
@@ -325,8 +529,8 @@ class SearchPage:
 
         # Прокрутка до элемента и клик через JS, чтобы избежать наложений
         self.driver.execute_script(
-            "arguments[0].scrollIntoView({block: 'center'});", first_flight)
-        sleep(0.5)
+            "arguments[0].scrollIntoView("
+            "{block: 'center', behavior: 'instant'});", first_flight)
         try:
             # пробуем стандартный клик через ActionChains
             actions = ActionChains(self.driver)
@@ -340,6 +544,8 @@ class SearchPage:
         """
         Возвращает словарь с деталями рейса.
         В случае отсутствия данных возвращает None.
+        Детали всегда читаются из открытой карточки: порядок билетов
+        в ответе API не совпадает с порядком на странице.
         """
         details = {}
         self.wait.until(EC.presence_of_element_located(
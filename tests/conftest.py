@@ -0,0 +1,219 @@
+import os
+import allure
+import allure_commons
+import pytest
+from functools import partial
+from selenium.common.exceptions import WebDriverException
+from project.utils.browser_pool import BrowserPool, chrome_options
+from project.utils.cassette import Cassette, MODES, PASSTHROUGH
+from project.utils.durations import DurationHistory
+from project.utils.failure_artifacts import ArtifactPipeline
+from project.utils.fare_store import FareStore
+from project.utils.lean_mode import (LeanMode, PageLoadStats,
+                                     collect_page_loads, record_page_loads)
+from project.utils.search_cache import SearchResultsCache
+from project.utils.step_timing import (BUDGET_MODES, OFF, WARN, StepTimer,
+                                       StepTimingHistory, parse_budgets)
+from project.utils.wd_profiler import CommandProfiler
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("aviasales")
+    group.addoption("--api-mode", choices=MODES, default=PASSTHROUGH,
+                    help="Режим API-тестов: record — записать кассеты, "
+                         "replay — отвечать из кассет без сети, "
+                         "passthrough — ходить в сеть (по умолчанию)")
+    group.addoption("--cassette-dir", default=os.path.join(
+                        os.path.dirname(__file__), "cassettes"),
+                    help="Каталог с кассетами API-тестов")
+    group.addoption("--fare-store", default=None,
+                    help="Файл SQLite, в который сохраняются цены "
+                         "из ответов API (по умолчанию не сохраняются)")
+    group.addoption("--browser-pool-size", type=int, default=1,
+                    help="Сколько браузеров запускать заранее")
+    group.addoption("--headed", action="store_true",
+                    help="Запускать браузеры с окном (не headless)")
+    group.addoption("--network-capture", action="store_true",
+                    help="Брать данные рейсов из ответов API страницы "
+                         "(Chrome DevTools), а не из DOM")
+    group.addoption("--lean", action="store_true",
+                    help="Облегчённый режим браузера: без картинок, "
+                         "шрифтов, аналитики, рекламы и анимаций")
+    group.addoption("--page-stats", default=".page_loads.json",
+                    help="Файл со статистикой загрузок страниц "
+                         "для сравнения обычного и облегчённого режима")
+    group.addoption("--wd-profile", action="store_true",
+                    help="Профилировать команды WebDriver по методам "
+                         "Page Object; отчёт прикладывается к Allure")
+    group.addoption("--step-budget", choices=BUDGET_MODES, default=WARN,
+                    help="Что делать, если шаг Allure превысил бюджет "
+                         "или заметно замедлился: warn, fail или off")
+    group.addoption("--step-history", default=".step_timings.json",
+                    help="Файл с историей длительностей шагов")
+    group.addoption("--durations-file", default=".test_durations.json",
+                    help="Файл с длительностями тестов прошлых запусков")
+    group.addoption("--duration-schedule", action="store_true",
+                    help="С pytest-xdist (-n N --dist loadgroup) "
+                         "распределять тесты по воркерам с учётом "
+                         "их прошлых длительностей")
+    group.addoption("--no-failure-artifacts", action="store_true",
+                    help="Не сохранять скриншот, DOM и консоль "
+                         "при падении UI-теста")
+    group.addoption("--step-screenshots", type=float, default=0.0,
+                    help="Доля успешных шагов Allure со скриншотом "
+                         "(0 — только падения)")
+    group.addoption("--no-search-cache", action="store_true",
+                    help="Выполнять поиск заново в каждом UI-тесте")
+    parser.addini("step_budgets", type="linelist", default=[],
+                  help="Бюджеты шагов: 'SearchPage.set_to_city = 3'")
+
+
+def pytest_configure(config):
+    mode = config.getoption("--step-budget")
+    if mode != OFF:
+        timer = StepTimer(
+            StepTimingHistory(config.getoption("--step-history")),
+            parse_budgets(config.getini("step_budgets")), mode)
+        allure_commons.plugin_manager.register(timer)
+        config.pluginmanager.register(timer, "step_timer")
+    if not config.getoption("--no-failure-artifacts"):
+        artifacts = ArtifactPipeline(
+            step_sample_rate=config.getoption("--step-screenshots"))
+        allure_commons.plugin_manager.register(artifacts)
+        config.pluginmanager.register(artifacts, "failure_artifacts")
+    # сохраняет статистику контроллер xdist (или обычный запуск)
+    config.pluginmanager.register(
+        PageLoadStats(config.getoption("--page-stats")), "page_load_stats")
+    if not hasattr(config, "workerinput"):
+        # длительности пишет только контроллер xdist (или обычный запуск)
+        config.pluginmanager.register(
+            DurationHistory(config.getoption("--durations-file")),
+            "test_durations")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if not config.getoption("--duration-schedule"):
+        return None
+    from project.utils.xdist_scheduler import DurationScheduling
+    return DurationScheduling(
+        config, log, config.pluginmanager.get_plugin("test_durations"))
+
+
+@pytest.fixture(scope="module")
+def api_cassette(request):
+    """Кассета текущего модуля или None в режиме passthrough"""
+    mode = request.config.getoption("--api-mode")
+    if mode == PASSTHROUGH:
+        yield None
+        return
+    name = request.module.__name__.rsplit(".", 1)[-1]
+    cassette = Cassette(os.path.join(
+        request.config.getoption("--cassette-dir"), f"{name}.cassette"), mode)
+    yield cassette
+    cassette.close()
+
+
+@pytest.fixture(scope="session")
+def fare_store(request):
+    """Хранилище цен из ответов API или None, если --fare-store не задан"""
+    path = request.config.getoption("--fare-store")
+    if path is None:
+        yield None
+        return
+    store = FareStore(path)
+    yield store
+    store.close()
+
+
+# ================= БРАУЗЕРЫ =================
+@pytest.fixture(scope="session")
+def browser_pool(request):
+    """Пул заранее запущенных браузеров на всю сессию"""
+    pool = BrowserPool(
+        size=request.config.getoption("--browser-pool-size"),
+        options_factory=partial(
+            chrome_options,
+            headless=not request.config.getoption("--headed"),
+            network_log=request.config.getoption("--network-capture"),
+            console_log=not request.config.getoption(
+                "--no-failure-artifacts")))
+    pool.start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def page_load_stats(request):
+    """Статистика загрузок страниц по режимам за все запуски"""
+    return request.config.pluginmanager.get_plugin("page_load_stats")
+
+
+@pytest.fixture(scope="session")
+def wd_profiler(request):
+    """Профилировщик команд WebDriver или None без --wd-profile"""
+    if not request.config.getoption("--wd-profile"):
+        yield None
+        return
+    profiler = CommandProfiler().start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+    allure.attach(profiler.report(), name="Профиль команд WebDriver",
+                  attachment_type=allure.attachment_type.TEXT)
+
+
+@pytest.fixture
+def driver(request, browser_pool, page_load_stats, wd_profiler):
+    """
+    Браузер из пула на время теста. После теста он сбрасывается
+    (cookies, storage, вкладки) и возвращается в пул без перезапуска.
+
+    С --lean тяжёлые ресурсы блокируются; снять блокировку для теста
+    можно маркером @pytest.mark.lean_allow("image", "*mc.yandex.ru*").
+    """
+    browser = browser_pool.acquire()
+    if wd_profiler is not None:
+        wd_profiler.wrap(browser)
+    lean = request.config.getoption("--lean")
+    recorder = record_page_loads(browser)
+    lean_script = None
+    if lean:
+        marker = request.node.get_closest_marker("lean_allow")
+        lean_script = LeanMode().apply(browser, marker.args if marker else ())
+    artifacts = request.config.pluginmanager.get_plugin("failure_artifacts")
+    if artifacts is not None:
+        artifacts.watch(browser)
+    yield browser
+    if artifacts is not None:
+        artifacts.unwatch()
+    try:
+        loads = collect_page_loads(browser, recorder)
+        if loads:
+            allure.attach(page_load_stats.report(loads, lean),
+                          name="Загрузка страниц",
+                          attachment_type=allure.attachment_type.TEXT)
+            page_load_stats.add("lean" if lean else "full", loads)
+        if lean_script is not None:
+            LeanMode.release(browser, lean_script)
+    except WebDriverException:
+        pass  # браузер неисправен — пул заменит его при возврате
+    browser_pool.release(browser)
+
+
+@pytest.fixture(scope="session")
+def network_capture(request):
+    """Включён ли перехват ответов API страницы (SearchPage capture)"""
+    return request.config.getoption("--network-capture")
+
+
+@pytest.fixture(scope="session")
+def search_cache(request):
+    """
+    Кэш результатов поиска на сессию: одинаковый поиск выполняется
+    один раз, остальные тесты читают результаты из снимка DOM
+    """
+    return SearchResultsCache(
+        max_age=0 if request.config.getoption("--no-search-cache")
+        else 30 * 60)
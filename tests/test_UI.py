@@ -1,58 +1,41 @@
 import allure
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from project.pages.search_page import SearchPage
+from project.utils.price_analytics import TicketBatch
 from typing import List
 from config.test_data import BASE_URL_UI
 
-
-# ================= FIXTURE =================
-@pytest.fixture(scope="module")
-def driver():
-    """
-    Создает экземпляр Chrome WebDriver на весь модуль,
-    чтобы ускорить прогон всех тестов.
-    """
-    options = Options()
-    options.add_argument("--log-level=3")  # подавляем лишние логи
-    driver = webdriver.Chrome(service=ChromeService(
-        ChromeDriverManager().install()), options=options)
-    yield driver
-    driver.quit()
+# Москва → Пермь; форму поиска проверяет тест 6, остальные открывают
+# результаты поиска напрямую по URL, а тесты, которые только читают
+# результаты, берут повторный поиск из кэша сессии (фикстура
+# search_cache)
+ORIGIN, DESTINATION = "MOW", "PEE"
 
 
 # ================= ТЕСТ 1 =================
 @pytest.mark.ui
+@pytest.mark.xdist_group("search_mow_pee")
 @allure.title("Поиск авиабилетов с корректными параметрами")
 @allure.description("Проверка, что поиск возвращает\
                      корректные результаты при правильных параметрах.")
 @allure.feature("Поиск авиабилетов")
 @allure.severity(allure.severity_level.CRITICAL)
-def test_search_flights_valid_params(driver):
+def test_search_flights_valid_params(driver, search_cache, network_capture):
     """
     Проверка поиска рейсов с корректными параметрами.
     """
-    search_page = SearchPage(driver, BASE_URL_UI)
-
-    with allure.step("Открыть страницу поиска"):
-        search_page.open()
-
-    with allure.step("Ввести параметры поиска"):
-        search_page.set_from_city("Москва")
-        search_page.set_to_city("Пермь")
+    search_page = SearchPage(driver, BASE_URL_UI,
+                             capture=network_capture)
 
-    with allure.step("Выбрать дату"):
-        search_page.set_date()
+    with allure.step("Открыть результаты поиска Москва → Пермь"):
+        results_page = search_cache.open(search_page, ORIGIN, DESTINATION)
 
     with allure.step("Проверить, что есть результаты"):
-        results: List = search_page.get_search_results()
+        results: List = results_page.get_search_results()
         assert len(results) > 0, "Результаты поиска не найдены!"
 
     with allure.step("Проверить маршрут первого результата"):
-        origin, destination = search_page.get_first_result_route()
+        origin, destination = results_page.get_first_result_route()
         assert "Москва" in origin, f"Ожидалось 'Москва', но найдено '{origin}'"
         assert "Пермь" in destination, f"Ожидалось 'Пермь',\
               но найдено '{destination}'"
@@ -87,14 +70,12 @@ def test_search_flights_empty_fields(driver):
 @allure.title("Отображение подробной информации о рейсе")
 @allure.feature("Поиск авиабилетов")
 @allure.severity(allure.severity_level.CRITICAL)
-def test_flight_details(driver):
-    search_page = SearchPage(driver, BASE_URL_UI)
+def test_flight_details(driver, network_capture):
+    search_page = SearchPage(driver, BASE_URL_UI,
+                             capture=network_capture)
 
     with allure.step("Открыть страницу поиска и задать параметры"):
-        search_page.open()
-        search_page.set_from_city("Москва")
-        search_page.set_to_city("Пермь")
-        search_page.set_date()
+        search_page.open_results(ORIGIN, DESTINATION)
 
     with allure.step("Открыть карточку рейса"):
         search_page.open_flight_card()
@@ -115,55 +96,80 @@ def test_flight_details(driver):
                      в порядке возрастания времени отправления.")
 @allure.feature("Поиск авиабилетов")
 @allure.severity(allure.severity_level.CRITICAL)
-def test_sort_by_departure_time(driver):
-    search_page = SearchPage(driver, BASE_URL_UI)
+def test_sort_by_departure_time(driver, network_capture):
+    search_page = SearchPage(driver, BASE_URL_UI,
+                             capture=network_capture)
 
     with allure.step("Открыть страницу поиска и задать параметры"):
-        search_page.open()
+        search_page.open_results(ORIGIN, DESTINATION)
         search_page.accept_cookies_if_present()
-        search_page.set_from_city("Москва")
-        search_page.set_to_city("Пермь")
-        search_page.set_date()
 
     with allure.step("Сортировка по времени вылета"):
         search_page.open_sort_filter()
         search_page.sort_by_earliest_departure()
 
     with allure.step("Проверить, что рейсы отсортированы"):
-        departure_times = search_page.get_departure_times()
-        sorted_times = \
-            search_page.sort_times_with_midnight_crossing(departure_times)
-        assert departure_times == sorted_times, \
-            f"Список рейсов не отсортирован: {departure_times}"
+        verdict = search_page.verify_departure_order()
+        assert verdict.checked > 0, "Рейсы не найдены на странице"
+        assert verdict.ok, \
+            f"Список рейсов не отсортирован: {verdict.violation}"
 
 
 # ================= ТЕСТ 5 =================
 @pytest.mark.ui
+@pytest.mark.xdist_group("search_mow_pee")
 @allure.title("Отображение стоимости для нескольких пассажиров")
 @allure.description("Проверка расчета стоимости билетов при\
                      увеличении числа пассажиров")
 @allure.feature("Фильтрация авиабилетов")
 @allure.severity(allure.severity_level.CRITICAL)
-def test_filter_by_price(driver):
+def test_filter_by_price(driver, search_cache, network_capture):
+    search_page = SearchPage(driver, BASE_URL_UI,
+                             capture=network_capture)
+
+    with allure.step("Получить стоимость для 1 пассажира"):
+        prices_1 = search_cache.open(
+            search_page, ORIGIN, DESTINATION).get_ticket_prices()
+
+    with allure.step("Получить стоимость для 3 пассажиров"):
+        search_page.open_results(ORIGIN, DESTINATION, adults=3)
+        prices_3 = search_page.get_ticket_prices()
+
+    with allure.step("Проверить корректность расчета цен"):
+        scaling = TicketBatch.from_prices(prices_3).scaled_against(
+            TicketBatch.from_prices(prices_1), passengers=3)
+        assert scaling.scales, (
+            f"Средняя цена для 3 пассажиров ({scaling.mean_group}) "
+            f"меньше 3 * средней цены для 1 ({scaling.mean_single})")
+
+
+# ================= ТЕСТ 6 =================
+@pytest.mark.ui
+@allure.title("Поиск авиабилетов через форму")
+@allure.description("Проверка, что заполнение формы поиска (города,\
+                     дата, пассажиры) приводит к результатам.")
+@allure.feature("Поиск авиабилетов")
+@allure.severity(allure.severity_level.CRITICAL)
+def test_search_through_form(driver):
     search_page = SearchPage(driver, BASE_URL_UI)
 
-    with allure.step("Открыть страницу поиска и задать параметры"):
+    with allure.step("Открыть страницу поиска"):
         search_page.open()
+
+    with allure.step("Заполнить форму и выполнить поиск"):
         search_page.set_from_city("Москва")
         search_page.set_to_city("Пермь")
         search_page.set_date()
 
-    with allure.step("Получить стоимость для 1 пассажира"):
-        search_page.set_adult_passengers(1)
-        prices_1 = search_page.get_ticket_prices()
-
-    with allure.step("Получить стоимость для 3 пассажиров"):
-        search_page.set_adult_passengers(3)
-        prices_3 = search_page.get_ticket_prices()
+    with allure.step("Проверить маршрут первого результата"):
+        assert search_page.get_search_results(), \
+            "Результаты поиска не найдены!"
+        origin, destination = search_page.get_first_result_route()
+        assert "Москва" in origin, f"Ожидалось 'Москва', но найдено '{origin}'"
+        assert "Пермь" in destination, \
+            f"Ожидалось 'Пермь', но найдено '{destination}'"
 
-    with allure.step("Проверить корректность расчета цен"):
-        avg_price_1 = sum(prices_1) / len(prices_1)
-        avg_price_3 = sum(prices_3) / len(prices_3)
-        assert avg_price_3 >= avg_price_1 * 3, (
-            f"Средняя цена для 3 пассажиров ({avg_price_3}) "
-            f"меньше 3 * средней цены для 1 ({avg_price_1})")
+    with allure.step("Изменить число пассажиров в форме"):
+        search_page.set_adult_passengers(2)
+        assert search_page.get_ticket_prices(), \
+            "Цены после смены числа пассажиров не найдены"
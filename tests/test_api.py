@@ -1,12 +1,16 @@
 import pytest
 import allure
 from project.pages.api_page import AviasalesApi
+from project.utils.price_analytics import TicketBatch
 from config.test_data import BASE_URL_API, TOKEN
 
 
 @pytest.fixture(scope="module")
-def api():
-    return AviasalesApi(base_url=BASE_URL_API, token=TOKEN)
+def api(api_cassette, fare_store):
+    with AviasalesApi(base_url=BASE_URL_API, token=TOKEN,
+                      cassette=api_cassette,
+                      fare_store=fare_store) as client:
+        yield client
 
 
 @pytest.mark.api
@@ -17,6 +21,8 @@ def test_search_tickets_by_price_range(api):
     data = response.json()
     assert "data" in data
     assert isinstance(data["data"], list)
+    prices = TicketBatch.from_response(response).range_check(1000, 2000)
+    assert prices.compliant, f"Цены вне диапазона 1000-2000: {prices}"
 
 
 @pytest.mark.api
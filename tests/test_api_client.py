@@ -0,0 +1,240 @@
+import json
+import time
+import pytest
+import allure
+from concurrent.futures import ThreadPoolExecutor
+from project.pages.api_page import AviasalesApi
+from project.utils.cassette import Cassette, CassetteMissError, RECORD, REPLAY
+from project.utils.http_cache import ResponseCache
+from project.utils.rate_limiter import (CLOSED, HALF_OPEN, CircuitOpenError,
+                                        RateLimiter)
+from project.utils.stub_server import StubServer
+from project.utils.tickets import Ticket, iter_tickets
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with StubServer(tickets=95) as server:
+        yield server
+
+
+@pytest.fixture
+def stub_api(stub_server):
+    with AviasalesApi(base_url=stub_server.url, token="test",
+                      currency_url=stub_server.currency_url) as client:
+        yield client
+
+
+@pytest.mark.api
+@allure.title("Заглушка повторяет ответы сервиса")
+def test_stub_server_mimics_service(stub_api):
+    response = stub_api.search_by_price_range("MOW", "LED", 1000, 2000)
+    assert response.status_code == 200
+    assert all(1000 <= t["price"] <= 2000 for t in response.json()["data"])
+    rates = stub_api.get_currency_rates().json()
+    assert all(currency in rates for currency in ("usd", "eur", "gbp"))
+    assert stub_api.get_latest_prices("MOW", "LED", token="").status_code \
+        == 401
+    assert stub_api.get_latest_prices("ZZZ", "XXX", token="test")\
+        .status_code == 400
+
+
+@pytest.mark.api
+@allure.title("Постраничный обход отдаёт все билеты и останавливается")
+def test_iter_search_by_price_range_walks_all_pages(stub_api):
+    numbers = [int(ticket["flight_number"]) for ticket in
+               stub_api.iter_search_by_price_range("MOW", "LED", limit=20)]
+    assert numbers == list(range(1, 96))
+
+
+@pytest.mark.api
+@allure.title("Постраничный обход можно прервать на середине")
+def test_iter_prices_for_dates_is_lazy(stub_api):
+    tickets = stub_api.iter_prices_for_dates(
+        "MOW", "LED", "2025-07", "2025-08", limit=10)
+    first = [next(tickets) for _ in range(5)]
+    tickets.close()
+    assert [t["flight_number"] for t in first] == ["1", "2", "3", "4", "5"]
+
+
+@pytest.mark.api
+@allure.title("Повторный запрос отдаётся из кэша")
+def test_cache_serves_repeated_request(stub_server):
+    cache = ResponseCache()
+    with AviasalesApi(stub_server.url, token="test", cache=cache) as api:
+        before = stub_server.requests
+        first = api.prices_for_dates("MOW", "LON", "2025-07", "2025-08")
+        second = api.prices_for_dates("MOW", "LON", "2025-07", "2025-08")
+    assert stub_server.requests - before == 1
+    assert second.json() == first.json()
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0,
+                             "revalidations": 0}
+
+
+@pytest.mark.api
+@allure.title("Просроченная запись перепроверяется по ETag")
+def test_cache_revalidates_stale_entry(stub_server):
+    cache = ResponseCache(default_ttl=0, ttls={})
+    with AviasalesApi(stub_server.url, token="test", cache=cache) as api:
+        first = api.search_by_price_range("MOW", "LED")
+        second = api.search_by_price_range("MOW", "LED")
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert cache.revalidations == 1
+
+
+@pytest.mark.api
+@allure.title("Кэш вытесняет давно не используемые записи")
+def test_cache_lru_eviction(stub_server, tmp_path):
+    cache = ResponseCache(max_entries=2, path=str(tmp_path / "cache.sqlite"))
+    with AviasalesApi(stub_server.url, token="test", cache=cache) as api:
+        for destination in ("LED", "AER", "KZN"):
+            api.search_by_price_range("MOW", destination)
+    assert cache.evictions == 1
+    cache.close()
+
+
+@pytest.mark.api
+@allure.title("Потоковые запросы идут мимо кэша")
+def test_cache_bypassed_for_streaming(stub_server):
+    cache = ResponseCache()
+    with AviasalesApi(stub_server.url, token="test", cache=cache) as api:
+        before = stub_server.requests
+        for _ in range(2):
+            assert len(list(api.prices_for_dates_tickets(
+                "MOW", "LON", "2025-07", "2025-08", limit=50))) == 50
+    assert stub_server.requests - before == 2
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+
+
+@pytest.mark.api
+@allure.title("Кассета воспроизводит записанные ответы без сети")
+def test_cassette_record_and_replay(stub_server, tmp_path):
+    path = str(tmp_path / "api.cassette")
+    with AviasalesApi(stub_server.url, token="secret",
+                      cassette=Cassette(path, RECORD)) as api:
+        recorded = api.search_by_price_range("MOW", "LED").json()
+        api.cassette.close()
+    assert b"secret" not in open(path, "rb").read()
+
+    requests_before = stub_server.requests
+    with AviasalesApi(stub_server.url, token="other",
+                      cassette=Cassette(path, REPLAY)) as api:
+        replayed = api.search_by_price_range("MOW", "LED")
+        with pytest.raises(CassetteMissError):
+            api.search_by_price_range("MOW", "AER")
+        api.cassette.close()
+    assert replayed.json() == recorded
+    assert stub_server.requests == requests_before
+
+
+@pytest.mark.api
+@allure.title("Потоковый разбор работает на записанной кассете")
+def test_cassette_replays_streamed_tickets(stub_server, tmp_path):
+    path = str(tmp_path / "stream.cassette")
+    with AviasalesApi(stub_server.url, token="test",
+                      cassette=Cassette(path, RECORD)) as api:
+        recorded = list(api.prices_for_dates_tickets(
+            "MOW", "LON", "2025-07", "2025-08", limit=20))
+        api.cassette.close()
+
+    requests_before = stub_server.requests
+    with AviasalesApi(stub_server.url, token="test",
+                      cassette=Cassette(path, REPLAY)) as api:
+        replayed = list(api.prices_for_dates_tickets(
+            "MOW", "LON", "2025-07", "2025-08", limit=20))
+        api.cassette.close()
+    assert len(recorded) == 20 and replayed == recorded
+    assert stub_server.requests == requests_before
+
+
+@pytest.mark.api
+@allure.title("Потоковый разбор совпадает с .json()")
+def test_streamed_tickets_match_json(stub_api):
+    expected = [Ticket.from_dict(raw) for raw in stub_api.prices_for_dates(
+        "MOW", "LON", "2025-07", "2025-08", limit=50).json()["data"]]
+    tickets = list(stub_api.prices_for_dates_tickets(
+        "MOW", "LON", "2025-07", "2025-08", limit=50))
+    assert tickets == expected
+    assert all(t.departure_at.startswith("2025-07") for t in tickets)
+
+
+@pytest.mark.api
+@allure.title("Потоковый разбор не зависит от границ чанков")
+def test_iter_tickets_handles_chunk_boundaries():
+    body = json.dumps({"success": True, "total": 123456, "data": [
+        {"price": 1234567, "origin": "MOW", "destination": "LED",
+         "departure_at": "2025-07-01T10:00:00+03:00", "airline": "SU",
+         "transfers": 0, "link": "/search/ЛЕД"}] * 3,
+        "currency": "rub"}, ensure_ascii=False).encode()
+    chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+    tickets = list(iter_tickets(chunks))
+    assert len(tickets) == 3
+    assert tickets[0].price == 1234567 and tickets[0].airline == "SU"
+
+
+@pytest.mark.api
+@allure.title("Ограничитель подстраивается под 429 и не теряет запросы")
+def test_rate_limiter_adapts_to_throttling():
+    limiter = RateLimiter({"/aviasales/v3/prices_for_dates": 100},
+                          retries=10)
+    with StubServer(tickets=5, rate_limit=40) as server, \
+            AviasalesApi(base_url=server.url, token="test",
+                         limiter=limiter) as api, \
+            ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(executor.map(
+            lambda _: api.prices_for_dates("MOW", "LED", "2025-06", None),
+            range(60)))
+    assert all(response.status_code == 200 for response in responses)
+    stats = limiter.stats()["/aviasales/v3/prices_for_dates"]
+    assert stats["served"] == 60
+    assert stats["throttled"] == server.throttled > 0
+    # скорость снизилась от стартовых 100 к пределу заглушки
+    assert stats["rate"] < 100
+
+
+@pytest.mark.api
+@allure.title("Разомкнутая цепь отказывает без запроса к сервису")
+def test_circuit_breaker_fails_fast():
+    limiter = RateLimiter(failure_threshold=3, reset_timeout=60)
+    with StubServer(error_rate=1.0) as server, \
+            AviasalesApi(base_url=server.url, token="test",
+                         limiter=limiter) as api:
+        for _ in range(3):
+            assert api.prices_for_dates(
+                "MOW", "LED", "2025-06", None).status_code == 500
+        with pytest.raises(CircuitOpenError):
+            api.prices_for_dates("MOW", "LED", "2025-06", None)
+        assert server.requests == 3
+    stats = limiter.stats()["/aviasales/v3/prices_for_dates"]
+    assert (stats["state"], stats["rejected"]) == ("open", 1)
+
+
+@pytest.mark.api
+@allure.title("Пробный запрос, ожидающий токен, не блокирует цепь")
+def test_half_open_probe_waits_for_token():
+    limiter = RateLimiter(default_rate=4, failure_threshold=1,
+                          reset_timeout=0.05)
+    endpoint = limiter.endpoint("/prices")
+    endpoint.acquire()
+    endpoint.on_error()
+    time.sleep(0.06)
+    # токенов нет: проба ждёт около 0.25 с и не отказывает сама себе
+    endpoint.acquire()
+    assert endpoint.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        endpoint.acquire()  # вторая проба, пока первая в полёте
+    endpoint.on_response(200, 0.01)
+    assert endpoint.state == CLOSED
+    assert endpoint.rejected == 1
+
+    endpoint.on_error()
+    time.sleep(0.06)
+
+    def broken_send():
+        raise RuntimeError("ошибка вне requests")
+
+    with pytest.raises(RuntimeError):
+        limiter.call("/prices", broken_send)
+    endpoint.acquire()  # проба освобождена после исключения
+    assert endpoint.state == HALF_OPEN
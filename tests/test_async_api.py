@@ -0,0 +1,70 @@
+import asyncio
+import time
+import pytest
+import allure
+from aiohttp import web
+from project.pages.async_api_page import AsyncAviasalesApi
+
+LATENCY = 0.2
+
+
+async def start_latency_server(latency: float):
+    """Локальная asyncio-заглушка API, отвечающая с задержкой"""
+    stats = {"in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request):
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"],
+                                     stats["in_flight"])
+        await asyncio.sleep(latency)
+        stats["in_flight"] -= 1
+        return web.json_response({"success": True, "data": [
+            {"origin": request.query["origin"],
+             "destination": request.query["destination"]}]})
+
+    app = web.Application()
+    app.router.add_get("/aviasales/v3/search_by_price_range", handler)
+    app.router.add_get("/aviasales/v3/prices_for_dates", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}", stats
+
+
+async def sweep(routes, concurrency):
+    runner, base_url, stats = await start_latency_server(LATENCY)
+    try:
+        async with AsyncAviasalesApi(base_url, token="test",
+                                     concurrency=concurrency) as api:
+            started = time.perf_counter()
+            responses = await api.gather(
+                *(api.search_by_price_range(origin, destination)
+                  for origin, destination in routes))
+            elapsed = time.perf_counter() - started
+    finally:
+        await runner.cleanup()
+    return responses, elapsed, stats
+
+
+@pytest.mark.api
+@allure.title("Асинхронный клиент возвращает результаты в порядке запросов")
+def test_gather_keeps_input_order():
+    routes = [(f"A{i:02d}", f"B{i:02d}") for i in range(20)]
+    responses, _, _ = asyncio.run(sweep(routes, concurrency=10))
+    got = [(r.json()["data"][0]["origin"], r.json()["data"][0]["destination"])
+           for r in responses]
+    assert got == routes
+    assert all(r.status_code == 200 for r in responses)
+
+
+@pytest.mark.api
+@allure.title("Асинхронный клиент ограничивает число запросов в полёте")
+def test_concurrency_limit():
+    routes = [("MOW", "LED")] * 20
+    _, elapsed, stats = asyncio.run(sweep(routes, concurrency=5))
+    assert stats["max_in_flight"] == 5
+    # 20 запросов по 5 одновременно — примерно 4 волны задержки
+    assert elapsed < LATENCY * 20 / 2, \
+        f"Запросы шли последовательно: {elapsed}"
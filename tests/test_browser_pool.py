@@ -0,0 +1,120 @@
+import json
+import os
+import time
+import allure
+import pytest
+from selenium.common.exceptions import WebDriverException
+from project.utils import browser_pool
+from project.utils.browser_pool import BrowserPool, resolve_driver_path
+
+
+class FakeChrome:
+    """Браузер без Chrome: запоминает команды сброса"""
+
+    def __init__(self, service=None, options=None):
+        self.window_handles = ["main"]
+        self.current = "main"
+        self.commands = []
+        self.broken = False
+        self.quit_called = False
+        self.switch_to = self
+
+    def window(self, handle):
+        self.current = handle
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def execute_script(self, script, *args):
+        if self.broken:
+            raise WebDriverException("tab crashed")
+        self.commands.append("storage")
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append(cmd)
+
+    def get(self, url):
+        self.commands.append(url)
+
+    def get_log(self, log_type):
+        # лог консоли не включён
+        raise WebDriverException("log type 'browser' not found")
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(browser_pool.webdriver, "Chrome", FakeChrome)
+    monkeypatch.setattr(browser_pool, "ChromeService",
+                        lambda path: None)
+    pool = BrowserPool(size=1, driver_path="chromedriver").start()
+    yield pool
+    pool.close()
+
+
+@allure.title("Возвращённый в пул браузер выдаётся повторно")
+def test_released_browser_is_reused(pool):
+    driver = pool.acquire()
+    # пока первый браузер занят, пул запускает ещё один
+    extra = pool.acquire()
+    assert extra is not driver
+    pool.release(driver)
+    assert pool.acquire() is driver
+
+
+@allure.title("Сброс закрывает лишние вкладки и чистит состояние")
+def test_reset_clears_browser_state(pool):
+    driver = pool.acquire()
+    driver.window_handles.extend(["popup", "report"])
+    pool.release(driver)
+    assert driver.window_handles == ["main"]
+    assert driver.current == "main"
+    assert driver.commands == [
+        "storage", "Network.clearBrowserCookies", "about:blank"]
+    assert not driver.quit_called
+
+
+@allure.title("Браузер, который не удалось сбросить, заменяется новым")
+def test_broken_browser_is_replaced(pool):
+    driver = pool.acquire()
+    driver.broken = True
+    pool.release(driver)
+    assert driver.quit_called
+    replacement = pool.acquire()
+    assert replacement is not driver
+    assert driver not in pool._all and replacement in pool._all
+
+
+class FakeDriverManager:
+    installs = 0
+
+    def install(self):
+        FakeDriverManager.installs += 1
+        return __file__
+
+
+@allure.title("Путь к chromedriver кэшируется на диске на ttl секунд")
+def test_resolve_driver_path_is_cached(monkeypatch, tmp_path):
+    monkeypatch.setattr(browser_pool, "ChromeDriverManager",
+                        FakeDriverManager)
+    monkeypatch.setattr(FakeDriverManager, "installs", 0)
+    cache_file = str(tmp_path / "cache" / "chromedriver.json")
+    assert resolve_driver_path(cache_file) == __file__
+    assert resolve_driver_path(cache_file) == __file__
+    assert FakeDriverManager.installs == 1
+
+    # устаревшая запись
+    with open(cache_file, "w") as file:
+        json.dump({"path": __file__,
+                   "resolved_at": time.time() - 10}, file)
+    assert resolve_driver_path(cache_file, ttl=5) == __file__
+    assert FakeDriverManager.installs == 2
+
+    # драйвер из кэша удалён с диска
+    with open(cache_file, "w") as file:
+        json.dump({"path": os.path.join(str(tmp_path), "gone"),
+                   "resolved_at": time.time()}, file)
+    assert resolve_driver_path(cache_file) == __file__
+    assert FakeDriverManager.installs == 3
@@ -0,0 +1,103 @@
+import threading
+import time
+import numpy as np
+import pytest
+import allure
+from concurrent.futures import ThreadPoolExecutor
+from project.pages.api_page import AviasalesApi
+from project.utils.currency import CurrencyService
+from project.utils.price_analytics import TicketBatch
+from project.utils.stub_server import CURRENCY_RATES, StubServer
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    with StubServer(tickets=30, latency=0.05) as server:
+        yield server
+
+
+@pytest.fixture
+def stub_api(stub_server):
+    with AviasalesApi(base_url=stub_server.url, token="test",
+                      currency_url=stub_server.currency_url) as client:
+        yield client
+
+
+@pytest.mark.api
+@allure.title("Курсы загружаются один раз на все параллельные запросы")
+def test_rates_are_fetched_once(stub_server, stub_api):
+    currency = CurrencyService(stub_api, ttl=60)
+    before = stub_server.requests
+    start = threading.Barrier(16)
+
+    def rate(_):
+        start.wait()
+        return currency.rate("USD")
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        rates = set(executor.map(rate, range(16)))
+    assert rates == {CURRENCY_RATES["usd"]}
+    assert stub_server.requests - before == 1
+    assert currency.rate("rub") == 1.0
+
+    currency.invalidate()
+    currency.rate("eur")
+    assert stub_server.requests - before == 2
+    assert currency.refreshes == 2
+
+
+@pytest.mark.api
+@allure.title("Старая таблица курсов используется, если API недоступен")
+def test_stale_rates_survive_failure(stub_server, stub_api):
+    currency = CurrencyService(stub_api, ttl=0)
+    assert currency.rate("usd") == CURRENCY_RATES["usd"]
+    stub_server.configure(error_rate=1.0)
+    try:
+        assert currency.rate("usd") == CURRENCY_RATES["usd"]
+        assert currency.failures == 1
+        with pytest.raises(ValueError):
+            currency.rate("xyz")
+    finally:
+        stub_server.configure(error_rate=0.0)
+
+
+@pytest.mark.api
+@allure.title("После неудачной загрузки курсы не перезапрашиваются сразу")
+def test_failed_refresh_is_not_retried_immediately(stub_server, stub_api):
+    currency = CurrencyService(stub_api, ttl=0.2)
+    currency.rate("usd")
+    time.sleep(0.25)
+    stub_server.configure(error_rate=1.0)
+    try:
+        before = stub_server.requests
+        for _ in range(2):
+            assert currency.rate("usd") == CURRENCY_RATES["usd"]
+        assert stub_server.requests - before == 1
+        assert currency.failures == 1
+    finally:
+        stub_server.configure(error_rate=0.0)
+    time.sleep(0.25)
+    currency.rate("usd")
+    assert currency.refreshes == 2
+
+
+@pytest.mark.api
+@allure.title("Цены из разных эндпоинтов приводятся к одной валюте")
+def test_convert_prices(stub_api):
+    currency = CurrencyService(stub_api)
+    usd = np.array([10.0, 20.0, 50.0])
+    rub = currency.convert(usd, "usd")
+    np.testing.assert_allclose(rub, usd * CURRENCY_RATES["usd"])
+    np.testing.assert_allclose(currency.convert(rub, "rub", "usd"), usd)
+    np.testing.assert_allclose(
+        currency.convert_mixed([100.0, 10.0, 1.0], ["RUB", "usd", "eur"],
+                               "usd"),
+        [100 / CURRENCY_RATES["usd"], 10,
+         CURRENCY_RATES["eur"] / CURRENCY_RATES["usd"]])
+
+    response = stub_api.prices_for_dates("MOW", "LED", "2025-07")
+    batch = currency.normalize_response(response, "rub")
+    np.testing.assert_allclose(
+        batch.prices,
+        TicketBatch.from_response(response).prices * CURRENCY_RATES["usd"])
+    assert batch.transfers is not None
@@ -0,0 +1,85 @@
+import allure
+from project.pages.search_page import SearchPage
+from project.utils.dom_snapshot import DomSnapshot
+from project.utils.search_cache import SearchResultsCache
+
+SEGMENT = ('<div class="s__znjsAig6OswOqOsl {cls}">'
+           '<div data-test-id="text">{day}</div>'
+           '<div data-test-id="text">{city}</div>'
+           '<div data-test-id="text">{time}</div></div>')
+CARD = ('<div data-test-id="ticket-preview">'
+        '<div data-test-id="price">{price} ₽</div>'
+        '<img alt="{airline}" src="logo.png">'
+        + SEGMENT.format(cls="s__ArEb299EZ30wXeEL", day="1 июн",
+                         city="Москва", time="{departure}")
+        + SEGMENT.format(cls="s__Vz8S7bOiF1EDe0z9", day="1 июн",
+                         city="Пермь", time="{arrival}")
+        + '</div>')
+MODAL = ('<div data-test-id="ticket-modal-content">'
+         '<div class="s__ndfpzu1qInAbxnYA">'
+         '<div data-test-id="text">06:55</div>'
+         '<div data-test-id="text">Москва</div></div>'
+         '<div class="s__ndfpzu1qInAbxnYA">'
+         '<div data-test-id="text">10:50</div>'
+         '<div data-test-id="text">Пермь</div></div>'
+         '<div data-test-id="proposal-0-title">5 432 ₽</div></div>')
+PAGE = "<html><body>{}</body></html>".format(
+    CARD.format(price="5 432", airline="Аэрофлот", departure="06:55",
+                arrival="10:50")
+    + CARD.format(price="12 100", airline="Победа", departure="23:40",
+                  arrival="03:05")
+    + MODAL)
+
+
+@allure.title("Getters SearchPage работают по снимку DOM без браузера")
+def test_search_page_reads_snapshot(tmp_path):
+    path = str(tmp_path / "results.html")
+    DomSnapshot(PAGE, "https://www.aviasales.ru/search/MOW0106PEE1").save(
+        path)
+    snapshot = DomSnapshot.load(path)
+    assert snapshot.current_url.endswith("/search/MOW0106PEE1")
+
+    page = SearchPage(snapshot, "https://www.aviasales.ru")
+    assert page.get_ticket_prices() == [5432, 12100]
+    assert [t.strftime("%H:%M") for t in page.get_departure_times()] == [
+        "06:55", "23:40"]
+    assert page.get_first_result_route() == ("Москва", "Пермь")
+    assert page.extract_cards()[1]["airline"] == "Победа"
+    assert page.verify_departure_order(price_max=20000) == (2, None)
+    details = page.get_flight_card_details()
+    assert details["origin"] == "Москва"
+    assert details["arrival_time"] == "10:50"
+    assert details["price"] == "5 432 ₽"
+
+
+class Browser(DomSnapshot):
+    """Браузер, который на любой переход показывает PAGE"""
+
+    def __init__(self):
+        super().__init__(PAGE)
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = url
+
+
+@allure.title("Повторный поиск читается из снимка без перехода")
+def test_search_cache_serves_snapshot():
+    cache = SearchResultsCache()
+    browser = Browser()
+    base_url = "https://www.aviasales.ru"
+    first = cache.open(SearchPage(browser, base_url), "MOW", "PEE")
+    second = cache.open(SearchPage(browser, base_url), "MOW", "PEE")
+    cache.open(SearchPage(browser, base_url), "MOW", "PEE", adults=2)
+
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(browser.visited) == 2
+    assert isinstance(second.driver, DomSnapshot)
+    assert second.driver is not browser
+    assert second.get_ticket_prices() == first.get_ticket_prices() == \
+        [5432, 12100]
+    disabled = SearchResultsCache(max_age=0)
+    for _ in range(2):
+        disabled.open(SearchPage(browser, base_url), "MOW", "PEE")
+    assert (disabled.hits, len(browser.visited)) == (0, 4)
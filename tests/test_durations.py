@@ -0,0 +1,103 @@
+import allure
+import pytest
+from types import SimpleNamespace
+from project.utils.durations import DurationHistory, base_nodeid
+
+
+@allure.title("Оценка длительности теста по истории и по модулю")
+def test_duration_estimates(tmp_path):
+    history = DurationHistory(str(tmp_path / "durations.json"))
+    history.durations = {"tests/test_UI.py::test_a": 40.0,
+                         "tests/test_UI.py::test_b": 20.0,
+                         "tests/test_api.py::test_c": 0.5}
+    assert history.estimate("tests/test_UI.py::test_a@search") == 40.0
+    assert history.estimate("tests/test_UI.py::test_new") == 30.0
+    assert history.estimate("tests/test_other.py::test_d") == 20.0
+    assert base_nodeid("tests/t.py::test_e[a@b]") == "tests/t.py::test_e[a@b]"
+
+
+@allure.title("Новый замер сглаживается с прошлым")
+def test_duration_smoothing(tmp_path):
+    path = str(tmp_path / "durations.json")
+
+    class Report:
+        nodeid, duration = "tests/test_UI.py::test_a@search", 3.0
+
+    history = DurationHistory(path)
+    history.pytest_runtest_logreport(Report)
+    history.pytest_sessionfinish(None)
+    history = DurationHistory(path)
+    history.pytest_runtest_logreport(Report)
+    history.pytest_runtest_logreport(Report)
+    history.pytest_sessionfinish(None)
+    assert DurationHistory(path).durations == {
+        "tests/test_UI.py::test_a": 4.5}
+
+
+@allure.title("Испорченный файл длительностей не роняет запуск")
+def test_corrupt_durations_file(tmp_path):
+    path = tmp_path / "durations.json"
+    path.write_text('{"tests/test_UI.py::test_a": 4')
+
+    class Report:
+        nodeid, duration = "tests/test_UI.py::test_b", 2.0
+
+    history = DurationHistory(str(path))
+    assert history.durations == {}
+    history.pytest_runtest_logreport(Report)
+    history.pytest_sessionfinish(None)
+    assert DurationHistory(str(path)).durations == {
+        "tests/test_UI.py::test_b": 2.0}
+    assert [p.name for p in tmp_path.iterdir()] == ["durations.json"]
+
+
+class Worker:
+    """Воркер xdist, запоминающий выданные ему тесты"""
+
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.append(indices)
+
+    def shutdown(self):
+        pass
+
+
+@allure.title("Планировщик выдаёт первыми самые долгие единицы")
+def test_duration_scheduling_longest_first():
+    pytest.importorskip("xdist")
+    from project.utils.xdist_scheduler import DurationScheduling
+    history = DurationHistory()
+    history.durations = {"tests/test_api.py::test_fast": 0.5,
+                         "tests/test_UI.py::test_a": 40.0,
+                         "tests/test_UI.py::test_b": 20.0,
+                         "tests/test_UI.py::test_c": 30.0,
+                         "tests/test_api.py::test_slow": 5.0}
+    collection = ["tests/test_api.py::test_fast",
+                  "tests/test_UI.py::test_c",
+                  "tests/test_UI.py::test_a@search",
+                  "tests/test_api.py::test_slow",
+                  "tests/test_UI.py::test_b@search"]
+    config = SimpleNamespace(
+        getvalue=lambda name: ["2*popen"],
+        option=SimpleNamespace(loadscopereorder=False))
+    scheduler = DurationScheduling(config, durations=history)
+    workers = [Worker("gw0"), Worker("gw1")]
+    for worker in workers:
+        scheduler.add_node(worker)
+        scheduler.add_node_collection(worker, collection)
+    scheduler.schedule()
+
+    # группа search (60 с) и test_c (30 с) стартуют раньше API-тестов;
+    # xdist сразу выдаёт по второй единице — снова самую долгую
+    sent = [[[collection[i] for i in batch] for batch in worker.sent]
+            for worker in workers]
+    assert sent == [
+        [["tests/test_UI.py::test_a@search",
+          "tests/test_UI.py::test_b@search"],
+         ["tests/test_api.py::test_slow"]],
+        [["tests/test_UI.py::test_c"], ["tests/test_api.py::test_fast"]]]
+    assert not scheduler.workqueue
@@ -0,0 +1,148 @@
+import base64
+import threading
+import allure
+import allure_commons
+from allure_commons.logger import AllureMemoryLogger
+from allure_commons import model2
+from allure_commons.reporter import AllureReporter
+from project.utils.failure_artifacts import ArtifactPipeline
+
+SCREENSHOT = b"\xff\xd8jpeg\xff\xd9"
+
+
+class Driver:
+    page_source = "<html><body>" + "x" * 5000 + "</body></html>"
+
+    def execute_cdp_cmd(self, command, params):
+        assert params["format"] == "jpeg"
+        return {"data": base64.b64encode(SCREENSHOT).decode()}
+
+    def get_log(self, log_type):
+        return [{"timestamp": 0, "level": "SEVERE",
+                 "message": "app.js 1:1 Uncaught TypeError"}]
+
+
+class SlowLogger(AllureMemoryLogger):
+    """Пишет вложения только после release"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    @allure_commons.hookimpl
+    def report_attached_data(self, body, file_name):
+        self.release.wait(5)
+        super().report_attached_data(body, file_name)
+
+
+def start_test() -> AllureReporter:
+    reporter = AllureReporter()
+    reporter.schedule_test("test-uuid", model2.TestResult(name="test"))
+    return reporter
+
+
+def run_pipeline(logger, pipeline, action):
+    allure_commons.plugin_manager.register(logger)
+    try:
+        action()
+        pipeline.close()
+    finally:
+        allure_commons.plugin_manager.unregister(logger)
+
+
+@allure.title("Скриншот, DOM и консоль пишутся в отчёт фоновым воркером")
+def test_failure_artifacts_written_off_thread():
+    logger = AllureMemoryLogger()
+    pipeline = ArtifactPipeline(max_text_bytes=1000)
+    pipeline.reporter = reporter = start_test()
+    run_pipeline(logger, pipeline,
+                 lambda: pipeline.capture_failure(Driver()))
+
+    attachments = reporter.get_test(None).attachments
+    assert [a.name for a in attachments] == [
+        "Скриншот при падении", "DOM при падении", "Консоль браузера"]
+    screenshot, dom, log = (logger.attachments[a.source]
+                            for a in attachments)
+    assert screenshot == SCREENSHOT
+    assert attachments[0].type == "image/jpg"
+    assert dom.startswith(b"<html>") and b"5026" in dom
+    assert len(dom) < 1100
+    assert b"SEVERE app.js 1:1 Uncaught TypeError" in log
+    assert pipeline.stats()["written"] == 3
+
+
+@allure.title("При переполненной очереди снимки отбрасываются без ожидания")
+def test_full_queue_drops_artifacts():
+    logger = SlowLogger()
+    pipeline = ArtifactPipeline(max_queue=2)
+    pipeline.reporter = reporter = start_test()
+
+    def capture():
+        for _ in range(3):
+            pipeline.capture_failure(Driver())
+        logger.release.set()
+
+    run_pipeline(logger, pipeline, capture)
+    attachments = reporter.get_test(None).attachments
+    # два вложения ждут в очереди, ещё одно мог забрать воркер
+    assert pipeline.queued == len(attachments) in (2, 3)
+    assert pipeline.dropped == 9 - pipeline.queued
+    assert sorted(logger.attachments) == sorted(a.source
+                                                for a in attachments)
+
+
+@allure.title("Скриншоты успешных шагов снимаются выборочно")
+def test_step_screenshots_are_sampled():
+    logger = AllureMemoryLogger()
+    pipeline = ArtifactPipeline(step_sample_rate=0.5, seed=1)
+    pipeline.reporter = reporter = start_test()
+    pipeline.watch(Driver())
+
+    def steps():
+        allure_commons.plugin_manager.register(pipeline)
+        try:
+            for i in range(20):
+                with allure.step(f"Шаг {i}"):
+                    pass
+            try:
+                with allure.step("Падающий шаг"):
+                    raise ValueError
+            except ValueError:
+                pass
+        finally:
+            allure_commons.plugin_manager.unregister(pipeline)
+
+    run_pipeline(logger, pipeline, steps)
+    names = [a.name for a in reporter.get_test(None).attachments]
+    assert 0 < len(names) < 20
+    assert all(name.startswith("Шаг: Шаг ") for name in names)
+    assert len(logger.attachments) == len(names)
+
+
+class BrokenDriver(Driver):
+    page_source = None  # неожиданный ответ драйвера
+
+
+@allure.title("Ошибка записи вложения не останавливает воркер")
+def test_worker_survives_bad_payload():
+    logger = AllureMemoryLogger()
+    pipeline = ArtifactPipeline()
+    pipeline.reporter = start_test()
+
+    def capture():
+        pipeline.capture_failure(BrokenDriver())
+        pipeline.capture_failure(Driver())
+
+    run_pipeline(logger, pipeline, capture)
+    assert pipeline.stats()["failed"] == 1
+    assert pipeline.written == 5 == len(logger.attachments)
+
+
+@allure.title("close() не зависает, если воркер умер при полной очереди")
+def test_close_with_dead_worker():
+    pipeline = ArtifactPipeline(max_queue=1)
+    pipeline._worker = threading.Thread(target=lambda: None)
+    pipeline._worker.start()
+    pipeline._queue.put_nowait(object())
+    pipeline.close()
+    assert pipeline._worker is None
@@ -0,0 +1,115 @@
+import pytest
+import allure
+from concurrent.futures import ThreadPoolExecutor
+from project.pages.api_page import AviasalesApi
+from project.utils.fare_store import FareStore
+from project.utils.http_cache import ResponseCache
+from project.utils.stub_server import StubServer
+
+DAY = 86400
+NOW = 1_750_000_000.0
+
+
+def ticket(departure_at, price, origin="MOW", destination="LED"):
+    return {"origin": origin, "destination": destination, "price": price,
+            "departure_at": departure_at, "airline": "SU", "transfers": 0}
+
+
+@allure.title("Хранилище цен: минимум на день вылета за последние сутки")
+def test_cheapest_per_day(tmp_path):
+    with FareStore(str(tmp_path / "fares.sqlite")) as store:
+        store.add([ticket("2025-07-01T10:00:00+03:00", 5000),
+                   ticket("2025-07-01T18:00:00+03:00", 4200),
+                   ticket("2025-07-02T08:00:00+03:00", 3900)],
+                  "rub", NOW - 40 * DAY)
+        store.add([ticket("2025-07-01T10:00:00+03:00", 4800),
+                   ticket("2025-07-02T08:00:00+03:00", 4100),
+                   ticket("2025-07-03T08:00:00+03:00", 3000,
+                          destination="KZN"),
+                   {"origin": "MOW", "destination": "LED", "price": None,
+                    "departure_at": "2025-07-03T08:00:00+03:00"}],
+                  "rub", NOW - 2 * DAY)
+        store.add([ticket("2025-07-02T08:00:00+03:00", 4000)],
+                  "rub", NOW - DAY)
+        # цены в долларах не смешиваются с рублёвыми
+        store.add([ticket("2025-07-01T10:00:00+03:00", 45)],
+                  "USD", NOW - DAY)
+        store.flush()
+
+        assert store.count() == 8
+        fares = store.cheapest_per_day("MOW", "LED", days=30, now=NOW)
+        assert [(fare.departure_date, fare.price) for fare in fares] == \
+            [("2025-07-01", 4800), ("2025-07-02", 4000)]
+        assert fares[1].fetched_at == NOW - DAY
+        assert [fare.price for fare in store.cheapest_per_day(
+            "MOW", "LED", days=60, now=NOW)] == [4200, 3900]
+        assert store.cheapest_per_day(
+            "MOW", "LED", now=NOW, departure_from="2025-07-02",
+            departure_to="2025-07-02")[0].price == 4000
+        assert store.price_history("MOW", "LED", "2025-07-02") == \
+            [(NOW - 40 * DAY, 3900), (NOW - 2 * DAY, 4100),
+             (NOW - DAY, 4000)]
+        assert [(fare.price, fare.currency) for fare in
+                store.cheapest_per_day("MOW", "LED", "usd", now=NOW)] == \
+            [(45, "usd")]
+
+
+@allure.title("Запрос цен по маршруту и дате использует индекс")
+def test_query_uses_route_index(tmp_path):
+    with FareStore(str(tmp_path / "fares.sqlite")) as store:
+        plan = store._query(
+            "EXPLAIN QUERY PLAN SELECT departure_date, MIN(price)"
+            " FROM fares WHERE origin = ? AND destination = ?"
+            " AND departure_date BETWEEN ? AND ? AND fetched_at >= ?"
+            " AND currency = ? GROUP BY departure_date",
+            ("MOW", "LED", "", "9", 0, "rub"))
+    assert any("fares_route_date" in row[-1] for row in plan), plan
+
+
+@pytest.mark.api
+@allure.title("Ответы API сохраняются пачками при параллельном обходе")
+def test_api_sweep_is_ingested_in_batches(tmp_path):
+    routes = [(origin, destination)
+              for origin in ("MOW", "LED", "KZN", "AER")
+              for destination in ("PEE", "OVB", "SVX", "KGD")]
+    with StubServer(tickets=30) as server, \
+            FareStore(str(tmp_path / "fares.sqlite")) as store, \
+            AviasalesApi(server.url, token="test",
+                         fare_store=store) as api:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(
+                lambda route: api.prices_for_dates(*route, "2025-07"),
+                routes))
+        api.get_latest_prices("MOW", "PEE", token="")  # 401 не сохраняется
+        store.flush()
+
+        assert store.count() == 30 * len(routes)
+        # записи копятся в очереди и уходят в одной транзакции
+        assert store.batches < len(routes)
+        tickets = responses[0].json()["data"]
+        fares = store.cheapest_per_day("MOW", "PEE", "usd")
+        expected = {}
+        for raw in tickets:
+            day = raw["departure_at"][:10]
+            expected[day] = min(expected.get(day, raw["price"]),
+                                raw["price"])
+        assert {fare.departure_date: fare.price for fare in fares} == \
+            expected
+        assert {fare.currency for fare in fares} == {"usd"}
+
+
+@pytest.mark.api
+@allure.title("Ответы из кэша не сохраняются в хранилище повторно")
+def test_cached_responses_are_not_stored_again(tmp_path):
+    with StubServer(tickets=10) as server, \
+            FareStore(str(tmp_path / "fares.sqlite")) as store, \
+            AviasalesApi(server.url, token="test", cache=ResponseCache(),
+                         fare_store=store) as api:
+        for _ in range(3):
+            assert api.search_by_price_range("MOW", "LED").status_code \
+                == 200
+        store.flush()
+        assert server.requests == 1
+        assert store.count() == 10
+        assert {fare.currency for fare in
+                store.cheapest_per_day("MOW", "LED")} == {"rub"}
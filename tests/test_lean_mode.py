@@ -0,0 +1,99 @@
+import allure
+import json
+from types import SimpleNamespace
+from project.utils.lean_mode import (LeanMode, PageLoad, PageLoadStats,
+                                     collect_page_loads, record_page_loads)
+
+
+@allure.title("Allowlist снимает блокировку типа ресурса и шаблона")
+def test_blocked_urls_allowlist():
+    lean = LeanMode()
+    blocked = lean.blocked_urls()
+    assert "*.png*" in blocked and "*mc.yandex.ru*" in blocked
+    allowed = lean.blocked_urls(allow=("image", "*mc.yandex.ru*"))
+    assert "*.png*" not in allowed and "*mc.yandex.ru*" not in allowed
+    assert "*.woff2*" in allowed
+
+
+@allure.title("Allowlist снимает только совпавшие шаблоны")
+def test_allowlist_matches_blocked_patterns():
+    lean = LeanMode()
+    blocked = lean.blocked_urls()
+    # URL снимает ровно тот шаблон, под который попадает
+    allowed = lean.blocked_urls(allow=("https://mc.yandex.ru/watch/1",))
+    assert set(blocked) - set(allowed) == {"*mc.yandex.ru*"}
+    # шаблон, не совпадающий ни с одной блокировкой, ничего не снимает
+    for rule in ("*", "*.yandex.*", "font*"):
+        assert lean.blocked_urls(allow=(rule,)) == blocked
+    assert "*.woff*" not in lean.blocked_urls(allow=("font",))
+
+
+@allure.title("Экономия считается относительно обычного режима")
+def test_page_load_savings(tmp_path):
+    path = str(tmp_path / "loads.json")
+    stats = PageLoadStats(path)
+    stats.add("full", [PageLoad("https://x.test/search/MOW1806PEE1",
+                                120, 3_000_000, 4000.0)])
+    stats.save()
+    lean_load = PageLoad("https://x.test/search/MOW1906PEE1?t=1",
+                         40, 1_000_000, 1500.0)
+    assert PageLoadStats(path).saved(lean_load) == (80, 2_000_000)
+    assert "сэкономлено запросов 80" in stats.report([lean_load], lean=True)
+
+
+class CdpDriver:
+    """Запоминает скрипты страницы и аргументы execute_script"""
+
+    def __init__(self):
+        self.scripts = {}
+        self.collected_with = None
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Page.addScriptToEvaluateOnNewDocument":
+            script_id = str(len(self.scripts) + 1)
+            self.scripts[script_id] = params["source"]
+            return {"identifier": script_id}
+        del self.scripts[params["identifier"]]
+        return {}
+
+    def execute_script(self, script, *args):
+        self.collected_with = args
+        return [{"url": "https://x.test/search/MOW1806PEE1", "requests": 3,
+                 "bytes": 2048, "load_ms": 10.5}]
+
+
+@allure.title("Загрузки собираются только своего теста")
+def test_page_loads_are_tagged_per_test():
+    driver = CdpDriver()
+    first, second = record_page_loads(driver), record_page_loads(driver)
+    assert first.run != second.run
+    assert f"const run = {json.dumps(first.run)};" in \
+        driver.scripts[first.script_id]
+
+    loads = collect_page_loads(driver, first)
+    assert driver.collected_with == (first.run,)
+    assert loads == [PageLoad("https://x.test/search/MOW1806PEE1", 3, 2048,
+                              10.5)]
+    assert list(driver.scripts) == [second.script_id]
+
+
+@allure.title("Статистику загрузок пишет только контроллер xdist")
+def test_page_load_stats_merged_on_controller(tmp_path):
+    path = str(tmp_path / "loads.json")
+    with open(path, "w") as file:
+        file.write('{"full": {"search": [1, ')  # файл оборван
+    load = PageLoad("https://x.test/search/MOW1806PEE1", 40, 1000, 1.0)
+    worker = SimpleNamespace(workerinput={}, workeroutput={})
+    stats = PageLoadStats(path)
+    assert stats.totals == {}
+    stats.add("lean", [load, load])
+    stats.pytest_sessionfinish(SimpleNamespace(config=worker))
+    with open(path) as file:
+        assert file.read().endswith("[1, ")  # воркер файл не трогает
+
+    controller = PageLoadStats(path)
+    controller.pytest_testnodedown(worker, None)
+    controller.pytest_testnodedown(worker, None)
+    controller.pytest_sessionfinish(
+        SimpleNamespace(config=SimpleNamespace()))
+    assert PageLoadStats(path).totals == {"lean": {"search": [4, 160, 4000]}}
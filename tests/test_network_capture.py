@@ -0,0 +1,101 @@
+import base64
+import json
+import allure
+from project.utils.network_capture import NetworkCapture, parse_results
+
+CHUNK = {
+    "tickets": [
+        {"proposals": [{"price": {"value": 5432}}],
+         "segments": [{"flights": [0, 1]}]},
+        {"proposals": [{"price": {"value": 7100.0}}],
+         "segments": [{"flights": [2]}]},
+    ],
+    "flight_legs": [
+        {"origin": "SVO", "destination": "KZN",
+         "local_departure_date_time": "2025-06-01T23:40:00",
+         "local_arrival_date_time": "2025-06-02T01:10:00",
+         "operating_carrier_designator": {"carrier": "SU"}},
+        {"origin": "KZN", "destination": "PEE",
+         "local_departure_date_time": "2025-06-02T02:30:00",
+         "local_arrival_date_time": "2025-06-02T04:05:00",
+         "operating_carrier_designator": {"carrier": "SU"}},
+        {"origin": "VKO", "destination": "PEE",
+         "local_departure_date_time": "2025-06-01T06:55:00",
+         "local_arrival_date_time": "2025-06-01T10:50:00",
+         "operating_carrier_designator": {"carrier": "UT"}},
+    ],
+    "airlines": {"SU": {"name": {"ru": {"default": "Аэрофлот"}}}},
+    "places": {
+        "airports": {"SVO": {"city_code": "MOW"},
+                     "VKO": {"city_code": "MOW"},
+                     "PEE": {"city_code": "PEE"}},
+        "cities": {"MOW": {"name": {"ru": "Москва"}},
+                   "PEE": {"name": {"ru": "Пермь"}}},
+    },
+}
+
+
+class RecordedDriver:
+    """Отдаёт заранее записанные события performance-лога"""
+
+    def __init__(self, events, bodies):
+        self.events = events
+        self.bodies = bodies
+
+    def get_log(self, log_type):
+        events, self.events = self.events, []
+        return [{"message": json.dumps({"message": event})}
+                for event in events]
+
+    def execute_cdp_cmd(self, command, params):
+        assert command == "Network.getResponseBody"
+        return self.bodies[params["requestId"]]
+
+
+@allure.title("Ответ с результатами поиска разбирается в карточки")
+def test_parse_results():
+    first, second = parse_results([CHUNK])
+    assert first == {"price": 5432, "departure_time": "23:40",
+                     "arrival_time": "04:05", "origin": "Москва",
+                     "destination": "Пермь", "airline": "Аэрофлот"}
+    assert second["price"] == 7100 and second["airline"] == "UT"
+
+
+@allure.title("Перехват берёт только ответы с результатами поиска")
+def test_capture_matches_results_only():
+    body = base64.b64encode(json.dumps(CHUNK).encode()).decode()
+
+    def response(request_id, url):
+        return {"method": "Network.responseReceived",
+                "params": {"requestId": request_id,
+                           "response": {"url": url}}}
+
+    def finished(request_id):
+        return {"method": "Network.loadingFinished",
+                "params": {"requestId": request_id}}
+
+    driver = RecordedDriver(
+        [response("1", "https://example.test/static/app.js"),
+         response("2", "https://example.test/search/v3.2/results"),
+         finished("1"), finished("2")],
+        {"2": {"body": body, "base64Encoded": True}})
+    capture = NetworkCapture(driver)
+    assert capture.poll() == 1
+    assert capture.settled(quiet=0)
+    assert [card["price"] for card in capture.cards()] == [5432, 7100]
+
+
+@allure.title("reset() пропускает ответы, пойманные до него")
+def test_reset_drains_log():
+    body = base64.b64encode(json.dumps(CHUNK).encode()).decode()
+    driver = RecordedDriver(
+        [{"method": "Network.responseReceived",
+          "params": {"requestId": "1", "response": {
+              "url": "https://example.test/search/v3.2/results"}}},
+         {"method": "Network.loadingFinished",
+          "params": {"requestId": "1"}}],
+        {"1": {"body": body, "base64Encoded": True}})
+    capture = NetworkCapture(driver)
+    capture.reset()
+    assert capture.poll() == 0
+    assert capture.cards() == []
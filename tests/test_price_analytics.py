@@ -0,0 +1,44 @@
+import numpy as np
+import allure
+from project.utils.price_analytics import TicketBatch
+from project.utils.tickets import Ticket
+
+
+@allure.title("Проверка диапазона цен по пачке билетов API")
+def test_range_check():
+    batch = TicketBatch.from_tickets(
+        [{"price": price, "transfers": 0} for price in (900, 1000, 1500,
+                                                        2000, 2100)])
+    summary = batch.range_check(1000, 2000)
+    assert (summary.in_range, summary.below, summary.above) == (3, 1, 1)
+    assert not summary.compliant
+
+
+@allure.title("Цены для нескольких пассажиров масштабируются")
+def test_passenger_scaling():
+    single = TicketBatch.from_prices([1000, 2000, 3000])
+    group = TicketBatch.from_prices([3000, 6000, 9000, 9000])
+    summary = group.scaled_against(single, passengers=3)
+    assert summary.scales
+    assert summary.median_ratio == 3.75
+
+
+@allure.title("Выбросы и перцентили на сотнях тысяч цен")
+def test_outliers_and_percentiles():
+    prices = np.full(200_000, 5000.0)
+    prices[::1000] = 4000.0
+    prices[7] = 250_000.0
+    batch = TicketBatch(prices)
+    outliers = batch.outliers()
+    assert 7 in outliers.indices
+    summary = batch.percentiles()
+    assert summary.count == 200_000
+    assert summary.p50 == 5000.0 and summary.maximum == 250_000.0
+
+
+@allure.title("Пачка собирается из записей Ticket")
+def test_batch_from_ticket_records():
+    tickets = [Ticket(1200, "2025-07-01", "MOW", "LED", "SU", None)]
+    batch = TicketBatch.from_tickets(tickets)
+    assert batch.prices.tolist() == [1200.0]
+    assert batch.transfers.tolist() == [-1]
@@ -0,0 +1,148 @@
+import asyncio
+import numpy as np
+import pytest
+import allure
+from datetime import date
+from project.pages.api_page import AviasalesApi
+from project.pages.async_api_page import AsyncAviasalesApi
+from project.utils.price_calendar import CalendarQuery, PriceCalendar
+from project.utils.stub_server import StubServer
+
+ORIGINS = ["MOW", "LED", "MOW"]
+DESTINATIONS = ["PEE", "LED", "KZN"]
+START, END = date(2025, 6, 20), date(2025, 8, 5)
+
+
+@pytest.fixture
+def stub_server():
+    with StubServer(tickets=200) as server:
+        yield server
+
+
+def make_calendar(max_age=3600) -> PriceCalendar:
+    return PriceCalendar(ORIGINS, DESTINATIONS, START, END, max_age=max_age)
+
+
+@allure.title("План календаря: маршруты и месяцы без повторов")
+def test_plan_dedupes_routes_and_months():
+    calendar = make_calendar()
+    assert calendar.routes == [("MOW", "PEE"), ("MOW", "LED"),
+                               ("MOW", "KZN"), ("LED", "PEE"),
+                               ("LED", "KZN")]
+    assert calendar.prices.shape == (5, 47)
+    queries = calendar.plan(now=0)
+    assert len(queries) == len(set(queries)) == 5 * 3
+    assert queries[:3] == [CalendarQuery("MOW", "PEE", month)
+                           for month in ("2025-06", "2025-07", "2025-08")]
+
+
+@pytest.mark.api
+@allure.title("Календарь собирается из месячных запросов к API")
+def test_refresh_builds_dense_grid(stub_server):
+    calendar = make_calendar()
+    with AviasalesApi(stub_server.url, token="test") as api:
+        assert calendar.refresh(api, now=1000) == 15
+        assert stub_server.requests == 15
+        # свежие ячейки повторно не запрашиваются
+        assert calendar.refresh(api, now=2000) == 0
+        assert stub_server.requests == 15
+
+    filled = ~np.isnan(calendar.prices)
+    # заглушка отдаёт вылеты в первые 28 дней месяца
+    assert filled.sum(axis=1).min() > 20
+    assert np.nanmin(calendar.prices) >= 50
+    assert np.nanmax(calendar.prices) <= 900
+    day, price = calendar.cheapest("MOW", "PEE")
+    assert START <= day <= END
+    assert price == np.nanmin(calendar.route_prices("MOW", "PEE"))
+
+
+@pytest.mark.api
+@allure.title("Устаревшие и неудачные месяцы перезапрашиваются")
+def test_refresh_only_stale_cells(stub_server, tmp_path):
+    calendar = make_calendar(max_age=3600)
+    asyncio.run(_refresh_async(stub_server.url, calendar, now=1000))
+    path = str(tmp_path / "calendar.npz")
+    calendar.save(path)
+
+    # новый календарь на пересекающееся окно: июнь и июль уже загружены
+    restored = PriceCalendar(["MOW"], ["PEE"], date(2025, 7, 1),
+                             date(2025, 9, 30), max_age=3600)
+    restored.merge(path)
+    assert [query.month for query in restored.plan(now=2000)] == \
+        ["2025-08", "2025-09"]
+    np.testing.assert_array_equal(
+        restored.route_prices("MOW", "PEE")[:31],
+        calendar.route_prices("MOW", "PEE")[11:42])
+    assert len(restored.plan(now=1000 + 3600)) == 3
+
+    stub_server.configure(error_rate=1.0)
+    with AviasalesApi(stub_server.url, token="test") as api:
+        assert restored.refresh(api, now=2000) == 2
+    assert len(restored.failed) == 2
+    assert len(restored.plan(now=2000)) == 2
+
+
+async def _refresh_async(base_url, calendar, now):
+    async with AsyncAviasalesApi(base_url, token="test",
+                                 concurrency=4) as api:
+        return await calendar.refresh_async(api, now=now)
+
+
+class FlakyApi:
+    """Клиент, у которого запросы по одному маршруту падают"""
+
+    def __init__(self, api, broken):
+        self.api = api
+        self.broken = broken
+
+    def prices_for_dates(self, origin, destination, *args, **kwargs):
+        if (origin, destination) == self.broken:
+            raise ConnectionError("сброс соединения")
+        return self.api.prices_for_dates(origin, destination,
+                                         *args, **kwargs)
+
+
+@pytest.mark.api
+@allure.title("Месяц догружается по страницам, падение маршрута не мешает")
+def test_refresh_pages_and_keeps_other_routes(stub_server):
+    calendar = PriceCalendar(["MOW"], ["PEE", "KZN"], date(2025, 6, 1),
+                             date(2025, 6, 30), page_limit=64)
+    with AviasalesApi(stub_server.url, token="test") as api:
+        assert calendar.refresh(FlakyApi(api, ("MOW", "KZN")),
+                                now=1000) == 2
+        # 200 билетов: три полные страницы и одна неполная
+        assert stub_server.requests == 4
+        single = api.prices_for_dates("MOW", "PEE", "2025-06",
+                                      limit=200).json()["data"]
+
+    assert calendar.failed == [CalendarQuery("MOW", "KZN", "2025-06")]
+    assert "сброс соединения" in calendar.errors[calendar.failed[0]]
+    assert np.isnan(calendar.route_prices("MOW", "KZN")).all()
+    assert calendar.cheapest("MOW", "PEE")[1] == \
+        min(ticket["price"] for ticket in single)
+    assert calendar.plan(now=1000) == calendar.failed
+
+
+class CancelledApi:
+    """Асинхронный клиент, запросы которого отменяются"""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def prices_for_dates(self, *args, **kwargs):
+        self.requests += 1
+        raise asyncio.CancelledError()
+
+
+@allure.title("Отмена запроса месяца не принимается за данные")
+def test_refresh_async_propagates_cancellation():
+    calendar = PriceCalendar(["MOW"], ["PEE"], date(2025, 6, 1),
+                             date(2025, 7, 31))
+    api = CancelledApi()
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(calendar.refresh_async(api, now=1000))
+    assert api.requests == 2
+    assert calendar.failed == []
+    assert np.isnan(calendar.prices).all()
+    assert len(calendar.plan(now=1000)) == 2
@@ -0,0 +1,85 @@
+import allure
+import pytest
+from datetime import date, datetime, timedelta
+from project.pages.search_page import SearchPage
+
+BASE_URL = "https://www.aviasales.ru/"
+
+
+def page() -> SearchPage:
+    # для построения URL браузер не нужен
+    return SearchPage(driver=None, base_url=BASE_URL)
+
+
+@allure.title("URL результатов: коды, день и месяц вылета, пассажиры")
+def test_build_search_url():
+    departure = date.today() + timedelta(days=30)
+    assert page().build_search_url("MOW", "PEE", departure, 3) == \
+        f"https://www.aviasales.ru/search/MOW{departure:%d%m}PEE3"
+    assert page().build_search_url("MOW", "PEE").endswith(
+        f"/search/MOW{date.today():%d%m}PEE1")
+    moment = datetime.combine(departure, datetime.min.time())
+    assert page().build_search_url("LED", "KZN", moment, 9) == \
+        f"https://www.aviasales.ru/search/LED{departure:%d%m}KZN9"
+
+
+@pytest.mark.parametrize("origin, destination, departure, adults", [
+    ("mow", "PEE", None, 1),
+    ("MOW", "PEEE", None, 1),
+    ("MOW", None, None, 1),
+    ("MOW", "PEE", None, 0),
+    ("MOW", "PEE", None, 10),
+    ("MOW", "PEE", None, "2"),
+    ("MOW", "PEE", None, True),
+    ("MOW", "PEE", "2025-06-18", 1),
+    ("MOW", "PEE", date.today() - timedelta(days=1), 1),
+])
+@allure.title("Некорректные параметры поиска отклоняются до браузера")
+def test_build_search_url_rejects_invalid(origin, destination, departure,
+                                          adults):
+    with pytest.raises(ValueError):
+        page().build_search_url(origin, destination, departure, adults)
+
+
+class CardsDriver:
+    """Браузер, на странице которого есть карточки, а execute_script
+    возвращает заранее заданный ответ _EXTRACT_CARDS_JS"""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+
+    def find_element(self, by, value):
+        return object()
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.payload
+
+
+@allure.title("Ответ скрипта разбора превращается в карточки рейсов")
+def test_extract_cards_maps_script_payload():
+    driver = CardsDriver([
+        {"price": 5432, "departure_time": "06:55", "arrival_time": "10:50",
+         "origin": "Москва", "destination": "Пермь", "airline": "Аэрофлот"},
+        # драйвер может опустить пустые поля
+        {"price": None, "departure_time": "23:40", "origin": "Москва"},
+    ])
+    cards = SearchPage(driver, BASE_URL).extract_cards()
+    assert cards == [
+        {"price": 5432, "departure_time": "06:55", "arrival_time": "10:50",
+         "origin": "Москва", "destination": "Пермь", "airline": "Аэрофлот"},
+        {"price": None, "departure_time": "23:40", "arrival_time": None,
+         "origin": "Москва", "destination": None, "airline": None}]
+    departure_segment, arrival_segment, offset, limit = driver.calls[0]
+    assert "ArEb299EZ30wXeEL" in departure_segment
+    assert "Vz8S7bOiF1EDe0z9" in arrival_segment
+    assert (offset, limit) == (0, None)
+
+
+@pytest.mark.parametrize("payload", [[], None])
+@allure.title("Пустой ответ скрипта разбора — пустой список карточек")
+def test_extract_cards_empty(payload):
+    page = SearchPage(CardsDriver(payload), BASE_URL)
+    assert page.extract_cards() == []
+    assert page.get_ticket_prices() == []
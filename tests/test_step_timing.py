@@ -0,0 +1,56 @@
+import time
+from types import SimpleNamespace
+import allure
+import allure_commons
+from project.utils.step_timing import (StepTimer, StepTimingHistory,
+                                       parse_budgets)
+
+
+class Page:
+    @allure.step("Медленное действие: {delay}")
+    def slow_action(self, delay):
+        time.sleep(delay)
+
+
+@allure.title("Шаги сверяются с бюджетом и медианой прошлых запусков")
+def test_budget_and_regression(tmp_path):
+    history = StepTimingHistory(str(tmp_path / "steps.json"))
+    history.samples["Быстрый шаг"] = [0.01] * 5
+    timer = StepTimer(history, parse_budgets(["Page.slow_* = 0.01"]))
+    allure_commons.plugin_manager.register(timer)
+    try:
+        Page().slow_action(0.05)
+        with allure.step("Быстрый шаг"):
+            time.sleep(0.6)
+        with allure.step("Новый шаг"):
+            pass
+    finally:
+        allure_commons.plugin_manager.unregister(timer)
+
+    budget, slowdown = timer.violations
+    assert budget.step == "Page.slow_action" and budget.reason == "бюджет"
+    assert slowdown.step == "Быстрый шаг" and "медиана" in slowdown.reason
+    assert [step for step, _ in timer._session] == [
+        "Page.slow_action", "Быстрый шаг", "Новый шаг"]
+
+
+@allure.title("Историю шагов пишет только контроллер xdist")
+def test_history_written_by_controller(tmp_path):
+    path = str(tmp_path / "steps.json")
+    with open(path, "w") as file:
+        file.write('{"Шаг": [1.0, ')  # файл оборван прошлым запуском
+    worker = SimpleNamespace(workerinput={}, workeroutput={})
+    timer = StepTimer(StepTimingHistory(path))
+    assert timer.history.samples == {}
+    timer.check("Ожидание «результаты»", 0.5)
+    timer.pytest_sessionfinish(SimpleNamespace(config=worker))
+    assert worker.workeroutput["step_timings"] == [
+        ("Ожидание «результаты»", 0.5)]
+
+    controller = StepTimer(StepTimingHistory(path))
+    controller.pytest_testnodedown(worker, None)
+    controller.pytest_testnodedown(worker, None)
+    controller.pytest_sessionfinish(
+        SimpleNamespace(config=SimpleNamespace()))
+    assert StepTimingHistory(path).samples == {
+        "Ожидание «результаты»": [0.5, 0.5]}
@@ -0,0 +1,42 @@
+import allure
+from project.utils.stream_verify import DepartureOrderVerifier
+
+
+def cards(*times, price=5000):
+    for departure in times:
+        yield {"price": price, "departure_time": departure}
+
+
+@allure.title("Один переход через полночь допустим")
+def test_single_midnight_rollover():
+    verdict = DepartureOrderVerifier().verify(
+        cards("18:05", "21:30", "23:55", "00:40", "05:10"))
+    assert verdict.ok and verdict.checked == 5
+
+
+@allure.title("Проверка останавливается на первом нарушении")
+def test_stops_at_first_violation():
+    consumed = []
+
+    def tracked():
+        for card in cards("23:10", "01:00", "00:30", "02:00", "03:00"):
+            consumed.append(card)
+            yield card
+
+    verdict = DepartureOrderVerifier().verify(tracked())
+    assert verdict.violation.index == 2
+    assert "после перехода через полночь" in verdict.violation.reason
+    assert len(consumed) == 3
+
+
+@allure.title("Цены проверяются вместе с порядком")
+def test_price_invariants():
+    stream = [{"price": 4000, "departure_time": "06:00"},
+              {"price": None, "departure_time": "07:00"}]
+    verdict = DepartureOrderVerifier().verify(stream)
+    assert verdict.violation.reason == "нет цены"
+    verdict = DepartureOrderVerifier(price_max=3000).verify(stream)
+    assert verdict.violation.index == 0
+    verdict = DepartureOrderVerifier().verify(cards("10:00", "23:00",
+                                                    "01:00", "11:00"))
+    assert "больше суток" in verdict.violation.reason
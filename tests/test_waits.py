@@ -0,0 +1,85 @@
+import allure
+import allure_commons
+import pytest
+from selenium.common.exceptions import (NoSuchElementException,
+                                        TimeoutException)
+from project.utils.waits import WAIT_STEP, WaitEngine
+
+
+class ScriptedDriver:
+    """Отдаёт на каждый execute_script следующее состояние страницы"""
+
+    def __init__(self, states):
+        self.states = iter(states)
+        self.probes = 0
+
+    def execute_script(self, script, *args):
+        self.probes += 1
+        return next(self.states)
+
+
+class StepTitles:
+    """Собирает заголовки шагов Allure"""
+
+    def __init__(self):
+        self.titles = []
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self.titles.append(title)
+
+
+@pytest.fixture
+def steps():
+    listener = StepTitles()
+    allure_commons.plugin_manager.register(listener)
+    yield listener.titles
+    allure_commons.plugin_manager.unregister(listener)
+
+
+def engine(driver, timeout=1.0) -> WaitEngine:
+    return WaitEngine(driver, timeout=timeout, quiet=0.3, min_poll=0.001,
+                      max_poll=0.01)
+
+
+@allure.title("dom_stable ждёт тишины DOM, сети и загрузки документа")
+def test_dom_stable_waits_for_quiet_page(steps):
+    driver = ScriptedDriver([(0, 1, "loading"), (500, 1, "complete"),
+                             (100, 0, "complete"), (300, 0, "complete")])
+    waited = engine(driver).dom_stable("результаты")
+    assert driver.probes == 4
+    assert 0 <= waited < 1
+    assert steps == [WAIT_STEP.format("результаты")]
+
+
+@allure.title("dom_stable сообщает о зависших запросах по таймауту")
+def test_dom_stable_timeout_reports_pending():
+    driver = ScriptedDriver([(1000, 2, "complete")] * 1000)
+    with pytest.raises(TimeoutException,
+                       match="результаты.*запросов в полёте: 2"):
+        engine(driver, timeout=0.05).dom_stable("результаты")
+
+
+@allure.title("until возвращает значение условия и пропускает NoSuchElement")
+def test_until_returns_condition_value(steps):
+    answers = iter([NoSuchElementException(), None, "карточка"])
+
+    def condition(driver):
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    assert engine(ScriptedDriver([])).until(condition, "карточка") == \
+        "карточка"
+    assert steps == [WAIT_STEP.format("карточка")]
+
+
+@allure.title("until падает по таймауту с меткой ожидания")
+def test_until_timeout_and_unexpected_errors():
+    waits = engine(ScriptedDriver([]), timeout=0.05)
+    with pytest.raises(TimeoutException, match="Не дождались: фильтр"):
+        waits.until(lambda driver: False, "фильтр")
+    # прочие ошибки условия не глотаются
+    with pytest.raises(ZeroDivisionError):
+        waits.until(lambda driver: 1 / 0, "деление")
@@ -0,0 +1,61 @@
+import threading
+import time
+import allure
+from project.utils.waits import WaitEngine
+from project.utils.wd_profiler import OUTSIDE_STEPS, CommandProfiler
+
+
+class Executor:
+    def execute(self, command, params):
+        return {"value": command}
+
+
+class Driver:
+    def __init__(self):
+        self.command_executor = Executor()
+
+    def execute_script(self, script, *args):
+        return self.command_executor.execute("executeScript", {})
+
+
+@allure.title("Команды относятся к шагу и делятся на ожидания и действия")
+def test_commands_attributed_to_steps():
+    driver = Driver()
+    profiler = CommandProfiler().start()
+    try:
+        profiler.wrap(driver)
+        profiler.wrap(driver)  # повторная обёртка не удваивает замеры
+        with allure.step("Открыть страницу"):
+            driver.execute_script("return 1")
+            polls = iter([False, True])
+            WaitEngine(driver, min_poll=0.01).until(
+                lambda d: d.execute_script("return 1") and next(polls),
+                "условие")
+        driver.execute_script("return 1")
+    finally:
+        profiler.stop()
+
+    step = profiler.profiles["Открыть страницу"]
+    assert step.commands == 3 and step.names["executeScript"] == 3
+    # паузы опроса WaitEngine считаются ожиданием, а не sleep
+    assert step.wait >= 0.01 and step.sleep == 0 and step.action > 0
+    assert profiler.profiles[OUTSIDE_STEPS].commands == 1
+    assert "Открыть страницу" in profiler.report()
+
+
+@allure.title("Sleep других потоков не засекается, time.sleep возвращается")
+def test_sleep_of_other_threads_not_profiled():
+    original = time.sleep
+    profiler = CommandProfiler().start()
+    try:
+        worker = threading.Thread(target=time.sleep, args=(0.05,))
+        worker.start()
+        worker.join()
+        with allure.step("Пауза"):
+            time.sleep(0.01)
+    finally:
+        profiler.stop()
+
+    assert time.sleep is original
+    assert list(profiler.profiles) == ["Пауза"]
+    assert 0.01 <= profiler.profiles["Пауза"].sleep < 0.05
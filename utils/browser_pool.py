@@ -0,0 +1,161 @@
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service as ChromeService
+from typing import Callable, List, Optional
+from webdriver_manager.chrome import ChromeDriverManager
+
+DRIVER_CACHE_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "aviasales-tests", "chromedriver.json")
+DRIVER_CACHE_TTL = 24 * 3600
+
+
+def resolve_driver_path(cache_file: str = DRIVER_CACHE_FILE,
+                        ttl: float = DRIVER_CACHE_TTL) -> str:
+    """
+    Путь к chromedriver. ChromeDriverManager().install() ходит в сеть
+    за номером версии, поэтому результат кэшируется на диске на ttl секунд.
+    """
+    try:
+        with open(cache_file) as file:
+            cached = json.load(file)
+        if (time.time() - cached["resolved_at"] < ttl
+                and os.path.exists(cached["path"])):
+            return cached["path"]
+    except (OSError, ValueError, KeyError):
+        pass
+    path = ChromeDriverManager().install()
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    with open(cache_file, "w") as file:
+        json.dump({"path": path, "resolved_at": time.time()}, file)
+    return path
+
+
+def chrome_options(headless: bool = True, network_log: bool = False,
+                   console_log: bool = False) -> Options:
+    """
+    :param network_log: писать события сети в performance-лог
+        (нужно для NetworkCapture)
+    :param console_log: собирать все сообщения консоли, а не только
+        ошибки (для артефактов падений)
+    """
+    options = Options()
+    options.add_argument("--log-level=3")  # подавляем лишние логи
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    logging_prefs = {}
+    if network_log:
+        logging_prefs["performance"] = "ALL"
+    if console_log:
+        logging_prefs["browser"] = "ALL"
+    if logging_prefs:
+        options.set_capability("goog:loggingPrefs", logging_prefs)
+    return options
+
+
+class BrowserPool:
+    """
+    Пул заранее запущенных браузеров на всю сессию.
+
+    Тест берёт браузер через acquire() и возвращает через release();
+    при возврате браузер не перезапускается, а быстро сбрасывается:
+    cookies и storage очищаются, лишние вкладки закрываются,
+    открывается about:blank, консольный лог вычитывается.
+    """
+
+    def __init__(self, size: int = 1,
+                 options_factory: Callable[[], Options] = chrome_options,
+                 driver_path: Optional[str] = None):
+        """
+        :param size: сколько браузеров запустить заранее
+        :param options_factory: создаёт Options для нового браузера
+        :param driver_path: путь к chromedriver; по умолчанию
+            определяется через resolve_driver_path()
+        """
+        self.size = size
+        self.options_factory = options_factory
+        self.driver_path = driver_path
+        self._idle: "queue.Queue" = queue.Queue()
+        self._all: List[webdriver.Chrome] = []
+        self._lock = threading.Lock()
+
+    def _launch(self) -> webdriver.Chrome:
+        driver = webdriver.Chrome(
+            service=ChromeService(self.driver_path),
+            options=self.options_factory())
+        with self._lock:
+            self._all.append(driver)
+        return driver
+
+    def start(self) -> "BrowserPool":
+        """Запускает size браузеров параллельно"""
+        if self.driver_path is None:
+            self.driver_path = resolve_driver_path()
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            for driver in executor.map(lambda _: self._launch(),
+                                       range(self.size)):
+                self._idle.put(driver)
+        return self
+
+    def acquire(self) -> webdriver.Chrome:
+        """Выдаёт свободный браузер; если все заняты — запускает ещё один"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._launch()
+
+    def release(self, driver: webdriver.Chrome) -> None:
+        """Возвращает браузер в пул, предварительно сбросив состояние"""
+        try:
+            self.reset(driver)
+        except Exception:
+            # браузер в неисправном состоянии — заменяем свежим
+            self._discard(driver)
+            driver = self._launch()
+        self._idle.put(driver)
+
+    @staticmethod
+    def reset(driver: webdriver.Chrome) -> None:
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        # storage доступен только на странице своего origin
+        driver.execute_script(
+            "try { localStorage.clear(); sessionStorage.clear(); }"
+            " catch (e) {}")
+        # в отличие от delete_all_cookies() чистит cookies всех доменов
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.get("about:blank")
+        # консоль прошлого теста не должна попасть в артефакты следующего
+        try:
+            driver.get_log("browser")
+        except WebDriverException:
+            pass  # лог консоли не включён
+
+    def _discard(self, driver: webdriver.Chrome) -> None:
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Закрывает все браузеры пула"""
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
@@ -0,0 +1,145 @@
+import io
+import json
+import mmap
+import os
+import struct
+import requests
+from requests.structures import CaseInsensitiveDict
+from typing import Callable, Dict, List, Optional, Tuple
+from project.utils.http_cache import normalize_params
+
+RECORD = "record"
+REPLAY = "replay"
+PASSTHROUGH = "passthrough"
+MODES = (RECORD, REPLAY, PASSTHROUGH)
+
+# Формат файла: MAGIC, смещение индекса (uint64), тела ответов подряд,
+# в конце — JSON-индекс {ключ: [смещение, длина, статус, заголовки]}
+MAGIC = b"AVCS1"
+_HEADER = struct.Struct("<5sQ")
+# сохраняем только заголовки, которые читают клиент и кэш
+_KEPT_HEADERS = ("content-type", "etag", "last-modified")
+
+
+class CassetteMissError(LookupError):
+    """Запрос не найден в кассете в режиме replay"""
+
+
+def cassette_key(url: str, params: Optional[dict]) -> str:
+    """Ключ запроса; значение токена заменяется маской,
+    чтобы секреты не попадали в кассеты"""
+    params = dict(params or {})
+    if "token" in params:
+        params["token"] = "<token>" if params["token"] else ""
+    return f"{url}?{normalize_params(params)}"
+
+
+class Cassette:
+    """
+    Запись и воспроизведение пар запрос/ответ AviasalesApi.
+
+    В режиме record ответы сети сохраняются в файл при close().
+    В режиме replay файл отображается в память (mmap), индекс
+    читается один раз, и ответ собирается без обращения к сети.
+    В режиме passthrough кассета не используется.
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY):
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим кассеты: {mode}")
+        self.path = path
+        self.mode = mode
+        self._index: Dict[str, list] = {}
+        self._recorded: Dict[str, Tuple[bytes, int, Dict[str, str]]] = {}
+        self._file = None
+        self._data: Optional[mmap.mmap] = None
+        if mode == REPLAY or (mode == RECORD and os.path.exists(path)):
+            self._load()
+
+    def _load(self) -> None:
+        self._file = open(self.path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+        magic, index_offset = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} не является кассетой")
+        self._index = json.loads(self._data[index_offset:])
+
+    def __len__(self) -> int:
+        return len(self._index.keys() | self._recorded.keys())
+
+    def fetch(self, url: str, params: Optional[dict],
+              send: Callable[[], requests.Response]) -> requests.Response:
+        """Отдаёт ответ из кассеты или выполняет запрос через send"""
+        if self.mode == PASSTHROUGH:
+            return send()
+        key = cassette_key(url, params)
+        if self.mode == RECORD:
+            response = send()
+            headers = {name: value for name, value in response.headers.items()
+                       if name.lower() in _KEPT_HEADERS}
+            self._recorded[key] = (response.content, response.status_code,
+                                   headers)
+            return response
+        if key not in self._index:
+            raise CassetteMissError(
+                f"Нет записи для {key} в {self.path}; "
+                f"перезапишите кассету с --api-mode=record")
+        offset, length, status, headers = self._index[key]
+        return self._build_response(url, self._data[offset:offset + length],
+                                    status, headers)
+
+    @staticmethod
+    def _build_response(url: str, content: bytes, status: int,
+                        headers: Dict[str, str]) -> requests.Response:
+        response = requests.Response()
+        response.url = url
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        # тело уже прочитано: iter_content() отдаёт его из _content,
+        # а raw нужен тем, кто читает поток напрямую
+        response._content_consumed = True
+        response.raw = io.BytesIO(content)
+        response.encoding = "utf-8"
+        return response
+
+    def save(self) -> None:
+        """Записывает кассету: старые записи плюс записанные сейчас"""
+        bodies: List[bytes] = []
+        index = {}
+        offset = _HEADER.size
+        for key, (offset_old, length, status, headers) in self._index.items():
+            if key in self._recorded:
+                continue
+            bodies.append(self._data[offset_old:offset_old + length])
+            index[key] = [offset, length, status, headers]
+            offset += length
+        for key, (content, status, headers) in self._recorded.items():
+            bodies.append(content)
+            index[key] = [offset, len(content), status, headers]
+            offset += len(content)
+        self._close_file()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, offset))
+            for body in bodies:
+                file.write(body)
+            file.write(json.dumps(index, ensure_ascii=False,
+                                  separators=(",", ":")).encode())
+        os.replace(tmp_path, self.path)
+
+    def _close_file(self) -> None:
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        if self.mode == RECORD and self._recorded:
+            self.save()
+        self._close_file()
@@ -0,0 +1,130 @@
+import threading
+import time
+import numpy as np
+from typing import Dict, Optional, Sequence, Union
+from project.utils.price_analytics import TicketBatch
+
+BASE_CURRENCY = "rub"
+DEFAULT_TTL = 3600  # с; курсы в таблице обновляются раз в сутки
+RETRY_AFTER = 30    # с; столько старая таблица живёт после неудачи
+
+Prices = Union[np.ndarray, Sequence[float]]
+
+
+class CurrencyService:
+    """
+    Курсы валют из get_currency_rates с кэшем на ttl секунд
+    и векторный пересчёт цен.
+
+    Таблица хранит рубли за единицу валюты (rub = 1). Устаревшую
+    таблицу загружает только один поток: остальные ждут его результата
+    и не повторяют запрос. Если загрузка не удалась, продолжаем
+    работать со старой таблицей, пока она есть, и повторяем загрузку
+    не раньше чем через min(ttl, RETRY_AFTER) секунд — пока API
+    недоступен, пересчёт не ждёт таймаут на каждом вызове.
+
+    Пример:
+        currency = CurrencyService(api)
+        usd = TicketBatch.from_response(api.prices_for_dates(...))
+        rub = currency.convert(usd.prices, "usd", "rub")
+    """
+
+    def __init__(self, api, ttl: float = DEFAULT_TTL):
+        """
+        :param api: клиент с методом get_currency_rates (AviasalesApi)
+        :param ttl: через сколько секунд таблица курсов перезапрашивается
+        """
+        self.api = api
+        self.ttl = ttl
+        self.refreshes = 0
+        self.failures = 0
+        self._rates: Optional[Dict[str, float]] = None
+        self._loaded_at = 0.0
+        self._retry_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    # ================= ТАБЛИЦА КУРСОВ =================
+    def rates(self) -> Dict[str, float]:
+        """Рубли за единицу валюты по коду в нижнем регистре"""
+        if not self._is_fresh():
+            with self._refresh_lock:
+                # пока ждали блокировку, таблицу мог обновить другой поток
+                if not self._is_fresh():
+                    self._refresh()
+        return self._rates
+
+    def _is_fresh(self) -> bool:
+        now = time.monotonic()
+        return self._rates is not None and \
+            (now - self._loaded_at < self.ttl or now < self._retry_at)
+
+    def _refresh(self) -> None:
+        try:
+            response = self.api.get_currency_rates()
+            response.raise_for_status()
+            rates = {code.lower(): float(rate)
+                     for code, rate in response.json().items()}
+        except Exception:
+            self.failures += 1
+            if self._rates is None:
+                raise
+            self._retry_at = time.monotonic() + min(self.ttl, RETRY_AFTER)
+            return
+        rates[BASE_CURRENCY] = 1.0
+        self._rates = rates
+        self._loaded_at = time.monotonic()
+        self.refreshes += 1
+
+    def rate(self, currency: str) -> float:
+        """Рубли за единицу currency"""
+        rates = self.rates()
+        try:
+            return rates[currency.lower()]
+        except KeyError:
+            raise ValueError(f"Нет курса валюты {currency}") from None
+
+    def invalidate(self) -> None:
+        """Следующий запрос курса загрузит таблицу заново"""
+        self._loaded_at = self._retry_at = 0.0
+
+    # ================= ПЕРЕСЧЁТ =================
+    def convert(self, prices: Prices, from_currency: str,
+                to_currency: str = BASE_CURRENCY) -> np.ndarray:
+        """Пересчитывает массив цен одним умножением"""
+        prices = np.asarray(prices, dtype=np.float64)
+        if from_currency.lower() == to_currency.lower():
+            return prices
+        return prices * (self.rate(from_currency) / self.rate(to_currency))
+
+    def convert_mixed(self, prices: Prices, currencies: Sequence[str],
+                      to_currency: str = BASE_CURRENCY) -> np.ndarray:
+        """
+        Пересчитывает цены в разных валютах (например, строки FareStore)
+        с валютой на каждую цену
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        codes, inverse = np.unique(
+            np.char.lower(np.asarray(currencies, dtype=str)),
+            return_inverse=True)
+        target = self.rate(to_currency)
+        factors = np.array([self.rate(code) / target for code in codes])
+        return prices * factors[inverse.reshape(prices.shape)]
+
+    def normalize(self, batch: TicketBatch, from_currency: str,
+                  to_currency: str = BASE_CURRENCY) -> TicketBatch:
+        """Пачка билетов с ценами в to_currency"""
+        return TicketBatch(self.convert(batch.prices, from_currency,
+                                        to_currency), batch.transfers)
+
+    def normalize_response(self, response,
+                           to_currency: str = BASE_CURRENCY,
+                           default_currency: str = BASE_CURRENCY
+                           ) -> TicketBatch:
+        """
+        Пачка билетов из ответа API в to_currency. Валюта берётся
+        из поля currency ответа (у /v2/prices/latest его нет —
+        тогда default_currency)
+        """
+        currency = response.json().get("currency") or default_currency
+        return self.normalize(TicketBatch.from_response(response),
+                              currency, to_currency)
@@ -0,0 +1,98 @@
+import re
+from functools import lru_cache
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from typing import List, Optional
+
+# Стратегии поиска Selenium, которые сводятся к CSS-селектору
+_AS_CSS = {
+    By.ID: "#{}",
+    By.CLASS_NAME: ".{}",
+    By.TAG_NAME: "{}",
+    By.NAME: "[name='{}']",
+}
+
+
+@lru_cache(maxsize=256)
+def _css(selector: str) -> CSSSelector:
+    return CSSSelector(selector)
+
+
+def _select(node, by: str, value: str) -> list:
+    if by in _AS_CSS:
+        by, value = By.CSS_SELECTOR, _AS_CSS[by].format(value)
+    if by == By.CSS_SELECTOR:
+        return _css(value)(node)
+    if by == By.XPATH:
+        return [found for found in node.xpath(value)
+                if isinstance(found, lxml_html.HtmlElement)]
+    raise ValueError(f"Стратегия поиска не поддерживается снимком: {by}")
+
+
+class SnapshotElement:
+    """Элемент снимка с интерфейсом WebElement для чтения"""
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.tag
+
+    @property
+    def text(self) -> str:
+        """Текст элемента без лишних пробелов (как .text в Selenium)"""
+        lines = (" ".join(line.split())
+                 for line in self._node.text_content().splitlines())
+        return "\n".join(line for line in lines if line)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._node.get(name)
+
+    def find_element(self, by: str = By.ID, value: str = None
+                     ) -> "SnapshotElement":
+        found = _select(self._node, by, value)
+        if not found:
+            raise NoSuchElementException(f"{by}: {value}")
+        return SnapshotElement(found[0])
+
+    def find_elements(self, by: str = By.ID, value: str = None
+                      ) -> List["SnapshotElement"]:
+        return [SnapshotElement(node)
+                for node in _select(self._node, by, value)]
+
+
+class DomSnapshot(SnapshotElement):
+    """
+    Снимок страницы: page_source, снятый один раз и разобранный lxml.
+
+    Повторяет читающую часть интерфейса WebDriver (find_element(s),
+    page_source, current_url), поэтому getters Page Object работают
+    с ним так же, как с живым браузером, — без сети и без браузера.
+    """
+
+    def __init__(self, page_source: str, url: str = ""):
+        super().__init__(lxml_html.document_fromstring(page_source))
+        self.page_source = page_source
+        self.current_url = url
+
+    @classmethod
+    def capture(cls, driver) -> "DomSnapshot":
+        """Снимок текущей страницы браузера"""
+        return cls(driver.page_source, driver.current_url)
+
+    @classmethod
+    def load(cls, path: str) -> "DomSnapshot":
+        with open(path, encoding="utf-8") as file:
+            source = file.read()
+        match = re.match(r"<!-- url: (\S*) -->\n", source)
+        if match:
+            return cls(source[match.end():], match.group(1))
+        return cls(source)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f"<!-- url: {self.current_url} -->\n")
+            file.write(self.page_source)
@@ -0,0 +1,79 @@
+import json
+import os
+import statistics
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_DURATION = 1.0  # для тестов без истории и без соседей по модулю
+SMOOTHING = 0.5         # вес нового замера в скользящем среднем
+
+
+def base_nodeid(nodeid: str) -> str:
+    """nodeid без суффикса группы xdist: test.py::test_a@group -> ..."""
+    if nodeid.rfind("@") > nodeid.rfind("]"):
+        return nodeid.rsplit("@", 1)[0]
+    return nodeid
+
+
+class DurationHistory:
+    """
+    Длительности тестов (setup + call + teardown) прошлых запусков
+    в JSON; новый замер сглаживается со старым значением
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.durations: Dict[str, float] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path) as file:
+                    self.durations = json.load(file)
+            except (OSError, ValueError):
+                pass  # испорченная история — начинаем заново
+        self._current: Dict[str, float] = defaultdict(float)
+        self._by_module: Optional[Dict[str, float]] = None
+
+    def estimate(self, nodeid: str) -> float:
+        """
+        Ожидаемая длительность теста: из истории, иначе средняя
+        по его модулю, иначе медиана по всем тестам
+        """
+        nodeid = base_nodeid(nodeid)
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        if self._by_module is None:
+            self._by_module = self._module_means()
+        module = nodeid.split("::", 1)[0]
+        if module in self._by_module:
+            return self._by_module[module]
+        if self.durations:
+            return statistics.median(self.durations.values())
+        return DEFAULT_DURATION
+
+    def _module_means(self) -> Dict[str, float]:
+        modules: Dict[str, List[float]] = defaultdict(list)
+        for nodeid, duration in self.durations.items():
+            modules[nodeid.split("::", 1)[0]].append(duration)
+        return {module: statistics.mean(values)
+                for module, values in modules.items()}
+
+    def total(self, nodeids: Iterable[str]) -> float:
+        return sum(self.estimate(nodeid) for nodeid in nodeids)
+
+    # ================= ЗАПИСЬ =================
+    def pytest_runtest_logreport(self, report):
+        # на контроллере xdist сюда приходят отчёты всех воркеров
+        self._current[base_nodeid(report.nodeid)] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        for nodeid, duration in self._current.items():
+            old = self.durations.get(nodeid)
+            self.durations[nodeid] = round(
+                duration if old is None
+                else SMOOTHING * duration + (1 - SMOOTHING) * old, 3)
+        if self.path and self._current:
+            # временный файл и подмена: читатель не увидит недописанное
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(self.durations, file, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,271 @@
+import base64
+import queue
+import random
+import threading
+import time
+import allure
+import pytest
+from allure_commons import hookimpl, plugin_manager
+from allure_commons.model2 import Attachment
+from selenium.common.exceptions import WebDriverException
+from typing import Dict, List, NamedTuple, Optional
+from uuid import uuid4
+
+DEFAULT_QUEUE_SIZE = 16
+MAX_SCREENSHOT_BYTES = 2 * 1024 * 1024
+MAX_TEXT_BYTES = 1024 * 1024
+JPEG_QUALITY = 70
+
+SCREENSHOT, PAGE_SOURCE, BROWSER_LOG = "screenshot", "page_source", "log"
+
+_STOP = object()
+
+
+class ArtifactJob(NamedTuple):
+    """Снятые данные, которые воркер кодирует и пишет в alluredir"""
+    kind: str
+    file_name: str
+    payload: object
+
+
+class ArtifactPipeline:
+    """
+    Снимки браузера для падений: скриншот, DOM и консольный лог.
+
+    В потоке теста только забираются сырые данные из драйвера
+    (скриншот — уже сжатый браузером JPEG в base64) и в результат
+    Allure добавляется ссылка на будущий файл. Декодирование,
+    форматирование, обрезка по лимитам и запись файлов идут в фоновом
+    воркере. Очередь ограничена: если воркер не успевает, снимок
+    отбрасывается, а тест не ждёт. Для успешных шагов Allure можно
+    включить выборочные скриншоты с долей step_sample_rate.
+
+    Подключается к pytest и к allure_commons как плагин; драйвер
+    текущего теста задаётся через watch()/unwatch().
+    """
+
+    def __init__(self, max_queue: int = DEFAULT_QUEUE_SIZE,
+                 max_screenshot_bytes: int = MAX_SCREENSHOT_BYTES,
+                 max_text_bytes: int = MAX_TEXT_BYTES,
+                 step_sample_rate: float = 0.0,
+                 jpeg_quality: int = JPEG_QUALITY,
+                 seed: Optional[int] = None):
+        """
+        :param max_queue: сколько снимков может ждать записи
+        :param max_screenshot_bytes: скриншоты крупнее не сохраняются
+        :param max_text_bytes: DOM и лог обрезаются до этого размера
+        :param step_sample_rate: доля успешных шагов со скриншотом
+        :param jpeg_quality: качество JPEG-скриншота (0-100)
+        """
+        self.max_screenshot_bytes = max_screenshot_bytes
+        self.max_text_bytes = max_text_bytes
+        self.step_sample_rate = step_sample_rate
+        self.jpeg_quality = jpeg_quality
+        self.driver = None
+        self.reporter = None
+        self.queued = 0
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self.oversized = 0
+        self.capture_time = 0.0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._random = random.Random(seed)
+        self._steps: Dict[str, str] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def watch(self, driver) -> None:
+        """Снимки берутся с этого драйвера до unwatch()"""
+        self.driver = driver
+
+    def unwatch(self) -> None:
+        self.driver = None
+
+    # ================= СНЯТИЕ В ПОТОКЕ ТЕСТА =================
+    def capture_failure(self, driver, parent=None) -> int:
+        """
+        Снимает скриншот, DOM и консольный лог
+
+        Args:
+            parent: результат теста или шага Allure; по умолчанию —
+                текущий тест
+
+        Returns:
+            int: сколько вложений поставлено в очередь
+        """
+        started = time.perf_counter()
+        parent = parent or self._current_test()
+        queued = 0
+        if parent is not None:
+            queued += self._capture_screenshot(driver, parent,
+                                               "Скриншот при падении")
+            queued += self._capture(parent, PAGE_SOURCE,
+                                    "DOM при падении",
+                                    allure.attachment_type.HTML,
+                                    lambda: driver.page_source)
+            queued += self._capture(parent, BROWSER_LOG,
+                                    "Консоль браузера",
+                                    allure.attachment_type.TEXT,
+                                    lambda: driver.get_log("browser"))
+        self.capture_time += time.perf_counter() - started
+        return queued
+
+    def capture_screenshot(self, driver, name: str, parent=None) -> bool:
+        started = time.perf_counter()
+        parent = parent or self._current_test()
+        queued = parent is not None and \
+            self._capture_screenshot(driver, parent, name)
+        self.capture_time += time.perf_counter() - started
+        return queued
+
+    def _capture_screenshot(self, driver, parent, name: str) -> bool:
+        try:
+            data = driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "jpeg", "quality": self.jpeg_quality})["data"]
+            attachment_type = allure.attachment_type.JPG
+        except (AttributeError, KeyError, WebDriverException):
+            # не Chromium — PNG через WebDriver
+            return self._capture(parent, SCREENSHOT, name,
+                                 allure.attachment_type.PNG,
+                                 driver.get_screenshot_as_base64)
+        return self._capture(parent, SCREENSHOT, name, attachment_type,
+                             lambda: data)
+
+    def _capture(self, parent, kind: str, name: str,
+                 attachment_type, read) -> bool:
+        try:
+            payload = read()
+        except WebDriverException:
+            return False  # браузер неисправен или лог не поддерживается
+        # размер base64 известен без декодирования
+        if kind == SCREENSHOT and \
+                len(payload) * 3 // 4 > self.max_screenshot_bytes:
+            self.oversized += 1
+            return False
+        file_name = f"{uuid4()}-attachment.{attachment_type.extension}"
+        if not self._submit(ArtifactJob(kind, file_name, payload)):
+            return False
+        # ссылку добавляем, только когда файл точно будет записан
+        parent.attachments.append(Attachment(
+            name=name, source=file_name, type=attachment_type.mime_type))
+        return True
+
+    def _current_test(self):
+        return self.reporter.get_test(None) \
+            if self.reporter is not None else None
+
+    def _submit(self, job: ArtifactJob) -> bool:
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._work, name="failure-artifacts", daemon=True)
+                self._worker.start()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.queued += 1
+        return True
+
+    # ================= ФОНОВЫЙ ВОРКЕР =================
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            try:
+                plugin_manager.hook.report_attached_data(
+                    body=self.encode(job), file_name=job.file_name)
+                self.written += 1
+            except Exception:
+                # недописанное вложение не должно ронять ни прогон,
+                # ни воркер: остальные вложения всё равно пишутся
+                self.failed += 1
+
+    def encode(self, job: ArtifactJob) -> bytes:
+        if job.kind == SCREENSHOT:
+            return base64.b64decode(job.payload)
+        if job.kind == BROWSER_LOG:
+            text = self.format_log(job.payload)
+        else:
+            text = job.payload
+        body = text.encode("utf-8")
+        if len(body) > self.max_text_bytes:
+            body = body[:self.max_text_bytes] + \
+                f"\n… обрезано, всего {len(body)} байт\n".encode("utf-8")
+        return body
+
+    @staticmethod
+    def format_log(entries: List[dict]) -> str:
+        if not entries:
+            return "Консоль пуста\n"
+        lines = []
+        for entry in entries:
+            at = time.localtime(entry.get("timestamp", 0) / 1000)
+            lines.append(f"{time.strftime('%H:%M:%S', at)} "
+                         f"{entry.get('level', '')} "
+                         f"{entry.get('message', '')}\n")
+        return "".join(lines)
+
+    def close(self) -> None:
+        """Дожидается записи всех снимков из очереди"""
+        if self._worker is None:
+            return
+        while self._worker.is_alive():
+            # воркер мог умереть при полной очереди — тогда не ждём
+            try:
+                self._queue.put(_STOP, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self._worker.join()
+        self._worker = None
+
+    def stats(self) -> Dict[str, float]:
+        return {"queued": self.queued, "written": self.written,
+                "failed": self.failed, "dropped": self.dropped,
+                "oversized": self.oversized,
+                "capture_ms": round(self.capture_time * 1000, 1)}
+
+    # ================= ШАГИ ALLURE =================
+    @hookimpl
+    def start_step(self, uuid, title, params):
+        if self.step_sample_rate:
+            self._steps[uuid] = title
+
+    @hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        title = self._steps.pop(uuid, None)
+        if title is None or exc_type is not None or self.driver is None \
+                or self._random.random() >= self.step_sample_rate:
+            return
+        # шаг ещё открыт, если наш хук вызван раньше слушателя Allure
+        parent = self.reporter.get_item(uuid) \
+            if self.reporter is not None else None
+        self.capture_screenshot(self.driver, f"Шаг: {title}", parent)
+
+    # ================= PYTEST =================
+    def pytest_sessionstart(self, session):
+        listener = session.config.pluginmanager.get_plugin("allure_listener")
+        self.reporter = listener.allure_logger if listener else None
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        report = yield
+        if report.failed and self.driver is not None:
+            self.capture_failure(self.driver)
+        return report
+
+    def pytest_sessionfinish(self, session):
+        self.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.queued or self.dropped or self.oversized:
+            stats = self.stats()
+            terminalreporter.write_line(
+                f"Артефакты падений: записано {stats['written']}, "
+                f"отброшено {stats['dropped'] + stats['oversized']}, "
+                f"с ошибкой записи {stats['failed']}, "
+                f"в потоке тестов {stats['capture_ms']} мс")
@@ -0,0 +1,217 @@
+import queue
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from project.utils.tickets import Ticket
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_FLUSH_INTERVAL = 0.5  # с; дольше запись в очереди не ждёт
+MMAP_SIZE = 256 * 1024 * 1024
+
+_STOP = object()
+
+Row = Tuple[str, str, str, Optional[str], float, Optional[str],
+            Optional[str], Optional[int], float]
+
+
+class DailyFare(NamedTuple):
+    """Минимальная цена на день вылета"""
+    departure_date: str
+    price: float
+    currency: Optional[str]
+    fetched_at: float
+
+
+class FareStore:
+    """
+    Хранилище цен из ответов API в SQLite-файле для анализа трендов.
+
+    Билеты приводятся к записи Ticket и добавляются только в конец
+    таблицы. Запись идёт в фоновом потоке пачками по batch_size строк
+    в одной транзакции, поэтому add() не ждёт диска и успевает за
+    параллельным обходом маршрутов. Чтение идёт через отдельное
+    соединение с mmap; WAL не блокирует его записью. Индекс
+    (origin, destination, departure_date, fetched_at) покрывает
+    запросы по маршруту и дате вылета.
+
+    Пример:
+        store = FareStore(".fares.sqlite")
+        api = AviasalesApi(BASE_URL_API, TOKEN, fare_store=store)
+        ...
+        store.cheapest_per_day("MOW", "LED", days=30)
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        :param path: файл SQLite
+        :param batch_size: максимум строк в одной транзакции записи
+        :param flush_interval: сколько ждать добора пачки, в секундах
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.batches = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._writer_conn = self._connect()
+        self._writer_conn.executescript(
+            "CREATE TABLE IF NOT EXISTS fares ("
+            " origin TEXT NOT NULL, destination TEXT NOT NULL,"
+            " departure_date TEXT NOT NULL, departure_at TEXT,"
+            " price REAL NOT NULL, currency TEXT, airline TEXT,"
+            " transfers INTEGER, fetched_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS fares_route_date ON fares"
+            " (origin, destination, departure_date, fetched_at);")
+        self._reader_conn = self._connect()
+        self._reader_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop,
+                                        name="fare-store-writer",
+                                        daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30,
+                               check_same_thread=False,
+                               isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        return conn
+
+    # ================= ЗАПИСЬ =================
+    def add(self, tickets: Iterable[dict], currency: Optional[str] = None,
+            fetched_at: Optional[float] = None) -> int:
+        """
+        Ставит билеты ответа API в очередь записи
+
+        Returns:
+            int: число принятых билетов (без цены, маршрута
+            или даты вылета билет пропускается)
+        """
+        self._raise_error()
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows: List[Row] = []
+        for raw in tickets:
+            ticket = Ticket.from_dict(raw)
+            if ticket.price is None or not ticket.origin or \
+                    not ticket.destination or not ticket.departure_at:
+                continue
+            rows.append((ticket.origin, ticket.destination,
+                         ticket.departure_at[:10], ticket.departure_at,
+                         float(ticket.price),
+                         currency.lower() if currency else None,
+                         ticket.airline, ticket.transfers, fetched_at))
+        if rows:
+            self._queue.put(rows)
+        return len(rows)
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch, taken = list(item), 1
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(
+                        timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.extend(item)
+            self._write(batch)
+            for _ in range(taken):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[Row]) -> None:
+        try:
+            with self._writer_conn:
+                self._writer_conn.execute("BEGIN")
+                self._writer_conn.executemany(
+                    "INSERT INTO fares VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    batch)
+            self.written += len(batch)
+            self.batches += 1
+        except sqlite3.Error as error:
+            self._error = error
+
+    def flush(self) -> None:
+        """Ждёт, пока все поставленные в очередь билеты будут записаны"""
+        self._queue.join()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._writer_conn.close()
+        self._reader_conn.close()
+        self._raise_error()
+
+    def __enter__(self) -> "FareStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    # ================= ЧТЕНИЕ =================
+    def cheapest_per_day(self, origin: str, destination: str,
+                         currency: str = "rub", days: float = 30,
+                         now: Optional[float] = None,
+                         departure_from: Optional[str] = None,
+                         departure_to: Optional[str] = None
+                         ) -> List[DailyFare]:
+        """
+        Минимальная цена на каждый день вылета среди цен в currency,
+        полученных за последние days суток. Цены в разных валютах
+        не сравниваются: prices_for_dates отдаёт usd, остальные — rub
+        (для сравнения см. CurrencyService.convert_mixed)
+
+        Args:
+            departure_from, departure_to: границы дат вылета
+                (YYYY-MM-DD, включительно)
+        """
+        now = time.time() if now is None else now
+        # при MIN() SQLite берёт остальные столбцы из строки минимума
+        return [DailyFare(*row) for row in self._query(
+            "SELECT departure_date, MIN(price), currency, fetched_at"
+            " FROM fares WHERE origin = ? AND destination = ?"
+            " AND departure_date BETWEEN ? AND ? AND fetched_at >= ?"
+            " AND currency = ?"
+            " GROUP BY departure_date ORDER BY departure_date",
+            (origin, destination, departure_from or "",
+             departure_to or "9999-12-31", now - days * 86400,
+             currency.lower()))]
+
+    def price_history(self, origin: str, destination: str,
+                      departure_date: str, currency: str = "rub"
+                      ) -> List[Tuple[float, float]]:
+        """Наблюдения цены в currency на дату вылета: (fetched_at, price)"""
+        return self._query(
+            "SELECT fetched_at, price FROM fares"
+            " WHERE origin = ? AND destination = ? AND departure_date = ?"
+            " AND currency = ? ORDER BY fetched_at",
+            (origin, destination, departure_date, currency.lower()))
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM fares")[0][0]
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        with self._reader_lock:
+            return self._reader_conn.execute(sql, params).fetchall()
@@ -0,0 +1,238 @@
+import hashlib
+import io
+import json
+import sqlite3
+import threading
+import time
+import requests
+from collections import OrderedDict
+from requests.structures import CaseInsensitiveDict
+from typing import Callable, Dict, Optional
+from urllib.parse import urlencode, urlparse
+
+# TTL в секундах по окончанию пути эндпоинта
+DEFAULT_TTLS: Dict[str, float] = {
+    "/adaptors/currency.json": 3600,
+    "/aviasales/v3/prices_for_dates": 600,
+    "/aviasales/v3/search_by_price_range": 600,
+    "/v2/prices/latest": 60,
+}
+
+
+def normalize_params(params: Optional[dict]) -> str:
+    """Параметры запроса в каноническом виде: без None, по ключам"""
+    if not params:
+        return ""
+    items = sorted((str(key), str(value)) for key, value in params.items()
+                   if value is not None)
+    return urlencode(items)
+
+
+class CacheEntry:
+    """Сохранённый ответ вместе с валидаторами для условного запроса"""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str],
+                 content: bytes, stored_at: float):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.stored_at = stored_at
+
+    @classmethod
+    def from_response(cls, url: str,
+                      response: requests.Response) -> "CacheEntry":
+        # url без query-параметров — токен не попадает в файл кэша
+        return cls(url, response.status_code, dict(response.headers),
+                   response.content, time.time())
+
+    def validators(self) -> Dict[str, str]:
+        """Заголовки условного запроса: If-None-Match / If-Modified-Since"""
+        headers = {}
+        lowered = {key.lower(): value for key, value in self.headers.items()}
+        if "etag" in lowered:
+            headers["If-None-Match"] = lowered["etag"]
+        if "last-modified" in lowered:
+            headers["If-Modified-Since"] = lowered["last-modified"]
+        return headers
+
+    def to_response(self) -> requests.Response:
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response._content_consumed = True
+        response.raw = io.BytesIO(self.content)
+        response.encoding = "utf-8"
+        return response
+
+
+class _DiskBackend:
+    """
+    Кэш в SQLite-файле. Режим WAL позволяет нескольким воркерам
+    pytest-xdist одновременно читать и писать один и тот же файл.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, timeout=30,
+                                     check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, url TEXT, status INTEGER,"
+            " headers TEXT, content BLOB, stored_at REAL,"
+            " accessed_at REAL)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed"
+            " ON responses (accessed_at)")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = self._conn.execute(
+            "SELECT url, status, headers, content, stored_at"
+            " FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE responses SET accessed_at = ?"
+                           " WHERE key = ?", (time.time(), key))
+        url, status, headers, content, stored_at = row
+        return CacheEntry(url, status, json.loads(headers), content,
+                          stored_at)
+
+    def put(self, key: str, entry: CacheEntry) -> int:
+        """Сохраняет запись и возвращает число вытесненных"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, entry.url, entry.status_code, json.dumps(entry.headers),
+             entry.content, entry.stored_at, time.time()))
+        return self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY accessed_at DESC"
+            " LIMIT -1 OFFSET ?)", (self.max_entries,)).rowcount
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ResponseCache:
+    """
+    LRU-кэш ответов API с TTL по эндпоинтам.
+
+    Просроченная запись не выбрасывается: при следующем запросе
+    она перепроверяется условным запросом (ETag / Last-Modified),
+    и при ответе 304 отдаётся снова без загрузки тела. Потоковые
+    запросы (stream=True) AviasalesApi в кэш не отправляет: их тело
+    читается по мере разбора.
+
+    Пример:
+        cache = ResponseCache(max_entries=512, path=".api_cache.sqlite")
+        api = AviasalesApi(BASE_URL_API, TOKEN, cache=cache)
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 300, max_entries: int = 1024,
+                 path: Optional[str] = None):
+        """
+        :param ttls: TTL по окончанию пути эндпоинта, в секундах
+        :param default_ttl: TTL для остальных эндпоинтов
+        :param max_entries: максимум записей (в памяти и на диске)
+        :param path: файл SQLite для общего кэша между процессами
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._disk = _DiskBackend(path, max_entries) if path else None
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+
+    @staticmethod
+    def key(url: str, params: Optional[dict] = None) -> str:
+        raw = f"{url}?{normalize_params(params)}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        path = urlparse(url).path
+        for suffix, ttl in self.ttls.items():
+            if path.endswith(suffix):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+            if self._disk is not None:
+                entry = self._disk.get(key)
+                if entry is not None:
+                    self._remember(key, entry)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._remember(key, entry)
+            if self._disk is not None:
+                self.evictions += self._disk.put(key, entry)
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            if self._disk is None:
+                self.evictions += 1
+
+    def is_fresh(self, entry: CacheEntry, url: str) -> bool:
+        return time.time() - entry.stored_at < self.ttl_for(url)
+
+    def fetch(self, url: str, params: Optional[dict],
+              send: Callable[[Dict[str, str]], requests.Response]
+              ) -> requests.Response:
+        """
+        Возвращает ответ из кэша или выполняет запрос через send
+
+        Args:
+            send: выполняет запрос с дополнительными заголовками
+        """
+        key = self.key(url, params)
+        with self._lock:
+            entry = self.get(key)
+            fresh = entry is not None and self.is_fresh(entry, url)
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if fresh:
+            return entry.to_response()
+
+        response = send(entry.validators() if entry is not None else {})
+        if entry is not None and response.status_code == 304:
+            with self._lock:
+                self.revalidations += 1
+            entry.stored_at = time.time()
+            self.put(key, entry)
+            return entry.to_response()
+        if response.status_code == 200:
+            self.put(key, CacheEntry.from_response(url, response))
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions,
+                "revalidations": self.revalidations}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
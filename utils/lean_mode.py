@@ -0,0 +1,268 @@
+import json
+import os
+import pytest
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from uuid import uuid4
+
+# Типы ресурсов, которые не влияют на проверки, и их URL-шаблоны
+BLOCKED_RESOURCES: Dict[str, Tuple[str, ...]] = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*",
+              "*.avif*", "*.svg*", "*.ico*"),
+    "font": ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*"),
+    "media": ("*.mp4*", "*.webm*", "*.mp3*"),
+}
+# Аналитика, реклама и трекеры
+BLOCKED_HOSTS: Tuple[str, ...] = (
+    "*google-analytics.com*", "*googletagmanager.com*",
+    "*doubleclick.net*", "*mc.yandex.ru*", "*top-fwz1.mail.ru*",
+    "*connect.facebook.net*", "*vk.com/rtrg*", "*hotjar.com*",
+    "*criteo.com*", "*adfox.ru*", "*sentry.io*",
+)
+
+# Отключает анимации и плавную прокрутку в каждом новом документе
+_NO_ANIMATIONS_JS = """
+(() => {
+    const css = "*, *::before, *::after { animation: none !important;"
+        + " transition: none !important; scroll-behavior: auto !important;"
+        + " caret-color: auto !important; }";
+    const install = () => {
+        const style = document.createElement("style");
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) install();
+    else document.addEventListener("DOMContentLoaded", install);
+})();
+"""
+
+# Перед уходом со страницы дописывает её статистику загрузки
+# в sessionStorage: он переживает переходы в пределах origin.
+# Запись помечена run теста: pagehide последней страницы срабатывает
+# уже после сброса браузера и не должна попасть в следующий тест
+_RECORD_LOADS_JS = """
+(() => {
+    const run = %s;
+    addEventListener("pagehide", () => {
+        try {
+            const loads = JSON.parse(
+                sessionStorage.getItem("__pageLoads") || "[]");
+            loads.push(Object.assign(window.__pageLoadStats(), {run}));
+            sessionStorage.setItem("__pageLoads", JSON.stringify(loads));
+        } catch (e) {}
+    });
+    window.__pageLoadStats = () => {
+        const nav = performance.getEntriesByType("navigation")[0] || {};
+        const resources = performance.getEntriesByType("resource");
+        return {
+            url: location.href,
+            requests: resources.length + 1,
+            bytes: resources.reduce((sum, r) => sum + (r.transferSize || 0),
+                                    nav.transferSize || 0),
+            load_ms: nav.loadEventEnd || performance.now(),
+        };
+    };
+    window.__pageLoadRun = run;
+})();
+"""
+_COLLECT_LOADS_JS = """
+const run = arguments[0];
+let loads = [];
+try {
+    loads = JSON.parse(sessionStorage.getItem("__pageLoads") || "[]");
+    sessionStorage.removeItem("__pageLoads");
+} catch (e) {}
+loads = loads.filter(load => load.run === run);
+if (window.__pageLoadRun === run) loads.push(window.__pageLoadStats());
+return loads;
+"""
+
+
+class PageLoad(NamedTuple):
+    """Статистика одной загрузки страницы"""
+    url: str
+    requests: int
+    bytes: int
+    load_ms: float
+
+    @property
+    def page(self) -> str:
+        """Вид страницы: первый сегмент пути (/search/MOW1806PEE1 -> search)"""
+        path = self.url.split("://", 1)[-1].partition("/")[2]
+        return path.split("?", 1)[0].split("/", 1)[0] or "/"
+
+
+class LeanMode:
+    """
+    Облегчённый режим браузера: блокирует картинки, шрифты, медиа,
+    аналитику и рекламу через Network.setBlockedURLs и отключает
+    CSS-анимации. Часть блокировок можно снять для отдельного теста:
+    allow — тип ресурса из BLOCKED_RESOURCES, заблокированный шаблон
+    целиком ("*mc.yandex.ru*") или URL, под который попадает шаблон
+    ("https://mc.yandex.ru/metrika/tag.js").
+    """
+
+    def __init__(self, resources: Iterable[str] = tuple(BLOCKED_RESOURCES),
+                 patterns: Iterable[str] = BLOCKED_HOSTS):
+        self.resources = tuple(resources)
+        self.patterns = tuple(patterns)
+
+    def blocked_urls(self, allow: Iterable[str] = ()) -> List[str]:
+        allow = tuple(allow)
+        urls = [pattern for resource in self.resources
+                if resource not in allow
+                for pattern in BLOCKED_RESOURCES[resource]]
+        urls.extend(self.patterns)
+        # шаблон блокировки проверяется на разрешённом значении, а не
+        # наоборот: иначе allow="*" снял бы все блокировки
+        return [url for url in urls
+                if not any(rule == url or fnmatchcase(rule, url)
+                           for rule in allow)]
+
+    def apply(self, driver, allow: Iterable[str] = ()) -> str:
+        """
+        Включает режим в браузере
+
+        Returns:
+            str: идентификатор скрипта для release()
+        """
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs",
+                               {"urls": self.blocked_urls(allow)})
+        driver.execute_cdp_cmd("Emulation.setEmulatedMedia", {
+            "features": [{"name": "prefers-reduced-motion",
+                          "value": "reduce"}]})
+        return driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument",
+            {"source": _NO_ANIMATIONS_JS})["identifier"]
+
+    @staticmethod
+    def release(driver, script_id: str) -> None:
+        """Выключает режим: браузер возвращается в пул обычным"""
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+        driver.execute_cdp_cmd("Emulation.setEmulatedMedia", {"features": []})
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument",
+                               {"identifier": script_id})
+
+
+# ================= СТАТИСТИКА ЗАГРУЗОК =================
+class PageLoadRecorder(NamedTuple):
+    """Запись загрузок одного теста"""
+    script_id: str
+    run: str
+
+
+def record_page_loads(driver) -> PageLoadRecorder:
+    """
+    Начинает записывать статистику загрузок страниц
+
+    Returns:
+        PageLoadRecorder: передаётся в collect_page_loads()
+    """
+    run = uuid4().hex
+    script_id = driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument",
+        {"source": _RECORD_LOADS_JS % json.dumps(run)})["identifier"]
+    return PageLoadRecorder(script_id, run)
+
+
+def collect_page_loads(driver, recorder: PageLoadRecorder
+                       ) -> List[PageLoad]:
+    """
+    Возвращает загрузки, записанные этим recorder, и прекращает запись;
+    записи других тестов в том же браузере отбрасываются
+    """
+    try:
+        loads = driver.execute_script(_COLLECT_LOADS_JS, recorder.run) or []
+    finally:
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument",
+                               {"identifier": recorder.script_id})
+    return [PageLoad(load["url"], int(load["requests"]), int(load["bytes"]),
+                     float(load["load_ms"])) for load in loads]
+
+
+class PageLoadStats:
+    """
+    Средние запросы и байты на загрузку по видам страниц отдельно для
+    обычного и облегчённого режима. Хранится в JSON между запусками,
+    поэтому экономию видно, если хотя бы раз запускались оба режима.
+
+    Подключается к pytest как плагин: под xdist воркеры передают
+    загрузки своей сессии контроллеру, и файл пишет только он.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        # {режим: {страница: [загрузок, запросов, байт]}}
+        self.totals: Dict[str, Dict[str, List[float]]] = {}
+        # то же только за текущую сессию
+        self._session: Dict[str, Dict[str, List[float]]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path) as file:
+                    self.totals = json.load(file)
+            except (OSError, ValueError):
+                pass  # испорченная статистика — начинаем заново
+
+    def add(self, mode: str, loads: Iterable[PageLoad]) -> None:
+        for load in loads:
+            self._add_total(mode, load.page,
+                            (1, load.requests, load.bytes))
+
+    def _add_total(self, mode: str, page: str,
+                   total: Iterable[float]) -> None:
+        for totals in (self.totals, self._session):
+            current = totals.setdefault(mode, {}).setdefault(
+                page, [0, 0, 0])
+            for i, value in enumerate(total):
+                current[i] += value
+
+    def mean(self, mode: str, page: str) -> Optional[Tuple[float, float]]:
+        """Средние (запросов, байт) на загрузку или None"""
+        total = self.totals.get(mode, {}).get(page)
+        if not total or not total[0]:
+            return None
+        return total[1] / total[0], total[2] / total[0]
+
+    def saved(self, load: PageLoad, baseline: str = "full"
+              ) -> Optional[Tuple[float, float]]:
+        """Сэкономлено (запросов, байт) относительно режима baseline"""
+        mean = self.mean(baseline, load.page)
+        if mean is None:
+            return None
+        return mean[0] - load.requests, mean[1] - load.bytes
+
+    def report(self, loads: Iterable[PageLoad], lean: bool) -> str:
+        lines = []
+        for load in loads:
+            line = (f"{load.page}: запросов {load.requests}, "
+                    f"{load.bytes / 1024:.0f} КиБ, {load.load_ms:.0f} мс")
+            saved = self.saved(load) if lean else None
+            if saved is not None:
+                line += (f"; сэкономлено запросов {saved[0]:.0f}, "
+                         f"{saved[1] / 1024:.0f} КиБ")
+            lines.append(line)
+        return "\n".join(lines)
+
+    def save(self) -> None:
+        if self.path:
+            # временный файл и подмена: читатель не увидит недописанное
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(self.totals, file, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+    # ================= PYTEST =================
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # загрузки воркера xdist приходят на контроллер
+        for mode, pages in node.workeroutput.get("page_loads", {}).items():
+            for page, total in pages.items():
+                self._add_total(mode, page, total)
+
+    def pytest_sessionfinish(self, session):
+        config = session.config
+        if hasattr(config, "workerinput"):
+            config.workeroutput["page_loads"] = self._session
+        elif self._session:
+            self.save()
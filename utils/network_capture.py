@@ -0,0 +1,156 @@
+import base64
+import json
+import re
+import time
+from selenium.common.exceptions import WebDriverException
+from typing import Any, Dict, Iterable, List, Optional
+
+# Ответы с результатами поиска, которые страница запрашивает сама
+RESULTS_URL = re.compile(r"/search/v[\d.]+/results")
+
+
+class NetworkCapture:
+    """
+    Перехват ответов с результатами поиска через Chrome DevTools.
+
+    События сети читаются из performance-лога браузера (нужна опция
+    goog:loggingPrefs, см. chrome_options(network_log=True)), тело
+    каждого подходящего ответа забирается через Network.getResponseBody.
+    Данные доступны, как только пришёл ответ, — без обхода DOM и
+    не дожидаясь отрисовки карточек.
+    """
+
+    def __init__(self, driver, url_pattern=RESULTS_URL):
+        """
+        :param driver: экземпляр Selenium WebDriver (Chrome)
+        :param url_pattern: регулярное выражение для URL ответов
+        """
+        self.driver = driver
+        self.url_pattern = url_pattern
+        self.payloads: List[Any] = []
+        self.last_payload_at = 0.0
+        self._matched: Dict[str, str] = {}
+
+    def reset(self) -> None:
+        """Забывает пойманные ответы и пропускает накопившиеся события"""
+        for _ in self._read_log():
+            pass
+        self.payloads = []
+        self._matched = {}
+        self.last_payload_at = 0.0
+
+    def poll(self) -> int:
+        """
+        Обрабатывает новые события сети
+
+        Returns:
+            int: сколько ответов поймано с момента reset()
+        """
+        for event in self._read_log():
+            method = event.get("method")
+            params = event.get("params", {})
+            if method == "Network.responseReceived":
+                url = params["response"]["url"]
+                if self.url_pattern.search(url):
+                    self._matched[params["requestId"]] = url
+            elif method == "Network.loadingFinished":
+                if params["requestId"] in self._matched:
+                    self._fetch_body(params["requestId"])
+        return len(self.payloads)
+
+    def settled(self, quiet: float = 1.0) -> bool:
+        """Пойман хотя бы один ответ и новых нет quiet секунд"""
+        count = self.poll()
+        return bool(count) and time.monotonic() - \
+            self.last_payload_at >= quiet
+
+    def cards(self) -> List[Dict[str, Optional[object]]]:
+        """Все пойманные билеты в формате SearchPage.extract_cards()"""
+        cards = []
+        for payload in self.payloads:
+            cards.extend(parse_results(payload))
+        return cards
+
+    def _read_log(self) -> Iterable[dict]:
+        for entry in self.driver.get_log("performance"):
+            yield json.loads(entry["message"])["message"]
+
+    def _fetch_body(self, request_id: str) -> None:
+        self._matched.pop(request_id)
+        try:
+            result = self.driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": request_id})
+        except WebDriverException:
+            return  # тело уже вытеснено из буфера браузера
+        body = result["body"]
+        if result.get("base64Encoded"):
+            body = base64.b64decode(body)
+        try:
+            self.payloads.append(json.loads(body))
+        except ValueError:
+            return
+        self.last_payload_at = time.monotonic()
+
+
+# ================= РАЗБОР ОТВЕТА =================
+def _localized(value: Any) -> Optional[str]:
+    """Название из строки или вложенного словаря локализаций"""
+    while isinstance(value, dict):
+        value = (value.get("ru") or value.get("default")
+                 or next(iter(value.values()), None))
+    return value if isinstance(value, str) else None
+
+
+def _clock(value: Optional[str]) -> Optional[str]:
+    """'2025-06-01T06:55:00' -> '06:55'"""
+    match = re.search(r"T(\d{2}:\d{2})", value or "")
+    return match.group(1) if match else None
+
+
+def parse_results(payload: Any) -> List[Dict[str, Optional[object]]]:
+    """
+    Разбирает ответ с результатами поиска (один чанк или список чанков)
+    в словари price, departure_time, arrival_time, origin,
+    destination, airline
+    """
+    chunks = payload if isinstance(payload, list) else [payload]
+    cards = []
+    for chunk in chunks:
+        if not isinstance(chunk, dict):
+            continue
+        legs = chunk.get("flight_legs") or []
+        airlines = chunk.get("airlines") or {}
+        places = chunk.get("places") or {}
+        airports = places.get("airports") or {}
+        cities = places.get("cities") or {}
+
+        def city(code: Optional[str]) -> Optional[str]:
+            airport = airports.get(code) or {}
+            city_code = airport.get("city_code", code)
+            name = _localized((cities.get(city_code) or {}).get("name"))
+            return name or city_code
+
+        for ticket in chunk.get("tickets") or []:
+            proposals = ticket.get("proposals") or [{}]
+            price = proposals[0].get("price") or {}
+            if isinstance(price, dict):
+                price = price.get("value")
+            segments = ticket.get("segments") or [{}]
+            flights = [legs[index] for index in
+                       segments[0].get("flights") or []
+                       if isinstance(index, int) and index < len(legs)]
+            first = flights[0] if flights else {}
+            last = flights[-1] if flights else {}
+            carrier = (first.get("operating_carrier_designator")
+                       or {}).get("carrier")
+            cards.append({
+                "price": int(price) if price is not None else None,
+                "departure_time": _clock(
+                    first.get("local_departure_date_time")),
+                "arrival_time": _clock(last.get("local_arrival_date_time")),
+                "origin": city(first.get("origin")),
+                "destination": city(last.get("destination")),
+                "airline": _localized(
+                    (airlines.get(carrier) or {}).get("name")) or carrier,
+            })
+    return cards
@@ -0,0 +1,139 @@
+import numpy as np
+from typing import Iterable, NamedTuple, Optional, Sequence, Union
+from project.utils.tickets import Ticket
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class RangeSummary(NamedTuple):
+    """Соответствие цен диапазону value_min..value_max"""
+    count: int
+    in_range: int
+    below: int
+    above: int
+
+    @property
+    def compliant(self) -> bool:
+        return self.in_range == self.count
+
+
+class ScalingSummary(NamedTuple):
+    """Сравнение цен для одного и для N пассажиров"""
+    passengers: int
+    mean_single: float
+    mean_group: float
+    median_ratio: float
+
+    @property
+    def mean_ratio(self) -> float:
+        return self.mean_group / self.mean_single if self.mean_single else 0.0
+
+    @property
+    def scales(self) -> bool:
+        """Средняя цена для группы не меньше N средних цен на одного"""
+        return self.mean_group >= self.mean_single * self.passengers
+
+
+class OutlierSummary(NamedTuple):
+    """Выбросы по правилу межквартильного размаха (IQR)"""
+    count: int
+    lower_fence: float
+    upper_fence: float
+    indices: np.ndarray
+
+    @property
+    def outliers(self) -> int:
+        return len(self.indices)
+
+
+class PercentileSummary(NamedTuple):
+    count: int
+    minimum: float
+    mean: float
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    maximum: float
+
+
+class TicketBatch:
+    """
+    Колоночное представление пачки билетов для векторных проверок.
+
+    Принимает данные и из API (Ticket, dict из ответа, requests.Response),
+    и из UI (список цен SearchPage.get_ticket_prices()).
+    """
+
+    def __init__(self, prices: np.ndarray,
+                 transfers: Optional[np.ndarray] = None):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.transfers = transfers
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @classmethod
+    def from_prices(cls, prices: Sequence[float]) -> "TicketBatch":
+        """Пачка из списка цен, например SearchPage.get_ticket_prices()"""
+        return cls(np.fromiter(prices, dtype=np.float64))
+
+    @classmethod
+    def from_tickets(cls, tickets: Iterable[Union[Ticket, dict]]
+                     ) -> "TicketBatch":
+        """Пачка из записей Ticket или словарей ответа API"""
+        records = [t if isinstance(t, Ticket) else Ticket.from_dict(t)
+                   for t in tickets]
+        prices = np.fromiter((t.price for t in records), dtype=np.float64,
+                             count=len(records))
+        transfers = np.fromiter(
+            (-1 if t.transfers is None else t.transfers for t in records),
+            dtype=np.int16, count=len(records))
+        return cls(prices, transfers)
+
+    @classmethod
+    def from_response(cls, response) -> "TicketBatch":
+        """Пачка из ответа search_by_price_range / prices_for_dates"""
+        return cls.from_tickets(response.json().get("data") or [])
+
+    # ================= ПРОВЕРКИ =================
+    def range_check(self, value_min: float,
+                    value_max: float) -> RangeSummary:
+        below = int(np.count_nonzero(self.prices < value_min))
+        above = int(np.count_nonzero(self.prices > value_max))
+        return RangeSummary(len(self), len(self) - below - above,
+                            below, above)
+
+    def scaled_against(self, single: "TicketBatch",
+                       passengers: int) -> ScalingSummary:
+        """
+        Сравнивает эту пачку (цены для passengers пассажиров)
+        с ценами single для одного пассажира
+        """
+        if not len(self) or not len(single):
+            raise ValueError("Пустая пачка цен")
+        median_single = float(np.median(single.prices))
+        median_ratio = (float(np.median(self.prices)) / median_single
+                        if median_single else 0.0)
+        return ScalingSummary(passengers, float(single.prices.mean()),
+                              float(self.prices.mean()), median_ratio)
+
+    def outliers(self, k: float = 1.5) -> OutlierSummary:
+        if not len(self):
+            return OutlierSummary(0, np.nan, np.nan,
+                                  np.empty(0, dtype=np.intp))
+        q1, q3 = np.percentile(self.prices, (25, 75))
+        spread = q3 - q1
+        lower, upper = q1 - k * spread, q3 + k * spread
+        indices = np.flatnonzero((self.prices < lower) |
+                                 (self.prices > upper))
+        return OutlierSummary(len(self), float(lower), float(upper), indices)
+
+    def percentiles(self) -> PercentileSummary:
+        if not len(self):
+            raise ValueError("Пустая пачка цен")
+        p50, p90, p95, p99 = np.percentile(self.prices, PERCENTILES)
+        return PercentileSummary(len(self), float(self.prices.min()),
+                                 float(self.prices.mean()), float(p50),
+                                 float(p90), float(p95), float(p99),
+                                 float(self.prices.max()))
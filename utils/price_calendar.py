@@ -0,0 +1,228 @@
+import asyncio
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import (Dict, Iterable, List, NamedTuple, Optional, Tuple,
+                    Union)
+
+PAGE_LIMIT = 1000  # максимум билетов на странице prices_for_dates
+DEFAULT_WORKERS = 8
+
+
+class CalendarQuery(NamedTuple):
+    """Один запрос prices_for_dates: маршрут на месяц"""
+    origin: str
+    destination: str
+    month: str  # YYYY-MM
+
+
+class PriceCalendar:
+    """
+    Календарь минимальных цен «маршрут × день» для матрицы
+    origins × destinations.
+
+    Запросы укрупняются до месяца (departure_at=YYYY-MM): один вызов
+    prices_for_dates покрывает все дни месяца маршрута, пересечения
+    окон схлопываются; месяц, не уместившийся в страницу, догружается
+    следующими страницами. Для каждой ячейки хранится время загрузки,
+    поэтому refresh() перезапрашивает только месяцы, в которых есть
+    ячейки старше max_age. Неудачный запрос не мешает остальным: его
+    месяц остаётся устаревшим и попадает в failed и в следующий план.
+    Состояние сохраняется в .npz между запусками.
+
+    Пример:
+        calendar = PriceCalendar(["MOW", "LED"], ["PEE", "KZN"],
+                                 date(2025, 6, 1), date(2025, 8, 31))
+        with AviasalesApi(BASE_URL_API, TOKEN) as api:
+            calendar.refresh(api)
+        calendar.prices  # ndarray (маршрутов, дней), NaN — нет цены
+    """
+
+    def __init__(self, origins: Iterable[str], destinations: Iterable[str],
+                 start: date, end: date, max_age: float = 6 * 3600,
+                 page_limit: int = PAGE_LIMIT):
+        """
+        :param origins: IATA-коды городов вылета
+        :param destinations: IATA-коды городов прилёта
+        :param start: первый день окна
+        :param end: последний день окна (включительно)
+        :param max_age: через сколько секунд ячейка считается устаревшей
+        :param page_limit: размер страницы ответа prices_for_dates
+        """
+        destinations = list(dict.fromkeys(destinations))
+        self.routes: List[Tuple[str, str]] = [
+            (origin, destination)
+            for origin in dict.fromkeys(origins)
+            for destination in destinations if origin != destination]
+        self.days = np.arange(np.datetime64(start),
+                              np.datetime64(end + timedelta(days=1)))
+        self.max_age = max_age
+        self.page_limit = page_limit
+        self.prices = np.full((len(self.routes), len(self.days)), np.nan)
+        # -inf — ячейка ещё не загружалась и устарела при любом max_age
+        self.fetched_at = np.full(self.prices.shape, -np.inf)
+        self._index: Dict[Tuple[str, str], int] = {
+            route: i for i, route in enumerate(self.routes)}
+        self.failed: List[CalendarQuery] = []
+        # причина неудачи каждого запроса из failed
+        self.errors: Dict[CalendarQuery, str] = {}
+
+    # ================= ПЛАН ЗАПРОСОВ =================
+    def plan(self, now: Optional[float] = None) -> List[CalendarQuery]:
+        """Месячные запросы для маршрутов с устаревшими ячейками"""
+        now = time.time() if now is None else now
+        stale = now - self.fetched_at >= self.max_age
+        queries = []
+        for route, days in zip(self.routes, stale):
+            if days.any():
+                stale_days = self.days[days]
+                months = np.unique(stale_days.astype("datetime64[M]"))
+                queries.extend(CalendarQuery(*route, str(month))
+                               for month in months)
+        return queries
+
+    def refresh(self, api, workers: int = DEFAULT_WORKERS,
+                now: Optional[float] = None) -> int:
+        """
+        Загружает устаревшие месяцы через AviasalesApi
+        в workers потоков (пул соединений сессии общий)
+
+        Returns:
+            int: число запрошенных месяцев маршрутов
+        """
+        queries = self.plan(now)
+        results: List[Union[List[dict], str]] = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._fetch, api, query)
+                       for query in queries]
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as error:
+                    results.append(repr(error))
+        self._apply(queries, results, now)
+        return len(queries)
+
+    async def refresh_async(self, api, now: Optional[float] = None) -> int:
+        """То же, что refresh, для AsyncAviasalesApi: конкурентность
+        ограничена параметром concurrency клиента"""
+        queries = self.plan(now)
+        results = await asyncio.gather(
+            *(self._fetch_async(api, query) for query in queries),
+            return_exceptions=True)
+        for result in results:
+            # отменённый месяц — не данные: отмена доходит до вызывающего,
+            # календарь остаётся прежним
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+        self._apply(queries, [
+            repr(result) if isinstance(result, BaseException) else result
+            for result in results], now)
+        return len(queries)
+
+    def _fetch(self, api, query: CalendarQuery) -> Union[List[dict], str]:
+        """Билеты месяца со всех страниц или причина неудачи"""
+        tickets: List[dict] = []
+        page = 1
+        while True:
+            data = self._page_data(api.prices_for_dates(
+                query.origin, query.destination, query.month,
+                limit=self.page_limit, page=page))
+            if isinstance(data, str):
+                return data
+            tickets.extend(data)
+            if len(data) < self.page_limit:
+                return tickets
+            page += 1
+
+    async def _fetch_async(self, api, query: CalendarQuery
+                           ) -> Union[List[dict], str]:
+        tickets: List[dict] = []
+        page = 1
+        while True:
+            data = self._page_data(await api.prices_for_dates(
+                query.origin, query.destination, query.month,
+                limit=self.page_limit, page=page))
+            if isinstance(data, str):
+                return data
+            tickets.extend(data)
+            if len(data) < self.page_limit:
+                return tickets
+            page += 1
+
+    @staticmethod
+    def _page_data(response) -> Union[List[dict], str]:
+        if response.status_code != 200:
+            return f"HTTP {response.status_code}"
+        return response.json().get("data") or []
+
+    def _apply(self, queries: List[CalendarQuery],
+               results: List[Union[List[dict], str]],
+               now: Optional[float]) -> None:
+        now = time.time() if now is None else now
+        self.failed = []
+        self.errors = {}
+        for query, result in zip(queries, results):
+            if isinstance(result, str):
+                # ячейки остаются устаревшими и попадут в следующий план
+                self.failed.append(query)
+                self.errors[query] = result
+                continue
+            self.fill(query, result, now)
+
+    # ================= СЕТКА ЦЕН =================
+    def fill(self, query: CalendarQuery, tickets: List[dict],
+             fetched_at: float) -> None:
+        """Заменяет цены маршрута за месяц минимальными из ответа"""
+        row = self._index[(query.origin, query.destination)]
+        in_month = self.days.astype("datetime64[M]") == \
+            np.datetime64(query.month, "M")
+        self.prices[row, in_month] = np.nan
+        self.fetched_at[row, in_month] = fetched_at
+        if not tickets:
+            return
+        days = np.array([ticket["departure_at"][:10] for ticket in tickets],
+                        dtype="datetime64[D]")
+        prices = np.fromiter((ticket["price"] for ticket in tickets),
+                             dtype=np.float64, count=len(tickets))
+        columns = (days - self.days[0]).astype(np.int64)
+        inside = (columns >= 0) & (columns < len(self.days))
+        np.fmin.at(self.prices[row], columns[inside], prices[inside])
+
+    def route_prices(self, origin: str, destination: str) -> np.ndarray:
+        """Цены маршрута по дням окна (NaN — рейсов нет)"""
+        return self.prices[self._index[(origin, destination)]]
+
+    def cheapest(self, origin: str, destination: str
+                 ) -> Optional[Tuple[date, float]]:
+        """Самый дешёвый день маршрута в окне"""
+        prices = self.route_prices(origin, destination)
+        if np.isnan(prices).all():
+            return None
+        column = int(np.nanargmin(prices))
+        return self.days[column].item(), float(prices[column])
+
+    # ================= СОХРАНЕНИЕ =================
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, routes=np.array(self.routes, dtype=str),
+                            days=self.days, prices=self.prices,
+                            fetched_at=self.fetched_at)
+
+    def merge(self, path: str) -> None:
+        """
+        Подхватывает ячейки из сохранённого календаря: совпадающие
+        маршруты и дни не будут запрошены, пока не устареют
+        """
+        with np.load(path) as saved:
+            rows = {tuple(route): i for i, route in
+                    enumerate(saved["routes"].tolist())}
+            _, ours, theirs = np.intersect1d(
+                self.days, saved["days"], return_indices=True)
+            for route, row in self._index.items():
+                other = rows.get(route)
+                if other is None:
+                    continue
+                self.prices[row, ours] = saved["prices"][other, theirs]
+                self.fetched_at[row, ours] = \
+                    saved["fetched_at"][other, theirs]
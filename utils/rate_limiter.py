@@ -0,0 +1,271 @@
+import threading
+import time
+import requests
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+# Начальная скорость, запросов в секунду, по окончанию пути эндпоинта
+DEFAULT_RATES: Dict[str, float] = {
+    "/adaptors/currency.json": 2,
+    "/aviasales/v3/prices_for_dates": 10,
+    "/aviasales/v3/search_by_price_range": 10,
+    "/v2/prices/latest": 5,
+}
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+MIN_LATENCY_GROWTH = 0.05  # с; меньший рост задержки не снижает скорость
+
+
+class CircuitOpenError(RuntimeError):
+    """Эндпоинт признан неисправным: запрос не отправляется"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"{endpoint}: цепь разомкнута, повтор через "
+                         f"{retry_in:.1f} с")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def retry_after(response: requests.Response) -> Optional[float]:
+    """Значение Retry-After в секундах (число или HTTP-дата)"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(),
+                   0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class EndpointLimiter:
+    """
+    Ведро токенов одного эндпоинта со скоростью по схеме AIMD
+    и автоматом размыкания цепи.
+
+    Скорость растёт аддитивно на каждый успешный ответ и делится
+    пополам на 429 (до истечения Retry-After запросы не уходят) и при
+    росте задержки выше latency_factor × лучшая наблюдавшаяся.
+    После failure_threshold подряд ответов 5xx или ошибок соединения
+    цепь размыкается на reset_timeout секунд: запросы сразу получают
+    CircuitOpenError, затем один пробный запрос решает, замкнуть ли её.
+    """
+
+    def __init__(self, name: str, rate: float, min_rate: float = 0.5,
+                 max_rate: Optional[float] = None, increase: float = 1.0,
+                 latency_factor: float = 3.0, failure_threshold: int = 5,
+                 reset_timeout: float = 10.0):
+        self.name = name
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * 4
+        self.increase = increase
+        self.latency_factor = latency_factor
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.tokens = 1.0
+        self.state = CLOSED
+        self.served = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.failures = 0
+        self.waited = 0.0
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._opened_at = 0.0
+        self._probe_owner: Optional[int] = None
+        self._failures_in_row = 0
+        self._latency: Optional[float] = None
+        self._best_latency: Optional[float] = None
+        self._decreased_at = 0.0
+        self._lock = threading.Lock()
+
+    # ================= ДОПУСК ЗАПРОСА =================
+    def acquire(self) -> None:
+        """Ждёт токен; при разомкнутой цепи — CircuitOpenError"""
+        # цепь проверяется один раз: пробный запрос, ожидающий токен,
+        # не должен отказать сам себе
+        with self._lock:
+            self._check_circuit(time.monotonic())
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = max(self._blocked_until - now, 0.0)
+                    if not wait:
+                        if self.tokens >= 1:
+                            self.tokens -= 1
+                            return
+                        wait = (1 - self.tokens) / self.rate
+                    self.waited += wait
+                time.sleep(wait)
+        except BaseException:
+            self.release_probe()
+            raise
+
+    def _check_circuit(self, now: float) -> None:
+        if self.state == CLOSED:
+            return
+        retry_in = self._opened_at + self.reset_timeout - now
+        if self.state == OPEN and retry_in <= 0:
+            self.state = HALF_OPEN
+        if self.state == OPEN or self._probe_owner is not None:
+            self.rejected += 1
+            raise CircuitOpenError(self.name, max(retry_in, 0.0))
+        self._probe_owner = threading.get_ident()
+
+    def release_probe(self) -> None:
+        """Снимает пробный запрос текущего потока, если он есть"""
+        with self._lock:
+            self._clear_probe()
+
+    def _clear_probe(self) -> None:
+        # ответы запросов, допущенных до размыкания цепи, пробу не снимают
+        if self._probe_owner == threading.get_ident():
+            self._probe_owner = None
+
+    def _refill(self, now: float) -> None:
+        # ёмкость ведра — не больше секунды запросов разом
+        capacity = max(self.rate, 1.0)
+        self.tokens = min(capacity, self.tokens +
+                          (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    # ================= ОБРАТНАЯ СВЯЗЬ =================
+    def on_response(self, status_code: int, latency: float,
+                    delay: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._clear_probe()
+            if status_code == 429:
+                self.throttled += 1
+                self._decrease(now)
+                self._blocked_until = max(self._blocked_until,
+                                          now + (delay or 1 / self.rate))
+                return
+            if status_code >= 500:
+                self._failure(now)
+                return
+            self.served += 1
+            self._failures_in_row = 0
+            self.state = CLOSED
+            self._observe_latency(now, latency)
+
+    def on_error(self) -> None:
+        """Ошибка соединения или таймаут"""
+        with self._lock:
+            self._clear_probe()
+            self._failure(time.monotonic())
+
+    def _failure(self, now: float) -> None:
+        self.failures += 1
+        self._failures_in_row += 1
+        if self.state == HALF_OPEN or \
+                self._failures_in_row >= self.failure_threshold:
+            self.state = OPEN
+            self._opened_at = now
+
+    def _observe_latency(self, now: float, latency: float) -> None:
+        self._latency = latency if self._latency is None \
+            else 0.8 * self._latency + 0.2 * latency
+        if self._best_latency is None or self._latency < self._best_latency:
+            self._best_latency = self._latency
+        # малые абсолютные колебания (доли миллисекунды) — не перегрузка
+        if self._latency > self._best_latency * self.latency_factor and \
+                self._latency - self._best_latency > MIN_LATENCY_GROWTH:
+            self._decrease(now)
+        else:
+            self.rate = min(self.max_rate,
+                            self.rate + self.increase / self.rate)
+
+    def _decrease(self, now: float) -> None:
+        # не чаще раза за интервал между запросами: один всплеск
+        # 429 от параллельных запросов — одно снижение, а не обвал
+        if now - self._decreased_at < 1 / self.rate:
+            return
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._decreased_at = now
+
+    def stats(self) -> Dict[str, float]:
+        return {"rate": round(self.rate, 2), "served": self.served,
+                "throttled": self.throttled, "rejected": self.rejected,
+                "failures": self.failures, "waited": round(self.waited, 3),
+                "state": self.state}
+
+
+class RateLimiter:
+    """
+    Клиентский ограничитель скорости запросов по эндпоинтам.
+
+    Пример:
+        limiter = RateLimiter({"/aviasales/v3/prices_for_dates": 20})
+        api = AviasalesApi(BASE_URL_API, TOKEN, limiter=limiter)
+        ...
+        limiter.stats()
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None,
+                 default_rate: float = 10.0, retries: int = 3,
+                 **options):
+        """
+        :param rates: начальная скорость по окончанию пути эндпоинта,
+            запросов в секунду
+        :param default_rate: скорость для остальных эндпоинтов
+        :param retries: сколько раз повторять запрос после 429
+        :param options: параметры EndpointLimiter (min_rate, max_rate,
+            failure_threshold, reset_timeout, ...)
+        """
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.default_rate = default_rate
+        self.retries = retries
+        self.options = options
+        self.endpoints: Dict[str, EndpointLimiter] = {}
+        self._lock = threading.Lock()
+
+    def endpoint(self, url: str) -> EndpointLimiter:
+        path = urlparse(url).path
+        with self._lock:
+            limiter = self.endpoints.get(path)
+            if limiter is None:
+                rate = next((rate for suffix, rate in self.rates.items()
+                             if path.endswith(suffix)), self.default_rate)
+                limiter = self.endpoints[path] = EndpointLimiter(
+                    path, rate, **self.options)
+            return limiter
+
+    def call(self, url: str, send: Callable[[], requests.Response]
+             ) -> requests.Response:
+        """
+        Выполняет запрос через send с учётом ограничения скорости;
+        после 429 повторяет его не раньше Retry-After
+        """
+        limiter = self.endpoint(url)
+        for attempt in range(self.retries + 1):
+            limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = send()
+            except requests.RequestException:
+                limiter.on_error()
+                raise
+            except BaseException:
+                limiter.release_probe()
+                raise
+            limiter.on_response(response.status_code,
+                                time.monotonic() - started,
+                                retry_after(response))
+            if response.status_code != 429 or attempt == self.retries:
+                return response
+            response.close()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Метрики по эндпоинтам: скорость, обслужено, 429, отказы"""
+        with self._lock:
+            return {path: limiter.stats()
+                    for path, limiter in self.endpoints.items()}
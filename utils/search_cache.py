@@ -0,0 +1,78 @@
+import time
+import allure
+from datetime import date
+from typing import Dict, NamedTuple, Optional, Tuple
+from project.utils.dom_snapshot import DomSnapshot
+
+SearchKey = Tuple[str, str, date, int, date]
+
+
+class SearchState(NamedTuple):
+    """Сохранённая страница результатов"""
+    snapshot: DomSnapshot
+    captured_at: float
+
+
+class SearchResultsCache:
+    """
+    Кэш результатов поиска на сессию: поиск с данными параметрами
+    выполняется в браузере один раз, а последующие тесты читают
+    результаты из снимка DOM (utils/dom_snapshot.py) без перехода
+    и без ожидания загрузки.
+
+    Снимок подходит только для чтения: тест, который кликает
+    или меняет фильтры на странице, открывает результаты сам
+    (SearchPage.open_results).
+
+    Ключ включает параметры поиска и текущий день, поэтому на следующий
+    день (или при других параметрах) поиск выполняется заново.
+    """
+
+    def __init__(self, max_age: float = 30 * 60):
+        """
+        :param max_age: сколько секунд запись считается актуальной;
+            0 отключает кэш
+        """
+        self.max_age = max_age
+        self._states: Dict[SearchKey, SearchState] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(origin: str, destination: str, departure: Optional[date],
+            adults: int) -> SearchKey:
+        today = date.today()
+        return origin, destination, departure or today, adults, today
+
+    def get(self, key: SearchKey) -> Optional[SearchState]:
+        state = self._states.get(key)
+        if state is not None and \
+                time.time() - state.captured_at >= self.max_age:
+            del self._states[key]
+            return None
+        return state
+
+    def open(self, page, origin: str, destination: str,
+             departure: Optional[date] = None, adults: int = 1):
+        """
+        Результаты поиска для чтения: из снимка, если поиск уже
+        выполнялся, иначе поиск выполняется на странице page (SearchPage)
+        и её DOM сохраняется
+
+        Returns:
+            SearchPage: page после поиска или страница над снимком
+        """
+        key = self.key(origin, destination, departure, adults)
+        state = self.get(key)
+        if state is not None:
+            with allure.step("Взять результаты поиска из кэша"):
+                self.hits += 1
+                return type(page)(state.snapshot, page.base_url)
+
+        self.misses += 1
+        page.open_results(origin, destination, departure, adults)
+        page.get_search_results()
+        if self.max_age:
+            self._states[key] = SearchState(
+                page.capture_snapshot(), time.time())
+        return page
@@ -0,0 +1,200 @@
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import warnings
+import allure
+import pytest
+from allure_commons import hookimpl
+from fnmatch import fnmatch
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+WARN, FAIL, OFF = "warn", "fail", "off"
+BUDGET_MODES = (WARN, FAIL, OFF)
+
+HISTORY_SIZE = 20      # сколько последних замеров шага хранить
+MIN_HISTORY = 5        # меньше замеров — базы для сравнения ещё нет
+SLOWDOWN_FACTOR = 1.5  # во сколько раз медленнее медианы — регрессия
+MIN_SLOWDOWN = 0.5     # и не меньше чем на столько секунд
+
+
+class StepBudgetWarning(UserWarning):
+    """Шаг превысил бюджет или заметно замедлился"""
+
+
+class StepViolation(NamedTuple):
+    step: str
+    duration: float
+    limit: float
+    reason: str
+
+    def __str__(self) -> str:
+        return (f"{self.step}: {self.duration:.2f} с > {self.limit:.2f} с "
+                f"({self.reason})")
+
+
+def parse_budgets(lines: Iterable[str]) -> Dict[str, float]:
+    """Строки вида 'SearchPage.set_to_city = 3' -> {шаблон: секунды}"""
+    budgets = {}
+    for line in lines:
+        if line.strip() and not line.lstrip().startswith("#"):
+            pattern, _, seconds = line.rpartition("=")
+            budgets[pattern.strip()] = float(seconds)
+    return budgets
+
+
+def _step_name(title: str) -> str:
+    """
+    Имя шага: для @allure.step над методом — его qualname
+    (SearchPage.set_to_city), для with allure.step(...) — заголовок
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_name == "__enter__" and \
+                frame.f_globals.get("__name__") == "allure_commons._allure":
+            caller = frame.f_back
+            func = caller.f_locals.get("func") if caller else None
+            if caller is not None and caller.f_code.co_name == "impl" \
+                    and func is not None:
+                return func.__qualname__
+            break
+        frame = frame.f_back
+    return title
+
+
+class StepTimingHistory:
+    """Последние HISTORY_SIZE длительностей каждого шага, в JSON"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.samples: Dict[str, List[float]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path) as file:
+                    self.samples = json.load(file)
+            except ValueError:
+                pass  # испорченная история — начинаем заново
+
+    def baseline(self, step: str) -> Optional[float]:
+        """Медиана прошлых замеров или None, если их мало"""
+        samples = self.samples.get(step, [])
+        if len(samples) < MIN_HISTORY:
+            return None
+        return statistics.median(samples)
+
+    def add(self, step: str, duration: float) -> None:
+        samples = self.samples.setdefault(step, [])
+        samples.append(round(duration, 3))
+        del samples[:-HISTORY_SIZE]
+
+    def save(self) -> None:
+        if self.path:
+            # пишем во временный файл и подменяем: читатель не увидит
+            # недописанный JSON
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(self.samples, file, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+
+
+class StepTimer:
+    """
+    Замеряет каждый шаг Allure (декоратор и with) и сверяет его
+    с бюджетом и с медианой прошлых запусков.
+
+    Подключается к allure_commons как слушатель шагов и к pytest как
+    плагин: нарушения шагов теста (включая фикстуры) проверяются
+    после его выполнения — в режиме warn выдаётся предупреждение,
+    в режиме fail тест падает.
+    """
+
+    def __init__(self, history: StepTimingHistory,
+                 budgets: Optional[Dict[str, float]] = None,
+                 mode: str = WARN):
+        self.history = history
+        self.budgets = budgets or {}
+        self.mode = mode
+        self.violations: List[StepViolation] = []
+        self._session: List[tuple] = []
+        self._started: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._item_budgets: Dict[str, float] = {}
+
+    # ================= ШАГИ ALLURE =================
+    @hookimpl
+    def start_step(self, uuid, title, params):
+        self._started[uuid] = (_step_name(title), time.perf_counter())
+
+    @hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        started = self._started.pop(uuid, None)
+        if started is None:
+            return
+        step, at = started
+        self.check(step, time.perf_counter() - at)
+
+    def budget_for(self, step: str) -> Optional[float]:
+        for budgets in (self._item_budgets, self.budgets):
+            for pattern, seconds in budgets.items():
+                if fnmatch(step, pattern):
+                    return seconds
+        return None
+
+    def check(self, step: str, duration: float) -> None:
+        budget = self.budget_for(step)
+        baseline = self.history.baseline(step)
+        violation = None
+        if budget is not None and duration > budget:
+            violation = StepViolation(step, duration, budget, "бюджет")
+        elif baseline is not None and \
+                duration > baseline * SLOWDOWN_FACTOR and \
+                duration - baseline > MIN_SLOWDOWN:
+            violation = StepViolation(step, duration,
+                                      baseline * SLOWDOWN_FACTOR,
+                                      f"медиана {baseline:.2f} с")
+        with self._lock:
+            self._session.append((step, duration))
+            if violation is not None:
+                self.violations.append(violation)
+
+    # ================= PYTEST =================
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self.violations = []
+        self._item_budgets = {
+            marker.args[0]: float(marker.args[1])
+            for marker in item.iter_markers("step_budget")}
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item):
+        result = yield
+        violations, self.violations = self.violations, []
+        if violations:
+            message = "\n".join(map(str, violations))
+            allure.attach(message, name="Превышение времени шагов",
+                          attachment_type=allure.attachment_type.TEXT)
+            if self.mode == FAIL:
+                pytest.fail(f"Шаги медленнее допустимого:\n{message}",
+                            pytrace=False)
+            warnings.warn(StepBudgetWarning(message))
+        return result
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # замеры воркера xdist приходят на контроллер
+        self._session.extend(
+            map(tuple, node.workeroutput.get("step_timings", [])))
+
+    def pytest_sessionfinish(self, session):
+        config = session.config
+        if hasattr(config, "workerinput"):
+            # историю пишет только контроллер xdist
+            config.workeroutput["step_timings"] = self._session
+            return
+        # история пополняется после прогона, чтобы текущие замеры
+        # не влияли на собственную базу
+        for step, duration in self._session:
+            self.history.add(step, duration)
+        self.history.save()
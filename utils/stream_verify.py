@@ -0,0 +1,104 @@
+from datetime import time
+from typing import Dict, Iterable, NamedTuple, Optional, Union
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class Violation(NamedTuple):
+    """Первое нарушение в потоке карточек"""
+    index: int
+    reason: str
+    card: Dict[str, Optional[object]]
+
+    def __str__(self) -> str:
+        return f"карточка №{self.index + 1}: {self.reason} ({self.card})"
+
+
+class Verdict(NamedTuple):
+    checked: int
+    violation: Optional[Violation]
+
+    @property
+    def ok(self) -> bool:
+        return self.violation is None
+
+
+def _minutes(value: Union[str, time]) -> int:
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+class DepartureOrderVerifier:
+    """
+    Потоковая проверка карточек рейсов за O(1) памяти.
+
+    Время вылета должно не убывать; допускается один переход через
+    полночь, после которого время не может дойти до времени первого
+    рейса (иначе список охватывает больше суток). У каждой карточки
+    должна быть положительная цена в пределах [price_min, price_max].
+    """
+
+    def __init__(self, price_min: Optional[float] = None,
+                 price_max: Optional[float] = None):
+        self.price_min = price_min
+        self.price_max = price_max
+        self.checked = 0
+        self.violation: Optional[Violation] = None
+        self._first: Optional[int] = None
+        self._previous: Optional[int] = None
+        self._rolled_over = False
+
+    def feed(self, card: Dict[str, Optional[object]]) -> bool:
+        """
+        Проверяет очередную карточку
+
+        Returns:
+            bool: False — найдено нарушение, дальше проверять не нужно
+        """
+        if self.violation is not None:
+            return False
+        reason = self._price_error(card.get("price")) or \
+            self._order_error(card.get("departure_time"))
+        if reason is not None:
+            self.violation = Violation(self.checked, reason, card)
+            return False
+        self.checked += 1
+        return True
+
+    def _price_error(self, price) -> Optional[str]:
+        if price is None:
+            return "нет цены"
+        if price <= 0:
+            return f"неположительная цена {price}"
+        if self.price_min is not None and price < self.price_min:
+            return f"цена {price} ниже {self.price_min}"
+        if self.price_max is not None and price > self.price_max:
+            return f"цена {price} выше {self.price_max}"
+        return None
+
+    def _order_error(self, departure) -> Optional[str]:
+        if not departure:
+            return "нет времени вылета"
+        current = _minutes(departure)
+        if self._previous is None:
+            self._first = self._previous = current
+            return None
+        if current < self._previous:
+            if self._rolled_over:
+                return (f"время {departure} раньше предыдущего "
+                        f"после перехода через полночь")
+            self._rolled_over = True
+        if self._rolled_over and current >= self._first:
+            return f"время {departure} — больше суток от первого рейса"
+        self._previous = current
+        return None
+
+    def verify(self, cards: Iterable[Dict[str, Optional[object]]]
+               ) -> Verdict:
+        """Проверяет поток, останавливаясь на первом нарушении"""
+        for card in cards:
+            if not self.feed(card):
+                break
+        return Verdict(self.checked, self.violation)
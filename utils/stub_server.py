@@ -0,0 +1,286 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qs, urlparse
+
+AIRLINES = ("SU", "S7", "U6", "DP", "UT", "FV")
+CURRENCY_RATES = {"usd": 90.35, "eur": 98.12, "gbp": 114.6, "kzt": 0.19,
+                  "try": 2.79, "cny": 12.45, "byn": 28.3, "uah": 2.18}
+INVALID_IATA = ("ZZZ", "XXX")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 — чтобы клиент мог держать keep-alive соединение
+    protocol_version = "HTTP/1.1"
+    # заголовки и тело пишутся раздельно — без TCP_NODELAY
+    # keep-alive упирается в задержку ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        server = self.server
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in
+                 parse_qs(url.query, keep_blank_values=True).items()}
+        with server.lock:
+            server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        routes = {
+            "/aviasales/v3/search_by_price_range": self._price_range,
+            "/aviasales/v3/prices_for_dates": self._prices_for_dates,
+            "/v2/prices/latest": self._latest_prices,
+            "/adaptors/currency.json": self._currency,
+        }
+        route = routes.get(url.path)
+        if route is None:
+            return self._send_json(404, {"error": "not found"})
+        delay = server.admit(url.path)
+        if delay is not None:
+            return self._send_json(429, {"error": "Too Many Requests"},
+                                   {"Retry-After": f"{delay:.3f}"})
+        if server.error_rate and server.roll() < server.error_rate:
+            return self._send_json(500, {"error": "internal error"})
+        if route != self._currency:
+            if not query.get("token"):
+                return self._send_json(401, {"error": "Unauthorized"})
+            if (query.get("origin") in server.invalid_iata
+                    or query.get("destination") in server.invalid_iata):
+                return self._send_json(400, {
+                    "success": False, "error": "incorrect origin/destination"})
+        return route(query)
+
+    # ================= ЭНДПОИНТЫ =================
+    def _page(self, query: dict) -> range:
+        limit = int(query.get("limit") or 30)
+        page = int(query.get("page") or 1)
+        start = (page - 1) * limit
+        return range(start, min(start + limit, self.server.tickets))
+
+    def _price_range(self, query: dict) -> None:
+        value_min = int(query.get("value_min") or 0)
+        value_max = int(query.get("value_max") or value_min + 10000)
+        tickets = [self.server.ticket(i, query, value_min, value_max)
+                   for i in self._page(query)]
+        self._send_json(200, {"success": True, "data": tickets,
+                              "currency": query.get("currency", "rub")})
+
+    def _prices_for_dates(self, query: dict) -> None:
+        tickets = [self.server.ticket(i, query, 50, 900)
+                   for i in self._page(query)]
+        self._send_json(200, {"success": True, "data": tickets,
+                              "currency": query.get("cy", "usd")})
+
+    def _latest_prices(self, query: dict) -> None:
+        tickets = [self.server.latest_ticket(i, query)
+                   for i in range(min(30, self.server.tickets))]
+        self._send_json(200, {"success": True, "data": tickets})
+
+    def _currency(self, query: dict) -> None:
+        self._send_json(200, CURRENCY_RATES)
+
+    def _send_json(self, status: int, payload,
+                   headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload).encode()
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass  # не засоряем вывод тестов и бенчмарков
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, tickets: int, latency: float,
+                 error_rate: float, rate_limit: float,
+                 invalid_iata: Iterable[str], seed: int):
+        super().__init__(address, _StubHandler)
+        self.tickets = tickets
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.throttled = 0
+        self._buckets: Dict[str, list] = {}
+        self.invalid_iata = frozenset(invalid_iata)
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    def admit(self, path: str) -> Optional[float]:
+        """
+        Ведро токенов на эндпоинт: None — запрос принят,
+        иначе через сколько секунд повторить
+        """
+        if not self.rate_limit:
+            return None
+        now = time.monotonic()
+        capacity = max(1.0, self.rate_limit / 10)
+        with self.lock:
+            bucket = self._buckets.setdefault(path, [capacity, now])
+            bucket[0] = min(capacity,
+                            bucket[0] + (now - bucket[1]) * self.rate_limit)
+            bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return None
+            self.throttled += 1
+            return (1 - bucket[0]) / self.rate_limit
+
+    def roll(self) -> float:
+        with self.lock:
+            return self._random.random()
+
+    def ticket(self, index: int, query: dict,
+               value_min: int, value_max: int) -> dict:
+        """Билет в формате /aviasales/v3, детерминированный по index"""
+        rnd = random.Random(self.seed * 1_000_003 + index)
+        departure = self._departure(query.get("departure_at"), rnd)
+        origin = query.get("origin", "MOW")
+        destination = query.get("destination", "LED")
+        airline = rnd.choice(AIRLINES)
+        duration = rnd.randint(60, 900)
+        return {
+            "origin": origin,
+            "destination": destination,
+            "origin_airport": origin,
+            "destination_airport": destination,
+            "price": rnd.randint(value_min, max(value_min, value_max)),
+            "airline": airline,
+            "flight_number": str(index + 1),
+            "departure_at": departure.isoformat() + "+03:00",
+            "transfers": rnd.randint(0, 2),
+            "return_transfers": 0,
+            "duration": duration,
+            "duration_to": duration,
+            "duration_back": 0,
+            "link": f"/search/{origin}{departure:%d%m}{destination}1"
+                    f"?t={airline}{index}",
+        }
+
+    def latest_ticket(self, index: int, query: dict) -> dict:
+        """Билет в формате /v2/prices/latest"""
+        rnd = random.Random(self.seed * 1_000_033 + index)
+        departure = self._departure(None, rnd)
+        return {
+            "value": rnd.randint(1000, 20000),
+            "trip_class": 0,
+            "show_to_affiliates": True,
+            "origin": query.get("origin", "MOW"),
+            "destination": query.get("destination", "LED"),
+            "gate": rnd.choice(AIRLINES),
+            "depart_date": departure.date().isoformat(),
+            "return_date": None,
+            "number_of_changes": rnd.randint(0, 2),
+            "found_at": datetime.now().isoformat(timespec="seconds"),
+            "duration": rnd.randint(60, 900),
+            "distance": rnd.randint(300, 5000),
+            "actual": True,
+        }
+
+    @staticmethod
+    def _departure(month: Optional[str], rnd: random.Random) -> datetime:
+        try:
+            start = datetime.strptime(month, "%Y-%m") if month else None
+        except ValueError:
+            start = None
+        if start is None:
+            start = datetime.combine(date.today(), datetime.min.time())
+        return start + timedelta(days=rnd.randint(0, 27),
+                                 minutes=rnd.randrange(0, 24 * 60, 5))
+
+
+class StubServer:
+    """
+    Локальная заглушка API Aviasales, поднимаемая в фоновом потоке.
+    Повторяет эндпоинты search_by_price_range, prices_for_dates,
+    v2/prices/latest и currency.json, включая ответы 401 без токена,
+    400 на несуществующие IATA-коды и 429 с Retry-After при превышении
+    rate_limit.
+
+    Пример:
+        with StubServer(tickets=100, latency=0.05) as server:
+            api = AviasalesApi(base_url=server.url, token="test",
+                               currency_url=server.currency_url)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 tickets: int = 30, latency: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: float = 0.0,
+                 invalid_iata: Iterable[str] = INVALID_IATA, seed: int = 0):
+        """
+        :param tickets: сколько билетов отдаётся постранично
+            (с учётом параметров limit/page)
+        :param latency: задержка ответа, в секундах
+        :param error_rate: доля ответов 500
+        :param rate_limit: запросов в секунду на эндпоинт, сверх
+            которых отвечаем 429; 0 — без ограничения
+        :param invalid_iata: IATA-коды, на которые отвечаем 400
+        :param seed: зерно генератора содержимого билетов
+        """
+        self._server = _StubHTTPServer((host, port), tickets, latency,
+                                       error_rate, rate_limit, invalid_iata,
+                                       seed)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+
+    @property
+    def requests(self) -> int:
+        """Сколько запросов обработано"""
+        return self._server.requests
+
+    @property
+    def throttled(self) -> int:
+        """Сколько запросов отклонено с 429"""
+        return self._server.throttled
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def currency_url(self) -> str:
+        return f"{self.url}/adaptors/currency.json"
+
+    def configure(self, **options) -> None:
+        """Меняет tickets/latency/error_rate/rate_limit на лету"""
+        for name, value in options.items():
+            if name not in ("tickets", "latency", "error_rate",
+                            "rate_limit"):
+                raise ValueError(f"Неизвестный параметр заглушки: {name}")
+            setattr(self._server, name, value)
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -0,0 +1,146 @@
+import codecs
+import json
+from typing import Iterable, Iterator, Optional
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+CHUNK_SIZE = 64 * 1024
+
+
+class Ticket:
+    """
+    Компактная запись билета: только поля, которые используют тесты.
+    Поддерживает форматы /aviasales/v3 и /v2/prices/latest.
+    """
+    __slots__ = ("price", "departure_at", "origin", "destination",
+                 "airline", "transfers")
+
+    def __init__(self, price: int, departure_at: Optional[str],
+                 origin: Optional[str], destination: Optional[str],
+                 airline: Optional[str], transfers: Optional[int]):
+        self.price = price
+        self.departure_at = departure_at
+        self.origin = origin
+        self.destination = destination
+        self.airline = airline
+        self.transfers = transfers
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Ticket":
+        return cls(
+            price=raw.get("price", raw.get("value")),
+            departure_at=raw.get("departure_at", raw.get("depart_date")),
+            origin=raw.get("origin"),
+            destination=raw.get("destination"),
+            airline=raw.get("airline", raw.get("gate")),
+            transfers=raw.get("transfers", raw.get("number_of_changes")))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Ticket):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name)
+                   for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (f"Ticket({self.origin}->{self.destination}, "
+                f"{self.departure_at}, {self.price}, {self.airline}, "
+                f"transfers={self.transfers})")
+
+
+class _JsonStream:
+    """Текстовый буфер над потоком байтов, дочитывающий данные
+    по мере необходимости"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def _read_more(self) -> bool:
+        if self.exhausted:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.exhausted = True
+            self.buf += self._decoder.decode(b"", final=True)
+            return False
+        # отбрасываем уже разобранную часть буфера
+        self.buf = self.buf[self.pos:] + self._decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Следующий значимый символ (пробелы пропускаются)"""
+        while True:
+            while self.pos < len(self.buf) and \
+                    self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._read_more():
+                raise ValueError("Неожиданный конец JSON")
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Ожидался один из '{chars}', "
+                             f"получен '{char}' в позиции {self.pos}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Декодирует следующее значение целиком"""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._read_more():
+                    continue
+                raise
+            # число на границе чанка могло прочитаться не полностью
+            if end == len(self.buf) and self._read_more():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_tickets(chunks: Iterable[bytes], key: str = "data"
+                 ) -> Iterator[Ticket]:
+    """
+    Потоково разбирает ответ вида {"data": [{...}, ...], ...}
+    и отдаёт элементы массива key по одному в виде Ticket.
+    В памяти одновременно находится только текущий билет и чанк ответа.
+
+    Args:
+        chunks: байты ответа, например response.iter_content(CHUNK_SIZE)
+        key: ключ верхнего уровня с массивом билетов
+    """
+    stream = _JsonStream(chunks)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        name = stream.value()
+        stream.expect(":")
+        if name == key and stream.peek() == "[":
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.expect("]")
+            else:
+                while True:
+                    yield Ticket.from_dict(stream.value())
+                    if stream.expect(",]") == "]":
+                        break
+        else:
+            stream.value()
+        if stream.expect(",}") == "}":
+            return
+
+
+def decode_tickets(response) -> Iterator[Ticket]:
+    """Билеты из requests.Response (лучше полученного со stream=True)"""
+    return iter_tickets(response.iter_content(CHUNK_SIZE))
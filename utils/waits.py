@@ -0,0 +1,114 @@
+import time
+import allure
+from selenium.common.exceptions import (NoSuchElementException,
+                                        StaleElementReferenceException,
+                                        TimeoutException)
+from typing import Any, Callable, Optional
+
+# Ставит в странице MutationObserver и счётчик незавершённых
+# fetch/XHR (один раз на документ) и возвращает состояние:
+# [мс с последней мутации DOM, запросов в полёте, document.readyState]
+_PROBE_JS = """
+if (!window.__waitProbe) {
+    const probe = window.__waitProbe = {last: performance.now(), pending: 0};
+    const touch = () => { probe.last = performance.now(); };
+    new MutationObserver(touch).observe(document, {
+        childList: true, subtree: true, attributes: true,
+        characterData: true});
+    const fetch = window.fetch;
+    if (fetch) {
+        window.fetch = function () {
+            probe.pending++;
+            return fetch.apply(this, arguments).finally(
+                () => { probe.pending--; touch(); });
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        probe.pending++;
+        this.addEventListener("loadend", () => { probe.pending--; touch(); });
+        return send.apply(this, arguments);
+    };
+}
+return [performance.now() - window.__waitProbe.last,
+        window.__waitProbe.pending, document.readyState];
+"""
+
+IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+# без длительности: по заголовку шаг сравнивается с прошлыми запусками
+WAIT_STEP = "Ожидание «{}»"
+
+
+class WaitEngine:
+    """
+    Событийные ожидания вместо фиксированных sleep().
+
+    dom_stable() завершается, как только DOM не меняется в течение
+    quiet секунд и в странице нет незавершённых fetch/XHR.
+    until() опрашивает условие с нарастающим интервалом.
+    Каждое ожидание — шаг Allure WAIT_STEP, длительность шага
+    в отчёте равна фактически потраченному времени.
+    """
+
+    def __init__(self, driver, timeout: float = 30, quiet: float = 0.3,
+                 min_poll: float = 0.05, max_poll: float = 0.5):
+        """
+        :param driver: экземпляр Selenium WebDriver
+        :param timeout: таймаут ожидания по умолчанию, в секундах
+        :param quiet: сколько DOM должен не меняться, чтобы считаться
+            стабильным, в секундах
+        :param min_poll: начальный интервал опроса
+        :param max_poll: максимальный интервал опроса
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.quiet = quiet
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+
+    def dom_stable(self, label: str, quiet: Optional[float] = None,
+                   timeout: Optional[float] = None) -> float:
+        """
+        Ждёт, пока DOM затихнет и сеть станет свободной
+
+        Returns:
+            float: фактическое время ожидания в секундах
+        """
+        with allure.step(WAIT_STEP.format(label)):
+            quiet = self.quiet if quiet is None else quiet
+            started = time.monotonic()
+            deadline = started + (self.timeout if timeout is None else timeout)
+            while True:
+                idle_ms, pending, ready = self.driver.execute_script(_PROBE_JS)
+                idle = idle_ms / 1000
+                if idle >= quiet and not pending and ready == "complete":
+                    return time.monotonic() - started
+                if time.monotonic() >= deadline:
+                    raise TimeoutException(
+                        f"DOM не стабилизировался: {label} "
+                        f"(запросов в полёте: {pending})")
+                # спим ровно до момента, когда тишина может наступить
+                time.sleep(min(max(quiet - idle, self.min_poll),
+                               self.max_poll))
+
+    def until(self, condition: Callable[[Any], Any], label: str,
+              timeout: Optional[float] = None) -> Any:
+        """
+        Ждёт, пока condition(driver) вернёт истинное значение,
+        и возвращает его. Интервал опроса растёт от min_poll до max_poll.
+        """
+        with allure.step(WAIT_STEP.format(label)):
+            started = time.monotonic()
+            deadline = started + (self.timeout if timeout is None else timeout)
+            poll = self.min_poll
+            while True:
+                try:
+                    value = condition(self.driver)
+                    if value:
+                        return value
+                except IGNORED_EXCEPTIONS:
+                    pass
+                if time.monotonic() >= deadline:
+                    raise TimeoutException(f"Не дождались: {label}")
+                time.sleep(poll)
+                poll = min(poll * 1.5, self.max_poll)
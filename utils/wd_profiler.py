@@ -0,0 +1,185 @@
+import sys
+import threading
+import time
+from collections import Counter
+from allure_commons import hookimpl, plugin_manager
+from typing import Dict, List, Optional
+from project.utils.waits import WAIT_STEP
+
+PAGES_PACKAGE = "project.pages"
+OUTSIDE_STEPS = "вне шагов"
+
+# Функции ожидания: команды внутри них считаются ожиданием
+WAIT_FUNCTIONS = {
+    ("selenium.webdriver.support.wait", "until"),
+    ("selenium.webdriver.support.wait", "until_not"),
+    ("project.utils.waits", "until"),
+    ("project.utils.waits", "dom_stable"),
+}
+_WAIT_STEP_PREFIX = WAIT_STEP.split("{", 1)[0]
+
+
+class MethodProfile:
+    """Команды WebDriver и время одного метода Page Object или шага"""
+    __slots__ = ("commands", "names", "wait", "sleep", "action")
+
+    def __init__(self):
+        self.commands = 0
+        self.names: Counter = Counter()
+        self.wait = 0.0
+        self.sleep = 0.0
+        self.action = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.wait + self.sleep + self.action
+
+
+class CommandProfiler:
+    """
+    Профилировщик команд WebDriver.
+
+    Подменяет command_executor.execute у браузера и засекает каждую
+    команду. Команда относится к внешнему методу Page Object на стеке
+    вызовов (SearchPage.set_to_city), а вне Page Object — к текущему
+    шагу Allure. Время делится на ожидания (команды и паузы опроса
+    внутри until() и dom_stable()), фиксированные sleep и действия
+    (остальные команды). Засекаются
+    только sleep потока, запустившего профилировщик (потока тестов):
+    ограничитель скорости, фоновые писатели и чужие потоки спят
+    без замеров.
+    """
+
+    def __init__(self):
+        self.profiles: Dict[str, MethodProfile] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sleep = time.sleep
+        self._thread: Optional[int] = None
+
+    # ================= ПОДКЛЮЧЕНИЕ =================
+    def start(self) -> "CommandProfiler":
+        """Подписывается на шаги Allure и начинает засекать sleep"""
+        self._thread = threading.get_ident()
+        self._sleep = time.sleep
+        time.sleep = self._timed_sleep
+        plugin_manager.register(self)
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._thread = None
+        try:
+            if time.sleep == self._timed_sleep:
+                time.sleep = self._sleep
+        finally:
+            plugin_manager.unregister(self)
+
+    def wrap(self, driver) -> None:
+        """Засекает команды браузера; повторный вызов ничего не делает"""
+        executor = driver.command_executor
+        if getattr(executor, "_wd_profiler", None) is self:
+            return
+        execute = executor.execute
+
+        def timed_execute(command, params):
+            started = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                self._record(command, time.perf_counter() - started)
+
+        executor.execute = timed_execute
+        executor._wd_profiler = self
+
+    # ================= ШАГИ ALLURE =================
+    def _steps(self) -> List[str]:
+        if not hasattr(self._local, "steps"):
+            self._local.steps = []
+        return self._local.steps
+
+    @hookimpl
+    def start_step(self, uuid, title, params):
+        self._steps().append(title)
+
+    @hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        steps = self._steps()
+        if steps:
+            steps.pop()
+
+    # ================= ЗАМЕРЫ =================
+    def _locate(self):
+        """(метод Page Object или шаг, вызвано ли из ожидания)"""
+        method: Optional[str] = None
+        in_wait = False
+        frame = sys._getframe(2)
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            name = frame.f_code.co_name
+            if (module, name) in WAIT_FUNCTIONS:
+                in_wait = True
+            elif module.startswith(PAGES_PACKAGE) and \
+                    "self" in frame.f_locals:
+                # идём наружу: последний найденный — внешний метод
+                method = f"{type(frame.f_locals['self']).__name__}.{name}"
+            frame = frame.f_back
+        if method is None:
+            # шаг самого ожидания не заменяет шаг, который его ждёт
+            steps = [step for step in self._steps()
+                     if not step.startswith(_WAIT_STEP_PREFIX)]
+            method = steps[-1] if steps else OUTSIDE_STEPS
+        return method, in_wait
+
+    def _profile(self, key: str) -> MethodProfile:
+        profile = self.profiles.get(key)
+        if profile is None:
+            profile = self.profiles[key] = MethodProfile()
+        return profile
+
+    def _record(self, command: str, elapsed: float) -> None:
+        key, in_wait = self._locate()
+        with self._lock:
+            profile = self._profile(key)
+            profile.commands += 1
+            profile.names[command] += 1
+            if in_wait:
+                profile.wait += elapsed
+            else:
+                profile.action += elapsed
+
+    def _timed_sleep(self, seconds: float) -> None:
+        if threading.get_ident() != self._thread:
+            return self._sleep(seconds)
+        started = time.perf_counter()
+        try:
+            self._sleep(seconds)
+        finally:
+            elapsed = time.perf_counter() - started
+            key, in_wait = self._locate()
+            with self._lock:
+                profile = self._profile(key)
+                # пауза между опросами ожидания — часть ожидания
+                if in_wait:
+                    profile.wait += elapsed
+                else:
+                    profile.sleep += elapsed
+
+    # ================= ОТЧЁТ =================
+    def report(self) -> str:
+        """Таблица по методам, отсортированная по суммарному времени"""
+        with self._lock:
+            rows = sorted(self.profiles.items(),
+                          key=lambda item: item[1].total, reverse=True)
+        width = max([len(key) for key, _ in rows] + [5])
+        lines = [f"{'Метод':<{width}}  команд  всего, с  ожидания     "
+                 f"sleep  действия  частые команды"]
+        for key, profile in rows:
+            frequent = ", ".join(f"{name}×{count}" for name, count
+                                 in profile.names.most_common(3))
+            lines.append(
+                f"{key:<{width}}  {profile.commands:>6}  "
+                f"{profile.total:>8.2f}  {profile.wait:>8.2f}  "
+                f"{profile.sleep:>8.2f}  {profile.action:>8.2f}  {frequent}")
+        return "\n".join(lines)
@@ -0,0 +1,46 @@
+from typing import Dict, Optional
+from xdist.remote import Producer
+from xdist.scheduler import LoadScopeScheduling
+from project.utils.durations import DurationHistory
+
+
+class DurationScheduling(LoadScopeScheduling):
+    """
+    Планировщик pytest-xdist с учётом длительностей прошлых запусков.
+
+    Единица работы — группа xdist_group (тесты с общим браузером или
+    общим поиском выполняются на одном воркере) или отдельный тест.
+    Освободившийся воркер забирает самую долгую из оставшихся единиц
+    (жадный LPT): медленные UI-тесты стартуют первыми, быстрые
+    API-тесты заполняют простои в конце. Общее время стремится
+    к длительности самой долгой единицы, а не к сумме.
+
+    Группы видны в nodeid только с --dist loadgroup.
+    """
+
+    def __init__(self, config, log: Optional[Producer] = None,
+                 durations: Optional[DurationHistory] = None):
+        super().__init__(config, log)
+        self.log = (log.durationsched if log is not None
+                    else Producer("durationsched"))
+        self.durations = durations or DurationHistory()
+        self._costs: Dict[str, float] = {}
+
+    def _split_scope(self, nodeid: str) -> str:
+        if nodeid.rfind("@") > nodeid.rfind("]"):
+            return nodeid.rsplit("@", 1)[-1]
+        return nodeid
+
+    def _unit_cost(self, scope: str) -> float:
+        cost = self._costs.get(scope)
+        if cost is None:
+            cost = self._costs[scope] = self.durations.total(
+                self.workqueue[scope])
+        return cost
+
+    def _assign_work_unit(self, node) -> None:
+        # самую долгую единицу — в начало очереди, дальше как в базовом
+        scope = max(self.workqueue, key=self._unit_cost)
+        self.log(f"{scope}: ~{self._unit_cost(scope):.1f} с -> {node}")
+        self.workqueue.move_to_end(scope, last=False)
+        super()._assign_work_unit(node)